@@ -131,11 +131,24 @@ async def update_project_by_id(
 
 async def delete_project_by_id(
     conn: asyncpg.Connection, project_id: uuid.UUID, user_id: uuid.UUID
-) -> bool:
-    """프로젝트 ID로 특정 프로젝트를 삭제합니다."""
+) -> Optional[List[uuid.UUID]]:
+    """
+    프로젝트 ID로 특정 프로젝트를 삭제합니다.
+    더 이상 어느 프로젝트에도 속하지 않아 함께 삭제된 씬 id 목록을 반환합니다.
+    (파일 정리는 호출 측에서 scene_files로 처리, 프로젝트가 없거나 소유자가 아니면 None)
+    """
     # 참고: ON DELETE CASCADE 제약조건이 설정되어 있다면 project 삭제 시 project_scenes의 관련 데이터도 자동 삭제됩니다.
     # 그렇지 않다면, project_scenes 테이블의 데이터를 먼저 삭제하는 로직이 필요합니다.
     async with conn.transaction():
+        # 소유자 확인을 먼저 해서 다른 사용자의 씬 관계를 지우지 않도록 함
+        owned = await conn.fetchval(
+            "SELECT 1 FROM project WHERE id = $1 AND user_id = $2 FOR UPDATE",
+            project_id,
+            user_id,
+        )
+        if not owned:
+            return None
+
         # Remove project-scene relations first to satisfy FK constraints
         await conn.execute(
             "DELETE FROM project_scenes WHERE project_id = $1",
@@ -143,7 +156,7 @@ async def delete_project_by_id(
         )
 
         # Cleanup orphan scenes that are no longer referenced by any project
-        await conn.execute(
+        orphans = await conn.fetch(
             """
             DELETE FROM scene
             WHERE id IN (
@@ -152,13 +165,14 @@ async def delete_project_by_id(
                 LEFT JOIN project_scenes ps ON s.id = ps.scene_id
                 WHERE ps.scene_id IS NULL
             )
+            RETURNING id
             """
         )
 
         # Finally delete the project (permission scoped by user_id)
-        result = await conn.execute(
+        await conn.execute(
             "DELETE FROM project WHERE id = $1 AND user_id = $2",
             project_id,
             user_id,
         )
-    return result == "DELETE 1"
+    return [row["id"] for row in orphans]
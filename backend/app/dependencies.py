@@ -1,10 +1,13 @@
 from fastapi import Depends, HTTPException, status, Cookie
 import asyncpg
+import uuid
+from dataclasses import dataclass
 from typing import Optional
 
 from app.db.database import get_conn
 from app.db.user import get_user_by_username
 from app.schemas import UserInDB, UserResponse
+from app.services.show_exporter import ExportTransform
 from app.utils import security
 
 
@@ -48,3 +51,78 @@ async def get_current_user(
         username=user_in_db.username,
         disabled=user_in_db.disabled,
     )
+
+
+def get_export_transform(
+    z_value: float = 0.0,
+    scale_x: float = 1.0,
+    scale_y: float = 1.0,
+    scale_z: float = 1.0,
+    offset_x: float = 0.0,
+    offset_y: float = 0.0,
+    offset_z: float = 0.0,
+    led_intensity: float = 1.0,
+) -> ExportTransform:
+    """내보내기와 같은 씬 변환 쿼리 파라미터를 ExportTransform으로 묶습니다."""
+    return ExportTransform(
+        z_value=z_value,
+        scale_x=scale_x,
+        scale_y=scale_y,
+        scale_z=scale_z,
+        offset_x=offset_x,
+        offset_y=offset_y,
+        offset_z=offset_z,
+        led_intensity=led_intensity,
+    )
+
+
+@dataclass
+class SceneAccess:
+    """
+    요청한 사용자 소유 프로젝트에 속한 씬 (get_scene_access 결과)
+    확인에 쓴 연결은 바로 반환하므로, 핸들러는 DB를 갱신할 때만 get_conn으로 연결을 얻습니다.
+    (이미지 변환 등 오래 걸리는 작업 동안 풀(max 5)의 연결을 붙잡지 않음)
+    """
+
+    project_id: uuid.UUID
+    scene_id: uuid.UUID
+    scene_num: Optional[int]
+    s3_key: Optional[str]
+    min_separation: Optional[float]
+
+
+async def get_scene_access(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    user: UserResponse = Depends(get_current_user),
+) -> SceneAccess:
+    """
+    씬 존재 / 프로젝트 소속 / 프로젝트 소유자를 쿼리 한 번으로 확인합니다.
+    FastAPI 의존성 캐시로 한 요청 안에서는 한 번만 실행됩니다.
+    다른 사용자의 프로젝트는 존재 여부를 드러내지 않도록 404로 응답합니다.
+    """
+    async with get_conn() as conn:
+        scene = await conn.fetchrow(
+            """
+            SELECT s.id, s.scene_num, s.s3_key, p.min_separation
+            FROM project_scenes ps
+                     JOIN scene s ON ps.scene_id = s.id
+                     JOIN project p ON ps.project_id = p.id
+            WHERE s.id = $1
+              AND ps.project_id = $2
+              AND p.user_id = $3
+            """,
+            scene_id,
+            project_id,
+            user.id,
+        )
+    if not scene:
+        raise HTTPException(status_code=404, detail="Scene not found")
+
+    return SceneAccess(
+        project_id=project_id,
+        scene_id=scene_id,
+        scene_num=scene["scene_num"],
+        s3_key=scene["s3_key"],
+        min_separation=scene["min_separation"],
+    )
@@ -5,10 +5,16 @@ from app.routers import auth, scene, websocket, project, image_router
 from app.db.database import init_db, close_db
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.config import create_upload_directories
+from app.utils.jsonio import JSONIOResponse
+from app.utils.precompressed import PrecompressedStaticFiles
+from app.services.collision_service import shutdown_collision_pool
+from app.services.gcs_client import get_gcs_client, start_gcs_client, stop_gcs_client
+from app.services.scene_writes import scene_writes
+from app.services.thumbnail_service import thumbnail_renderer
 
 # 애플리케이션 생성 전에 디렉토리 생성
 create_upload_directories()
-app = FastAPI()
+app = FastAPI(default_response_class=JSONIOResponse)
 
 # CORS for local dev (Vite on 5173)
 app.add_middleware(
@@ -49,28 +55,30 @@ app.mount(
     name="uploads",
 )
 
+# 씬 캔버스: 대기 중인 자동 저장을 내려보낸 뒤 제공 (?v=<version> URL은 immutable 캐싱)
 app.mount(
     "/originals",
-    StaticFiles(directory="originals"),
+    PrecompressedStaticFiles(directory="originals", before_read=scene_writes.flush),
     name="originals",
 )
 
 app.mount(
     "/processed",
-    StaticFiles(directory="processed"),
+    PrecompressedStaticFiles(directory="processed", before_read=scene_writes.flush),
     name="processed",
 )
 
 # Static files for generated JSON
+# (씬 / 내보내기 JSON은 저장할 때 만든 .gz / .br 변형을 Accept-Encoding에 맞춰 제공)
 app.mount(
     "/svg-json",
-    StaticFiles(directory="svg_json"),
+    PrecompressedStaticFiles(directory="svg_json"),
     name="svg_json",
 )
 
 app.mount(
     "/thumbnails",
-    StaticFiles(directory="thumbnails"),
+    PrecompressedStaticFiles(directory="thumbnails"),
     name="thumbnails",
 )
 
@@ -79,16 +87,25 @@ app.mount(
 async def startup():
     create_upload_directories()
     await init_db()
+    await start_gcs_client()
 
 
 @app.on_event("shutdown")
 async def shutdown():
+    await scene_writes.flush()
+    await stop_gcs_client()
     await close_db()
+    shutdown_collision_pool()
 
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "gcs": get_gcs_client().status(),
+        "scene_writes": scene_writes.status(),
+        "thumbnails": thumbnail_renderer.status(),
+    }
 
 
 @app.get("/")
@@ -6,7 +6,6 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 import asyncio
-import json
 
 from app.schemas import (
     Token,
@@ -17,7 +16,7 @@ from app.schemas import (
     MessageResponse,
     SendVerificationRequest,
 )
-from app.utils import security
+from app.utils import security, jsonio
 from app.core import config
 from app.db.database import get_conn
 from app.db.user import get_user_by_username
@@ -106,7 +105,7 @@ async def verification_stream(email: str):
 
     async def event_publisher():
         try:
-            yield f"data: {json.dumps({'status': 'connected', 'email': email})}\n\n"
+            yield f"data: {jsonio.dumps({'status': 'connected', 'email': email}).decode()}\n\n"
 
             # Redis에서 주기적으로 인증 상태 확인
             while True:
@@ -114,7 +113,7 @@ async def verification_stream(email: str):
 
                 if VerificationStore.is_verified(email):
                     token = VerificationStore.get_token(email)
-                    yield f"data: {json.dumps({'status': 'verified', 'email': email, 'token': token})}\n\n"
+                    yield f"data: {jsonio.dumps({'status': 'verified', 'email': email, 'token': token}).decode()}\n\n"
                     break
 
         except asyncio.CancelledError:
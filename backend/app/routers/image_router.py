@@ -13,13 +13,14 @@ from app.services.svg_service import (
 import shutil
 import os
 import uuid
-import json
 from app.db.database import get_conn
 from app.routers.websocket import manager
+from app.utils import jsonio
 from starlette.responses import JSONResponse
 from app.dependencies import get_current_user
 from app.schemas import UserResponse, DeleteImageRequest
 from app.config import UPLOAD_DIRECTORY, TMP_DIR, SVG_JSON_DIR
+from app.utils.precompressed import write_precompressed
 
 router = APIRouter(prefix="/image", tags=["image"])
 
@@ -297,11 +298,13 @@ async def svg_to_json_endpoint(
         out_name = f"{safe_base}_{ts}_{uuid.uuid4().hex[:6]}.json"
         out_path = os.path.join(SVG_JSON_DIR, out_name)
 
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        payload = jsonio.dumps(data)
+        with open(out_path, "wb") as f:
+            f.write(payload)
+        write_precompressed(out_path, payload)
 
         # Unity로 JSON 데이터 전송
-        await manager.broadcast(json.dumps(data))
+        await manager.broadcast_json(data)
 
         return {"json_url": f"/svg-json/{out_name}", "unity_sent": True}
     finally:
@@ -1,7 +1,7 @@
 import asyncpg
-from app.config import PROCESSED_DIR, SVG_JSON_DIR
+from app.config import SVG_JSON_DIR
 from app.db.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_export_transform
 from app.schemas import (
     UserResponse,
     ProjectListDataResponse,
@@ -20,15 +20,66 @@ from app.db.project import (
     delete_project_by_id,
 )
 from app.routers.websocket import manager
-from app.services.fabric_json_service import (
-    fabric_json_to_coords_with_colors,
-    get_fabric_json_size,
+from app.utils import jsonio
+from app.utils.precompressed import write_precompressed
+from app.utils.jsonio import JSONIOResponse
+from app.services.export_cache import (
+    CachedExport,
+    etag_matches,
+    export_cache_key,
+    get_cached_export,
+    scene_fingerprints,
+    store_export,
 )
-from fastapi import APIRouter, Depends, status, HTTPException
-import json
+from app.services.export_stream import ChunkFanout, SubscriberStreamingResponse
+from app.services.export_jobs import TERMINAL_STATUSES, ExportJob, export_jobs
+from app.services.gcs_client import get_gcs_client
+from app.services.scene_files import delete_scene_files
+from app.services.show_exporter import ExportTransform
+from app.services.export_service import (
+    ExportMetadata,
+    ExportOptions,
+    ExportStats,
+    ProgressCallback,
+    analyze_project_timing,
+    build_project_json,
+    build_scenes_data,
+    check_project_collisions,
+    iter_project_json,
+    fetch_export_metadata,
+    iter_trajectory,
+    load_scenes,
+    plan_trajectory,
+    project_min_separation,
+    project_motion_limits,
+    resolve_fleet,
+    scene_encoder,
+    validate_project,
+    write_project_binary,
+)
+from app.services.collision_service import collision_summary
+from app.services.delta_codec import DEFAULT_POSITION_QUANTUM
+from app.services.timing_service import timing_summary
+from app.services.trajectory_service import HEADER_DTYPE as TRAJECTORY_HEADER_DTYPE
+from app.services.validation_service import validation_summary
+from dataclasses import asdict
+from fastapi import (
+    APIRouter,
+    Depends,
+    status,
+    HTTPException,
+    Header,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import Any, Dict, Optional, Set, Tuple
+import asyncio
+import functools
 import os
 import uuid
-import websockets
 
 router = APIRouter()
 
@@ -138,33 +189,36 @@ async def delete_existing_project(
     """
     특정 **프로젝트를 삭제**합니다.
     """
-    success = await delete_project_by_id(conn, project_id, current_user.id)
-    if not success:
+    deleted_scene_ids = await delete_project_by_id(conn, project_id, current_user.id)
+    if deleted_scene_ids is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
         )
+    # 함께 삭제된 씬의 파일 정리 (복제된 씬과 공유하는 내용은 남음)
+    for scene_id in deleted_scene_ids:
+        await delete_scene_files(scene_id)
     return {"success": True}
 
-## GCS서버로 json보내버리기
-async def send_json_to_external_server(json_data: str):
-    """외부 WebSocket 서버로 JSON 데이터를 전송합니다."""
-    # uri = "ws://gsc.wdss.store:8000/"
-    uri = "ws://43.202.17.174:5089/json"
-    try:
-        print(f"Attempting to send JSON data to {uri}")
-        async with websockets.connect(uri) as websocket:
-            await websocket.send(json_data)
-            print(f"Successfully sent JSON data to {uri}")
-    except Exception as e:
-        # 주 프로세스를 중단시키지 않고 오류를 로깅합니다.
-        print(f"Error sending JSON to external server {uri}: {e}")
+# 응답을 돌려준 뒤에도 계속 실행되는 스트리밍 내보내기 작업 (GC 방지용 참조)
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
+# 내보내기 형식 → 파일 확장자
+EXPORT_FORMATS = {"json": "json", "bin": "wshow"}
 
+
+@router.post("/{project_id}/export")
 @router.post("/{project_id}/json")
 async def export_project_to_json(
     project_id: uuid.UUID,
-    user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db),
+    user: UserResponse = Depends(get_current_user),
     # 개별 씬 변환 파라미터들 (DB에 없는 값들)
     z_value: float = 0.0,
     scale_x: float = 1.0,
@@ -174,129 +228,764 @@ async def export_project_to_json(
     offset_y: float = 0.0,
     offset_z: float = 0.0,
     led_intensity: float = 1.0,
+    # 캐시를 무시하고 다시 내보내기 (캐시 적중이어도 결과 파일은 GCS로 다시 전송됨)
+    force: bool = False,
+    # 씬 단위로 응답/파일/GCS에 동시에 흘려보내기 (메모리 사용량이 씬 몇 개 분량으로 제한됨)
+    stream: bool = False,
+    # 연속된 씬 사이 드론 배정 (action_data 인덱스 = 고정 드론 번호)
+    assign: bool = False,
+    assign_power: float = 1.0,
+    # 모든 씬의 드론 수를 max_drone(없으면 가장 큰 씬)으로 맞춤: 부족하면 꺼진 드론 주차, 많으면 솎아내기
+    balance: bool = False,
+    # 내보내기 전 최소 간격 검사 (위반이 있으면 422와 위반 목록 반환)
+    # seconds_per_scene도 지정하면 전환 구간의 연속 충돌 검사까지 실행
+    validate: bool = False,
+    # 씬 번호 한 칸당 시간(초). 지정하면 max_speed / max_accel로 전환 시간을 검증해 응답에 포함
+    seconds_per_scene: Optional[float] = None,
+    # 출력 형식: json(dsj) 또는 bin(mmap으로 읽을 수 있는 바이너리 쇼 파일, show_binary)
+    export_format: str = Query("json", alias="format"),
+    # 첫 씬 이후를 직전 씬과의 차이만 담은 delta 씬으로 저장 (format=json, 드론 배정과 함께 사용 권장)
+    delta: bool = False,
+    # delta 위치 양자화 단위 (복원 오차는 축마다 이 값의 절반 이하)
+    delta_quantum: float = DEFAULT_POSITION_QUANTUM,
+    # 백그라운드 작업으로 실행하고 202와 작업 ID를 바로 반환 (진행 상황은 SSE / 로그인한 /ws 연결로 구독)
+    background: bool = False,
+    if_none_match: Optional[str] = Header(None),
 ):
     """프로젝트의 모든 씬을 JSON으로 변환"""
 
-    # 프로젝트 정보 가져오기 (JSON 메타데이터용)
-    project = await conn.fetchrow(
-        """
-              SELECT project_name, format, max_scene, max_drone, max_speed, max_accel, min_separation
-              FROM project
-              WHERE id = $1
-              """,
-        project_id,
+    # 1. 프로젝트 정보 + 씬 목록 조회 (조회 후 DB 커넥션 즉시 반납)
+    metadata = await fetch_export_metadata(project_id, user.id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    scenes = metadata.scenes
+    if not scenes:
+        raise HTTPException(status_code=404, detail="No scenes found")
+
+    transform = ExportTransform(
+        z_value=z_value,
+        scale_x=scale_x,
+        scale_y=scale_y,
+        scale_z=scale_z,
+        offset_x=offset_x,
+        offset_y=offset_y,
+        offset_z=offset_z,
+        led_intensity=led_intensity,
+    )
+    if seconds_per_scene is not None and seconds_per_scene <= 0:
+        raise HTTPException(
+            status_code=400, detail="seconds_per_scene must be positive"
+        )
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of {', '.join(EXPORT_FORMATS)}",
+        )
+    if stream and export_format != "json":
+        raise HTTPException(
+            status_code=400, detail="stream is only supported for format=json"
+        )
+    if delta and export_format != "json":
+        raise HTTPException(
+            status_code=400, detail="delta is only supported for format=json"
+        )
+    if delta_quantum <= 0:
+        raise HTTPException(status_code=400, detail="delta_quantum must be positive")
+    options = ExportOptions(
+        assign_drones=assign,
+        assignment_power=assign_power,
+        balance_drones=balance,
+        seconds_per_scene=seconds_per_scene,
+        delta_encode=delta,
+        delta_quantum=delta_quantum,
     )
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    if background:
+        if stream:
+            raise HTTPException(
+                status_code=400, detail="stream cannot be combined with background"
+            )
+        job = export_jobs.create(
+            project_id,
+            user.id,
+            functools.partial(
+                _export_job,
+                project_id,
+                metadata,
+                transform,
+                options,
+                export_format,
+                validate,
+                force,
+            ),
+        )
+        return JSONIOResponse(
+            _job_content(project_id, job), status_code=status.HTTP_202_ACCEPTED
+        )
+
+    if validate:
+        await _validate_export(metadata, transform, options)
+
+    # 2. 캐시 확인: 설정/변환 파라미터/씬 파일이 그대로면 이전 결과를 그대로 반환
+    cache_key = await _export_cache_key(metadata, transform, options, export_format)
+    cached = None if force else get_cached_export(project_id, cache_key)
+    if cached is not None:
+        # 조건부 요청(If-None-Match)은 결과 확인만 하므로 GCS로 다시 보내지 않음
+        if etag_matches(if_none_match, cached.etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": cached.etag},
+            )
+        unity_sent = _resend_cached(cached, export_format)
+        if stream:
+            return FileResponse(
+                cached.out_path,
+                media_type="application/json",
+                headers={"ETag": cached.etag},
+            )
+        return JSONIOResponse(
+            _cached_content(cached, export_format, unity_sent),
+            headers={"ETag": cached.etag},
+        )
 
-    # 씬들 가져오기
-    scenes = await conn.fetch(
-        """
-              SELECT s.id, s.scene_num
-              FROM project_scenes ps
-                       JOIN scene s ON ps.scene_id = s.id
-              WHERE ps.project_id = $1
-              ORDER BY s.scene_num
-              """,
+    out_name, out_path = _export_output(project_id, export_format)
+    if stream:
+        return _stream_export(
+            project_id, metadata, transform, options, cache_key, out_name, out_path
+        )
+
+    content, cached = await _build_export(
         project_id,
+        metadata,
+        transform,
+        options,
+        export_format,
+        cache_key,
+        out_name,
+        out_path,
+    )
+    return JSONIOResponse(content, headers={"ETag": cached.etag})
+
+
+async def _validate_export(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    progress: Optional[ProgressCallback] = None,
+) -> None:
+    """내보내기 전 최소 간격 검사 (+ seconds_per_scene이 있으면 연속 충돌 검사). 위반 시 422"""
+    reports = await validate_project(metadata, transform, progress=progress)
+    summary = validation_summary(reports)
+    if not summary["valid"]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "min_separation violations found",
+                "min_separation": project_min_separation(metadata.project),
+                **summary,
+            },
+        )
+    if options.seconds_per_scene is not None:
+        collisions = collision_summary(
+            await check_project_collisions(
+                metadata, transform, options, progress=progress
+            )
+        )
+        if not collisions["valid"]:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "message": "collisions found during transitions",
+                    "min_separation": project_min_separation(metadata.project),
+                    **collisions,
+                },
+            )
+
+
+async def _export_cache_key(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    export_format: str,
+) -> str:
+    fingerprints = await asyncio.to_thread(scene_fingerprints, metadata.scenes)
+    return export_cache_key(
+        metadata.project,
+        transform,
+        fingerprints,
+        format=export_format,
+        **asdict(options),
     )
 
-    if not scenes:
-        raise HTTPException(status_code=404, detail="No scenes found")
 
-    all_scenes_data = []
-    project_max_drone_raw = project["max_drone"]
-    project_max_drone = int(project_max_drone_raw) if project_max_drone_raw is not None else None
-    max_drones_in_scenes = 0
-
-    for i, scene in enumerate(scenes):
-        scene_id = scene["id"]
-        scene_num = scene["scene_num"]
-
-        # scene_holder 계산: 다음 씬까지의 간격
-        if i < len(scenes) - 1:  # 마지막 씬이 아닌 경우
-            next_scene_num = scenes[i + 1]["scene_num"]
-            scene_holder = next_scene_num - scene_num - 1
-        else:  # 마지막 씬인 경우
-            scene_holder = 0  # 기본값 또는 DB에서 설정된 기본 지속시간
-
-        # processed 파일 경로
-        processed_path = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
-
-        if os.path.exists(processed_path):
-            try:
-                # SVG 파일을 좌표+색상으로 변환
-                coords_with_colors = fabric_json_to_coords_with_colors(processed_path)
-                scene_w, scene_h, scene_z = get_fabric_json_size(processed_path)
-
-                # 드론 수 갱신
-                drone_count = len(coords_with_colors)
-                max_drones_in_scenes = max(max_drones_in_scenes, drone_count)
-
-                # 개별 씬 액션 데이터 생성
-                actions = []
-                for x, y, (r, g, b), opacity in coords_with_colors:
-                    tx = x * scale_x + offset_x
-                    ty = y * scale_y + offset_y
-                    tz = z_value * scale_z + offset_z
-                    actions.append(
-                        {
-                            "led_intensity": float(opacity),
-                            "led_rgb": [int(r), int(g), int(b)],
-                            "transform_pos": [float(tx), float(ty), float(tz)],
-                        }
-                    )
-
-                # 씬 데이터 구성
-                scene_data = {
-                    "scene_number": int(scene_num),
-                    "scene_holder": scene_holder,
-                    "scene_size": [float(scene_w), float(scene_h), float(scene_z)],
-                    "action_data": actions,
-                }
-
-                all_scenes_data.append(scene_data)
-
-            except Exception as e:
-                print(f"Error processing scene {scene_id}: {e}")
-                continue
-
-    if not all_scenes_data:
-        raise HTTPException(status_code=400, detail="No valid processed scenes found")
+def _url_key(export_format: str) -> str:
+    return "bin_url" if export_format == "bin" else "json_url"
 
-    # 프로젝트 레벨 JSON 구성 (무조건 DB 값 사용)
-    project_json = {
-        "format": (project["format"] or "dsj").strip(),
-        "show": {
-            "show_name": project["project_name"] or "Untitled Show",
-            "max_drone": project_max_drone if project_max_drone is not None else max_drones_in_scenes,
-            "max_scene": len(scenes),
-        },
-        "constraints": {
-            "max_speed": float(project["max_speed"] or 6.0),
-            "max_accel": float(project["max_accel"] or 3.0),
-            "min_separation": float(project["min_separation"] or 2.0),
-        },
-        "scenes": all_scenes_data,
+
+def _resend_cached(cached: CachedExport, export_format: str) -> bool:
+    """
+    캐시된 결과 파일을 GCS 큐에 다시 넣습니다.
+    바뀌지 않은 프로젝트를 다시 내보내는 것도 드론 쪽으로 보내려는 요청이기 때문입니다.
+    """
+    if not os.path.exists(cached.out_path):
+        return False
+    return get_gcs_client().enqueue_file(
+        cached.out_path, name=cached.out_name, text=export_format == "json"
+    )
+
+
+def _cached_content(
+    cached: CachedExport, export_format: str, unity_sent: bool
+) -> Dict[str, Any]:
+    content = {
+        _url_key(export_format): f"/svg-json/{cached.out_name}",
+        "unity_sent": unity_sent,
+        "cached": True,
+        "scenes_processed": cached.scenes_processed,
+        "total_scenes": cached.total_scenes,
     }
+    if cached.timing is not None:
+        content["timing"] = cached.timing
+    return content
+
 
-    # JSON 파일 저장
+def _export_output(project_id: uuid.UUID, export_format: str) -> Tuple[str, str]:
+    """
+    내보내기 결과 파일 (이름, 경로)
+    같은 초에 시작한 내보내기끼리 (옵션 / 형식이 달라도) 덮어쓰지 않도록 이름마다 uuid를 붙입니다.
+    """
     from datetime import datetime
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_name = f"{project_id}_{ts}.json"
-    out_path = os.path.join(SVG_JSON_DIR, out_name)
+    suffix = uuid.uuid4().hex[:12]
+    out_name = f"{project_id}_{ts}_{suffix}.{EXPORT_FORMATS[export_format]}"
+    return out_name, os.path.join(SVG_JSON_DIR, out_name)
+
+
+async def _build_export(
+    project_id: uuid.UUID,
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    export_format: str,
+    cache_key: str,
+    out_name: str,
+    out_path: str,
+    progress: Optional[ProgressCallback] = None,
+    wait_upload: bool = False,
+) -> Tuple[Dict[str, Any], CachedExport]:
+    """
+    씬 로드 → 배정 → 직렬화 → 파일 저장 → 캐시 등록 후 GCS로 전송합니다.
+    wait_upload이면 GCS 전송이 끝날 때까지 (최대 GCS_DELIVER_TIMEOUT) 기다리고, 아니면 큐에 넣기만 합니다.
+    """
+    if export_format == "bin":
+        # 씬을 하나씩 바이너리 파일에 기록 (로드/배정/직렬화가 씬 단위로 이어짐)
+        stats = await write_project_binary(
+            metadata, transform, out_path, options=options, progress=progress
+        )
+        if not stats.scenes_processed:
+            await asyncio.to_thread(os.remove, out_path)
+            raise HTTPException(
+                status_code=400, detail="No valid processed scenes found"
+            )
+    else:
+        # 3. 씬 로드/변환을 스레드 풀에서 병렬 실행 (결과는 씬 번호 순서 유지)
+        fleet = await resolve_fleet(metadata, options)
+        results = await load_scenes(
+            metadata.scenes, transform, fleet=fleet, progress=progress
+        )
+
+        # 드론 배정(옵션) 후 씬 JSON 생성
+        all_scenes_data, stats = await build_scenes_data(
+            results, options, metadata.project, progress
+        )
+        if not all_scenes_data:
+            raise HTTPException(
+                status_code=400, detail="No valid processed scenes found"
+            )
+
+        # 4. 프로젝트 레벨 JSON 구성 (무조건 DB 값 사용)
+        encoder = scene_encoder(options)
+        project_json = build_project_json(
+            metadata,
+            all_scenes_data,
+            stats.max_drones_in_scenes,
+            encoder.header() if encoder is not None else None,
+        )
+
+        # JSON 파일 저장
+        payload = jsonio.dumps(project_json)
+        await asyncio.to_thread(_write_bytes, out_path, payload)
+
+    timing = (
+        timing_summary(stats.transitions)
+        if options.seconds_per_scene is not None
+        else None
+    )
+    cached = CachedExport(
+        key=cache_key,
+        out_name=out_name,
+        scenes_processed=stats.scenes_processed,
+        total_scenes=len(metadata.scenes),
+        timing=timing,
+    )
+    # 전송 큐에 넣기 전에 캐시에 등록 (등록된 파일은 취소돼도 지우지 않음)
+    store_export(project_id, cached)
+
+    # Unity(GCS)로 전송: 기본은 상주 클라이언트의 큐에 넣고 바로 진행
+    client = get_gcs_client()
+    text = export_format == "json"
+    if progress is not None:
+        progress("upload", 0, 1)
+    if wait_upload:
+        unity_sent = await client.deliver_file(out_path, name=out_name, text=text)
+    else:
+        unity_sent = client.enqueue_file(out_path, name=out_name, text=text)
+    if progress is not None:
+        progress("upload", 1, 1)
+
+    content = {
+        _url_key(export_format): f"/svg-json/{out_name}",
+        "unity_sent": unity_sent,
+        "cached": False,
+        "scenes_processed": stats.scenes_processed,
+        "total_scenes": len(metadata.scenes),
+    }
+    if timing is not None:
+        content["timing"] = timing
+    return content, cached
+
+
+async def _export_job(
+    project_id: uuid.UUID,
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    export_format: str,
+    validate: bool,
+    force: bool,
+    job: ExportJob,
+    progress: ProgressCallback,
+) -> Dict[str, Any]:
+    """백그라운드 내보내기 작업 본문. 결과는 동기 내보내기 응답과 같은 dict (+ etag)"""
+    if validate:
+        await _validate_export(metadata, transform, options, progress)
+
+    cache_key = await _export_cache_key(metadata, transform, options, export_format)
+    cached = None if force else get_cached_export(project_id, cache_key)
+    if cached is not None:
+        unity_sent = _resend_cached(cached, export_format)
+        return {
+            **_cached_content(cached, export_format, unity_sent),
+            "etag": cached.etag,
+        }
+
+    out_name, out_path = _export_output(project_id, export_format)
+    try:
+        content, cached = await _build_export(
+            project_id,
+            metadata,
+            transform,
+            options,
+            export_format,
+            cache_key,
+            out_name,
+            out_path,
+            progress=progress,
+            wait_upload=True,
+        )
+    except asyncio.CancelledError:
+        # 취소된 작업의 미완성 파일 정리 (캐시에 등록된 뒤라면 전송 큐에 있을 수 있으므로 그대로 둠)
+        if get_cached_export(project_id, cache_key) is None and os.path.exists(
+            out_path
+        ):
+            await asyncio.to_thread(os.remove, out_path)
+        raise
+    return {**content, "etag": cached.etag}
+
+
+def _job_content(project_id: uuid.UUID, job: ExportJob) -> Dict[str, Any]:
+    base = f"/projects/{project_id}/export/jobs/{job.id}"
+    return {
+        **job.to_dict(),
+        "status_url": base,
+        "events_url": f"{base}/events",
+        "cancel_url": f"{base}/cancel",
+    }
+
+
+def _get_job(project_id: uuid.UUID, job_id: str, user: UserResponse) -> ExportJob:
+    job = export_jobs.get(job_id)
+    if job is None or job.project_id != project_id or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.get("/{project_id}/export/jobs/{job_id}")
+async def get_export_job(
+    project_id: uuid.UUID,
+    job_id: str,
+    user: UserResponse = Depends(get_current_user),
+):
+    """백그라운드 내보내기 작업 상태 (단계, 진행 수, 결과 또는 오류)"""
+    return _job_content(project_id, _get_job(project_id, job_id, user))
+
+
+@router.post("/{project_id}/export/jobs/{job_id}/cancel")
+async def cancel_export_job(
+    project_id: uuid.UUID,
+    job_id: str,
+    user: UserResponse = Depends(get_current_user),
+):
+    """진행 중인 내보내기 작업을 취소합니다. (이미 끝난 작업이면 cancelled=false)"""
+    job = _get_job(project_id, job_id, user)
+    return {"success": True, "cancelled": export_jobs.cancel(job.id)}
+
+
+# SSE 연결 유지용 주석 이벤트 간격 (초)
+SSE_KEEPALIVE = 15.0
+
+
+@router.get("/{project_id}/export/jobs/{job_id}/events")
+async def stream_export_job_events(
+    project_id: uuid.UUID,
+    job_id: str,
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    작업 진행 상황을 Server-Sent Events로 보냅니다.
+    이벤트 이름은 progress, 작업이 끝나면 마지막으로 done 이벤트를 보내고 스트림을 닫습니다.
+    """
+    job = _get_job(project_id, job_id, user)
+    queue = export_jobs.subscribe(job)
+
+    async def _events():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                finished = event["status"] in TERMINAL_STATUSES
+                name = b"done" if finished else b"progress"
+                yield b"event: " + name + b"\ndata: " + jsonio.dumps(event) + b"\n\n"
+                if finished:
+                    return
+        finally:
+            export_jobs.unsubscribe(job, queue)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_job_event(job: ExportJob, event: Dict[str, Any]) -> None:
+    """작업 진행 이벤트를 작업을 만든 사용자의 인증된 /ws 연결에만 보냅니다."""
+    await manager.send_json_to_user(job.user_id, {"type": "export_job", **event})
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(project_json, f, ensure_ascii=False, indent=2)
 
-    # Unity로 전송
-    await send_json_to_external_server(json.dumps(project_json))
+export_jobs.add_listener(_send_job_event)
+
+
+@router.get("/{project_id}/timing")
+async def analyze_transition_timing(
+    project_id: uuid.UUID,
+    seconds_per_scene: float = 5.0,
+    assign: bool = True,
+    assign_power: float = 1.0,
+    balance: bool = False,
+    transform: ExportTransform = Depends(get_export_transform),
+    limit: int = 20,
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    씬 전환 시간 검증 (max_speed / max_accel, 사다리꼴 속도 프로파일)
+    전환마다 최소 소요 시간과, 주어진 시간 안에 도착하지 못하는 드론을 반환합니다.
+    기본으로 내보내기와 같은 드론 배정을 적용한 뒤 계산합니다. (/collisions, /trajectory와 같음)
+    assign=false이면 action_data 인덱스를 그대로 드론 번호로 봅니다.
+    """
+    if seconds_per_scene <= 0:
+        raise HTTPException(
+            status_code=400, detail="seconds_per_scene must be positive"
+        )
+
+    metadata = await fetch_export_metadata(project_id, user.id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Project not found")
 
+    options = ExportOptions(
+        assign_drones=assign,
+        assignment_power=assign_power,
+        balance_drones=balance,
+        seconds_per_scene=seconds_per_scene,
+    )
+    transitions = await analyze_project_timing(metadata, transform, options)
+    max_speed, max_accel = project_motion_limits(metadata.project)
     return {
-        "json_url": f"/svg-json/{out_name}",
-        "unity_sent": True,
-        "scenes_processed": len(all_scenes_data),
-        "total_scenes": len(scenes),
+        "success": True,
+        "max_speed": max_speed,
+        "max_accel": max_accel,
+        "seconds_per_scene": seconds_per_scene,
+        **timing_summary(transitions, limit=max(0, limit)),
     }
+
+
+@router.get("/{project_id}/validation")
+async def validate_project_scenes(
+    project_id: uuid.UUID,
+    transform: ExportTransform = Depends(get_export_transform),
+    limit: int = 100,
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    프로젝트 전체 씬의 최소 간격(min_separation) 검증
+    내보내기와 같은 변환을 적용하며, 위반이 있는 씬마다 가까운 쌍부터 limit 개를 반환합니다.
+    """
+    metadata = await fetch_export_metadata(project_id, user.id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    reports = await validate_project(metadata, transform)
+    return {
+        "success": True,
+        "min_separation": project_min_separation(metadata.project),
+        "total_scenes": len(metadata.scenes),
+        **validation_summary(reports, limit=max(0, limit)),
+    }
+
+
+@router.get("/{project_id}/collisions")
+async def check_transition_collisions(
+    project_id: uuid.UUID,
+    seconds_per_scene: float = 5.0,
+    hz: float = 4.0,
+    assign: bool = True,
+    assign_power: float = 1.0,
+    balance: bool = False,
+    transform: ExportTransform = Depends(get_export_transform),
+    limit: int = 100,
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    전환 구간 연속 충돌 검사
+    궤적과 같은 비행 경로를 따라 min_separation 위반 쌍과 쌍마다 가장 이른 위반 시각을 반환합니다.
+    hz는 거친 샘플링 간격으로, 샘플 사이 구간도 검사하므로 결과의 정확도에는 영향이 없습니다.
+    """
+    if seconds_per_scene <= 0 or hz <= 0:
+        raise HTTPException(
+            status_code=400, detail="seconds_per_scene and hz must be positive"
+        )
+
+    metadata = await fetch_export_metadata(project_id, user.id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    options = ExportOptions(
+        assign_drones=assign,
+        assignment_power=assign_power,
+        balance_drones=balance,
+        seconds_per_scene=seconds_per_scene,
+    )
+    reports = await check_project_collisions(metadata, transform, options, hz=hz)
+    return {
+        "success": True,
+        "min_separation": project_min_separation(metadata.project),
+        "seconds_per_scene": seconds_per_scene,
+        **collision_summary(reports, limit=max(0, limit)),
+    }
+
+
+# 궤적 샘플링 제한 (요청 하나가 너무 큰 배열을 만들지 않도록)
+MAX_TRAJECTORY_HZ = 240.0
+MAX_TRAJECTORY_CHUNK_FRAMES = 4096
+
+
+def _check_trajectory_params(hz: float, seconds_per_scene: float, chunk_frames: int):
+    if not 0 < hz <= MAX_TRAJECTORY_HZ:
+        raise HTTPException(
+            status_code=400, detail=f"hz must be in (0, {MAX_TRAJECTORY_HZ}]"
+        )
+    if seconds_per_scene <= 0:
+        raise HTTPException(
+            status_code=400, detail="seconds_per_scene must be positive"
+        )
+    if not 0 < chunk_frames <= MAX_TRAJECTORY_CHUNK_FRAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_frames must be in (0, {MAX_TRAJECTORY_CHUNK_FRAMES}]",
+        )
+
+
+@router.get("/{project_id}/trajectory")
+async def download_trajectory(
+    project_id: uuid.UUID,
+    hz: float = 10.0,
+    seconds_per_scene: float = 5.0,
+    assign: bool = True,
+    assign_power: float = 1.0,
+    balance: bool = False,
+    chunk_frames: int = 256,
+    transform: ExportTransform = Depends(get_export_transform),
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    쇼 전체의 드론 위치를 hz 간격으로 샘플링한 궤적(.traj)을 스트리밍합니다.
+    32바이트 헤더 뒤에 float32 (T, N, 3) 프레임이 이어지며, 청크 단위로 생성되어
+    메모리 사용량은 청크 하나 분량으로 제한됩니다.
+    """
+    _check_trajectory_params(hz, seconds_per_scene, chunk_frames)
+    metadata = await fetch_export_metadata(project_id, user.id)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    options = ExportOptions(
+        assign_drones=assign, assignment_power=assign_power, balance_drones=balance
+    )
+    plan = await plan_trajectory(
+        metadata, hz, seconds_per_scene, await resolve_fleet(metadata, options)
+    )
+    if not plan.keyframe_times:
+        raise HTTPException(status_code=400, detail="No valid processed scenes found")
+
+    async def _body():
+        yield plan.header_bytes()
+        async for chunk in iter_trajectory(
+            metadata, transform, options, plan, chunk_frames
+        ):
+            yield chunk.tobytes()
+
+    size = TRAJECTORY_HEADER_DTYPE.itemsize + plan.frames * plan.drones * 3 * 4
+    return StreamingResponse(
+        _body(),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Length": str(size),
+            "Content-Disposition": f'attachment; filename="{project_id}.traj"',
+            "X-Trajectory-Frames": str(plan.frames),
+            "X-Trajectory-Drones": str(plan.drones),
+            "X-Trajectory-Hz": str(plan.hz),
+        },
+    )
+
+
+@router.websocket("/{project_id}/trajectory/ws")
+async def stream_trajectory(
+    websocket: WebSocket,
+    project_id: uuid.UUID,
+    hz: float = 10.0,
+    seconds_per_scene: float = 5.0,
+    assign: bool = True,
+    assign_power: float = 1.0,
+    balance: bool = False,
+    chunk_frames: int = 256,
+    transform: ExportTransform = Depends(get_export_transform),
+    user: UserResponse = Depends(get_current_user),
+):
+    """
+    궤적을 WebSocket으로 스트리밍합니다.
+    텍스트 메시지로 헤더(JSON)를 보낸 뒤, 청크마다 float32 (frames, N, 3) 바이너리 메시지를
+    보내고, 마지막에 {"type": "end"} 텍스트 메시지를 보냅니다.
+    """
+    await websocket.accept()
+    try:
+        _check_trajectory_params(hz, seconds_per_scene, chunk_frames)
+        metadata = await fetch_export_metadata(project_id, user.id)
+        if metadata is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        options = ExportOptions(
+            assign_drones=assign, assignment_power=assign_power, balance_drones=balance
+        )
+        plan = await plan_trajectory(
+            metadata, hz, seconds_per_scene, await resolve_fleet(metadata, options)
+        )
+    except HTTPException as e:
+        await websocket.send_text(
+            jsonio.dumps({"type": "error", "detail": e.detail}).decode("utf-8")
+        )
+        await websocket.close(code=1008)
+        return
+
+    header = {
+        "type": "header",
+        "hz": plan.hz,
+        "frames": plan.frames,
+        "drones": plan.drones,
+        "keyframe_times": plan.keyframe_times,
+        "dtype": "float32",
+        "byte_order": "little",
+    }
+    try:
+        await websocket.send_text(jsonio.dumps(header).decode("utf-8"))
+        async for chunk in iter_trajectory(
+            metadata, transform, options, plan, chunk_frames
+        ):
+            await websocket.send_bytes(chunk.tobytes())
+        await websocket.send_text(jsonio.dumps({"type": "end"}).decode("utf-8"))
+        await websocket.close()
+    except WebSocketDisconnect:
+        print(f"Trajectory stream client disconnected: {project_id}")
+
+
+def _write_bytes(path: str, payload: bytes) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    write_precompressed(path, payload)
+
+
+def _stream_export(
+    project_id: uuid.UUID,
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    cache_key: str,
+    out_name: str,
+    out_path: str,
+) -> StreamingResponse:
+    """
+    쇼 JSON을 씬 단위 조각으로 생성해 HTTP 응답과 파일에 동시에 흘려보냅니다.
+    모든 조각이 파일에 기록되면 결과를 내보내기 캐시에 등록하고 GCS 전송 큐에 넣습니다.
+    """
+    stats = ExportStats()
+    fanout = ChunkFanout(
+        iter_project_json(metadata, transform, stats, options=options), out_path
+    )
+    http_stream = fanout.subscribe()
+
+    async def _run():
+        ok = await fanout.run()
+        if ok and stats.scenes_processed:
+            await asyncio.to_thread(write_precompressed, out_path)
+            store_export(
+                project_id,
+                CachedExport(
+                    key=cache_key,
+                    out_name=out_name,
+                    scenes_processed=stats.scenes_processed,
+                    total_scenes=len(metadata.scenes),
+                    timing=(
+                        timing_summary(stats.transitions)
+                        if options.seconds_per_scene is not None
+                        else None
+                    ),
+                ),
+            )
+            get_gcs_client().enqueue_file(out_path, name=out_name)
+
+    _spawn(_run())
+
+    return SubscriberStreamingResponse(
+        http_stream,
+        media_type="application/json",
+        headers={"ETag": f'"{cache_key}"', "X-Export-Url": f"/svg-json/{out_name}"},
+    )
@@ -1,14 +1,20 @@
+import asyncio
+import hashlib
 import os
 import shutil
 import uuid
-import json
 from typing import Optional
 
 import aiofiles
 from fastapi import HTTPException, Depends, APIRouter, UploadFile, File, Body
 
 from app.db.database import get_conn
-from app.dependencies import get_current_user
+from app.dependencies import (
+    SceneAccess,
+    get_current_user,
+    get_export_transform,
+    get_scene_access,
+)
 from app.schemas import (
     SceneCreate,
     SceneUpdate,
@@ -17,11 +23,44 @@ from app.schemas import (
     ScenesResponse,
     UserResponse,
     ScenePatch,
+    SceneMove,
+    SceneLink,
+    CanvasPatch,
 )
 
 from app.config import ORIGINALS_DIR, PROCESSED_DIR, TMP_DIR, THUMBNAILS_DIR
 from app.schemas import TransformOptions
+from app.services.dot_sidecar import (
+    remove_sidecar,
+    sidecar_path_for,
+    write_sidecar_for_json,
+)
+from app.services.export_service import build_scene_data
 from app.services.image_service import process_image
+from app.services.canvas_patch import (
+    PatchError,
+    apply_json_patch,
+    apply_object_delta,
+    canvas_cache,
+    discard_canvas,
+    save_canvas,
+)
+from app.services.scene_files import (
+    delete_scene_files,
+    link_scene_files,
+    remove_scene_files,
+)
+from app.services.scene_writes import scene_writes
+from app.services.thumbnail_service import thumbnail_renderer
+from app.services.show_exporter import ExportTransform
+from app.services.validation_service import validate_separation
+from app.utils.asset_versions import (
+    VERSION_LENGTH,
+    file_version,
+    remember_version,
+    versioned_url,
+)
+from app.utils.precompressed import remove_precompressed, write_precompressed
 
 router = APIRouter()
 
@@ -40,23 +79,39 @@ async def recalc_project_max_scene(conn, project_id: uuid.UUID) -> int:
 
 
 async def normalize_scene_numbers(conn, project_id: uuid.UUID) -> None:
-    rows = await conn.fetch(
+    """프로젝트 씬 번호를 현재 순서대로 1..N으로 다시 매깁니다. (한 문장, 바뀌는 행만 UPDATE)"""
+    await conn.execute(
         """
-        SELECT s.id, s.scene_num
-        FROM project_scenes ps
-        JOIN scene s ON ps.scene_id = s.id
-        WHERE ps.project_id = $1
-        ORDER BY s.scene_num ASC
+        UPDATE scene s
+        SET scene_num = ordered.pos
+        FROM (
+            SELECT s2.id,
+                   row_number() OVER (ORDER BY s2.scene_num ASC NULLS LAST, s2.id ASC) AS pos
+            FROM project_scenes ps
+            JOIN scene s2 ON ps.scene_id = s2.id
+            WHERE ps.project_id = $1
+        ) ordered
+        WHERE s.id = ordered.id AND s.scene_num IS DISTINCT FROM ordered.pos
         """,
         project_id,
     )
-    for idx, row in enumerate(rows, start=1):
-        if row["scene_num"] != idx:
-            await conn.execute(
-                "UPDATE scene SET scene_num = $1 WHERE id = $2",
-                idx,
-                row["id"],
-            )
+
+
+async def update_scene_key(access: SceneAccess, s3_key: str) -> None:
+    """씬의 s3_key가 이미 같은 값이면 UPDATE를 생략합니다. (연결은 UPDATE할 때만 얻음)"""
+    if access.s3_key == s3_key:
+        return
+    async with get_conn() as conn:
+        await conn.execute(
+            """
+            UPDATE scene
+            SET s3_key = $1
+            WHERE id = $2
+            """,
+            s3_key,
+            access.scene_id,
+        )
+    access.s3_key = s3_key
 
 
 @router.get("", response_model=ScenesResponse)
@@ -199,41 +254,18 @@ async def create_scene(
 
 
 @router.get("/{scene_id}", response_model=SceneResponse)
-async def get_scene(
-    project_id: str, scene_id: str, user: UserResponse = Depends(get_current_user)
-):
+async def get_scene(access: SceneAccess = Depends(get_scene_access)):
     """씬 정보 조회"""
-    try:
-        uuid.UUID(project_id)
-        uuid.UUID(scene_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid ID format")
-
-    async with get_conn() as conn:
-        scene = await conn.fetchrow(
-            """
-            SELECT s.id, ps.project_id, s.s3_key, s.scene_num
-            FROM project_scenes ps
-            JOIN scene s ON ps.scene_id = s.id
-            WHERE s.id = $1 AND ps.project_id = $2
-            """,
-            scene_id,
-            project_id,
-        )
-
-        if not scene:
-            raise HTTPException(status_code=404, detail="Scene not found")
-
-        return SceneResponse(
-            success=True,
-            scene=Scene(
-                id=str(scene["id"]),
-                project_id=str(scene["project_id"]),
-                scene_num=scene["scene_num"],
-                s3_key=scene["s3_key"],
-                # display_url=get_display_url(scene["s3_key"]),
-            ),
-        )
+    return SceneResponse(
+        success=True,
+        scene=Scene(
+            id=str(access.scene_id),
+            project_id=str(access.project_id),
+            scene_num=access.scene_num,
+            s3_key=access.s3_key,
+            # display_url=get_display_url(scene["s3_key"]),
+        ),
+    )
 
 
 # @router.put("/{scene_id}", response_model=SceneResponse)
@@ -298,84 +330,69 @@ async def get_scene(
 # 초기화
 @router.patch("/{scene_id}", response_model=SceneResponse)
 async def patch_scene(
-    project_id: str,
-    scene_id: str,
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
     patch_data: ScenePatch,
-    user: UserResponse = Depends(get_current_user),
+    access: SceneAccess = Depends(get_scene_access),
 ):
     """씬 상태 변경 (초기화 등)"""
-    try:
-        uuid.UUID(project_id)
-        uuid.UUID(scene_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid ID format")
-
     if patch_data.status == "reset":
         # 초기화 로직
-        async with get_conn() as conn:
-            async with conn.transaction():
-                # 씬 존재 여부 확인 및 현재 scene_num 조회
-                existing_scene = await conn.fetchrow(
-                    """
-                    SELECT s.id, s.scene_num, s.s3_key
-                    FROM project_scenes ps
-                             JOIN scene s ON ps.scene_id = s.id
-                    WHERE s.id = $1
-                      AND ps.project_id = $2
-                    """,
-                    scene_id,
-                    project_id,
-                )
-
-                if not existing_scene:
-                    raise HTTPException(status_code=404, detail="Scene not found")
+        async with get_conn() as conn, conn.transaction():
+            # DB에서 s3_key를 NULL로 초기화
+            await conn.execute(
+                """
+                UPDATE scene
+                SET s3_key = NULL
+                WHERE id = $1
+                """,
+                scene_id,
+            )
 
-                # DB에서 s3_key를 NULL로 초기화
-                await conn.execute(
-                    """
-                    UPDATE scene
-                    SET s3_key = NULL
-                    WHERE id = $1
-                    """,
-                    scene_id,
-                )
+            # 연관된 파일들 삭제
+            original_file = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
+            original_png_file = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
+            processed_file = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
+            # 대기 중인 자동 저장이 지운 파일을 되살리지 않도록 먼저 버림
+            await discard_canvas(original_file, processed_file)
+
+            # originals 폴더의 파일 삭제
+            if os.path.exists(original_file):
+                try:
+                    os.remove(original_file)
+                except OSError as e:
+                    # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
+                    print(f"Failed to remove original file {original_file}: {e}")
+
+            if os.path.exists(original_png_file):
+                try:
+                    os.remove(original_png_file)
+                except OSError as e:
+                    # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
+                    print(
+                        f"Failed to remove original file {original_png_file}: {e}"
+                    )
 
-                # 연관된 파일들 삭제
-                original_file = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
-                original_png_file = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
-                processed_file = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
-
-                # originals 폴더의 파일 삭제
-                if os.path.exists(original_file):
-                    try:
-                        os.remove(original_file)
-                    except OSError as e:
-                        # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
-                        print(f"Failed to remove original file {original_file}: {e}")
-
-                if os.path.exists(original_png_file):
-                    try:
-                        os.remove(original_png_file)
-                    except OSError as e:
-                        # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
-                        print(
-                            f"Failed to remove original file {original_png_file}: {e}"
-                        )
-
-                # processed 폴더의 파일 삭제
-                if os.path.exists(processed_file):
-                    try:
-                        os.remove(processed_file)
-                    except OSError as e:
-                        # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
-                        print(f"Failed to remove processed file {processed_file}: {e}")
+            # processed 폴더의 파일 삭제
+            if os.path.exists(processed_file):
+                try:
+                    os.remove(processed_file)
+                except OSError as e:
+                    # 파일 삭제 실패시 로그는 남기되 작업은 계속 진행
+                    print(f"Failed to remove processed file {processed_file}: {e}")
+            try:
+                remove_sidecar(processed_file)
+                remove_precompressed(original_file)
+                remove_precompressed(processed_file)
+            except OSError as e:
+                print(f"Failed to remove derived files for {scene_id}: {e}")
 
         return SceneResponse(
             success=True,
             scene=Scene(
-                id=scene_id,
-                project_id=project_id,
-                scene_num=existing_scene["scene_num"],  # 기존 값 유지
+                id=str(scene_id),
+                project_id=str(project_id),
+                scene_num=access.scene_num,  # 기존 값 유지
                 s3_key=None,
                 # display_url=None,
             ),
@@ -384,115 +401,266 @@ async def patch_scene(
     raise HTTPException(status_code=400, detail="Invalid status")
 
 
-@router.delete("/{scene_id}")
-async def delete_scene(
-    project_id: str, scene_id: str, user: UserResponse = Depends(get_current_user)
+@router.post("/{scene_id}/move", response_model=ScenesResponse)
+async def move_scene(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    move: SceneMove,
+    access: SceneAccess = Depends(get_scene_access),
 ):
-    """씬 삭제"""
-    try:
-        uuid.UUID(project_id)
-        uuid.UUID(scene_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid ID format")
-
+    """
+    씬 순서 변경: scene_id를 scene_num 위치로 옮기고 사이의 씬을 한 칸씩 밉니다.
+    한 문장으로 처리하며 (번호 사이의 빈 자리도 함께 정리), 번호가 바뀐 씬만 반환합니다.
+    scene_num이 씬 개수보다 크면 마지막 위치로 옮깁니다.
+    """
     async with get_conn() as conn:
-        async with conn.transaction():
-            # 씬 존재 여부 확인
-            existing_scene = await conn.fetchrow(
-                """
-                SELECT s.id
+        rows = await conn.fetch(
+            """
+            WITH ordered AS (
+                SELECT s.id,
+                       row_number() OVER (ORDER BY s.scene_num ASC NULLS LAST, s.id ASC) AS pos
                 FROM project_scenes ps
                 JOIN scene s ON ps.scene_id = s.id
-                WHERE s.id = $1 AND ps.project_id = $2
-                """,
-                scene_id,
-                project_id,
+                WHERE ps.project_id = $1
+            ),
+            bounds AS (
+                SELECT o.pos AS src,
+                       LEAST($3::int, (SELECT COUNT(*) FROM ordered)) AS dst
+                FROM ordered o
+                WHERE o.id = $2
+            ),
+            renumbered AS (
+                SELECT o.id,
+                       CASE
+                           WHEN o.id = $2 THEN b.dst
+                           WHEN o.pos > b.src AND o.pos <= b.dst THEN o.pos - 1
+                           WHEN o.pos < b.src AND o.pos >= b.dst THEN o.pos + 1
+                           ELSE o.pos
+                       END AS scene_num
+                FROM ordered o CROSS JOIN bounds b
             )
+            UPDATE scene s
+            SET scene_num = r.scene_num
+            FROM renumbered r
+            WHERE s.id = r.id AND s.scene_num IS DISTINCT FROM r.scene_num
+            RETURNING s.id, s.scene_num, s.s3_key
+            """,
+            project_id,
+            scene_id,
+            move.scene_num,
+        )
+    return ScenesResponse(
+        success=True,
+        scenes=[
+            Scene(
+                id=str(row["id"]),
+                project_id=str(project_id),
+                scene_num=row["scene_num"],
+                s3_key=row["s3_key"],
+            )
+            for row in rows
+        ],
+    )
 
-            if not existing_scene:
-                raise HTTPException(status_code=404, detail="Scene not found")
 
-            # project_scenes 관계 삭제
-            await conn.execute(
-                """
-                DELETE FROM project_scenes
-                WHERE scene_id = $1 AND project_id = $2
-                """,
-                scene_id,
-                project_id,
-            )
+async def copy_scene(
+    access: SceneAccess, target_project_id: uuid.UUID, scene_num: Optional[int]
+) -> SceneResponse:
+    """
+    access 씬을 target 프로젝트의 scene_num 위치(None이면 마지막)에 새 씬으로 만듭니다.
+    파일은 scene_files로 하드링크하므로 즉시 끝나고, 어느 쪽을 편집해도 그 씬만 바뀝니다.
+    """
+    new_id = uuid.uuid4()
+    # 대기 중인 자동 저장을 먼저 내려보내야 최신 내용이 공유됨
+    await scene_writes.flush(
+        [
+            os.path.join(ORIGINALS_DIR, f"{access.scene_id}.json"),
+            os.path.join(PROCESSED_DIR, f"{access.scene_id}.json"),
+        ]
+    )
+    s3_key = (
+        access.s3_key.replace(str(access.scene_id), str(new_id))
+        if access.s3_key
+        else None
+    )
 
-            # scene 삭제 (다른 프로젝트에서 사용하지 않는 경우에만)
-            other_projects = await conn.fetchrow(
-                """
-                SELECT COUNT(*) as count
-                FROM project_scenes
-                WHERE scene_id = $1
-                """,
-                scene_id,
-            )
+    try:
+        await asyncio.to_thread(link_scene_files, access.scene_id, new_id)
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to copy scene files: {e}")
 
-            if other_projects["count"] == 0:
+    try:
+        async with get_conn() as conn, conn.transaction():
+            if scene_num is None:
+                scene_num = (
+                    await conn.fetchval(
+                        "SELECT COUNT(*) FROM project_scenes WHERE project_id = $1",
+                        target_project_id,
+                    )
+                    + 1
+                )
+            else:
+                # scene_num 이후 씬을 한 칸씩 밀어 자리 만들기
                 await conn.execute(
                     """
-                    DELETE FROM scene
-                    WHERE id = $1
+                    UPDATE scene s
+                    SET scene_num = s.scene_num + 1
+                    FROM project_scenes ps
+                    WHERE ps.scene_id = s.id
+                      AND ps.project_id = $1
+                      AND s.scene_num >= $2
                     """,
-                    scene_id,
+                    target_project_id,
+                    scene_num,
                 )
 
-            await normalize_scene_numbers(conn, project_id)
-            new_count = await recalc_project_max_scene(conn, project_id)
+            await conn.execute(
+                "INSERT INTO scene (id, s3_key, scene_num) VALUES ($1, $2, $3)",
+                new_id,
+                s3_key,
+                scene_num,
+            )
+            await conn.execute(
+                """
+                INSERT INTO project_scenes (project_id, scene_id)
+                VALUES ($1, $2)
+                """,
+                target_project_id,
+                new_id,
+            )
 
-    return {"success": True, "message": "Scene deleted successfully", "max_scene": new_count}
+            await normalize_scene_numbers(conn, target_project_id)
+            await recalc_project_max_scene(conn, target_project_id)
+            scene_num = await conn.fetchval(
+                "SELECT scene_num FROM scene WHERE id = $1", new_id
+            )
+    except BaseException:
+        # DB 반영 실패 시 만든 링크 정리
+        await asyncio.to_thread(remove_scene_files, new_id)
+        raise
+
+    return SceneResponse(
+        success=True,
+        scene=Scene(
+            id=str(new_id),
+            project_id=str(target_project_id),
+            scene_num=scene_num,
+            s3_key=s3_key,
+        ),
+    )
 
 
-@router.put("/{scene_id}/originals")
-async def save_original_canvas(
+@router.post("/{scene_id}/duplicate", response_model=SceneResponse)
+async def duplicate_scene(
     project_id: uuid.UUID,
     scene_id: uuid.UUID,
-    canvas_data: dict = Body(...),
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """씬 복제: 바로 뒤에 새 씬을 만들고 파일은 원본 씬과 공유합니다. (copy-on-write)"""
+    scene_num = access.scene_num + 1 if access.scene_num else None
+    return await copy_scene(access, project_id, scene_num)
+
+
+@router.post("/{scene_id}/link", response_model=SceneResponse)
+async def link_scene(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    link: SceneLink,
     user: UserResponse = Depends(get_current_user),
+    access: SceneAccess = Depends(get_scene_access),
 ):
-    """원본 캔버스 데이터 저장"""
+    """
+    다른 프로젝트로 씬 연결: 대상 프로젝트의 마지막에 씬을 추가하고 파일은 원본 씬과 공유합니다.
+    씬 번호는 프로젝트마다 따로 매기므로 씬 행은 새로 만들고, 편집하면 그 프로젝트의 씬만 바뀝니다.
+    """
     async with get_conn() as conn:
-        scene_exists = await conn.fetchrow(
+        target = await conn.fetchval(
+            "SELECT 1 FROM project WHERE id = $1 AND user_id = $2",
+            link.project_id,
+            user.id,
+        )
+    if not target:
+        raise HTTPException(status_code=404, detail="Target project not found")
+    return await copy_scene(access, link.project_id, None)
+
+
+@router.delete("/{scene_id}")
+async def delete_scene(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """
+    씬 삭제
+    다른 프로젝트에서 쓰지 않는 씬이면 파일도 지웁니다. (복제본과 하드링크로 공유하던 내용은 남음)
+    """
+    scene_removed = False
+    async with get_conn() as conn, conn.transaction():
+        # project_scenes 관계 삭제
+        await conn.execute(
             """
-            SELECT s.id
-            FROM project_scenes ps
-                     JOIN scene s ON ps.scene_id = s.id
-            WHERE s.id = $1
-              AND ps.project_id = $2
+            DELETE FROM project_scenes
+            WHERE scene_id = $1 AND project_id = $2
             """,
             scene_id,
             project_id,
         )
 
-        if not scene_exists:
-            raise HTTPException(status_code=404, detail="Scene not found")
+        # scene 삭제 (다른 프로젝트에서 사용하지 않는 경우에만)
+        other_projects = await conn.fetchrow(
+            """
+            SELECT COUNT(*) as count
+            FROM project_scenes
+            WHERE scene_id = $1
+            """,
+            scene_id,
+        )
+
+        if other_projects["count"] == 0:
+            await conn.execute(
+                """
+                DELETE FROM scene
+                WHERE id = $1
+                """,
+                scene_id,
+            )
+            scene_removed = True
+
+        await normalize_scene_numbers(conn, project_id)
+        new_count = await recalc_project_max_scene(conn, project_id)
+
+    if scene_removed:
+        await delete_scene_files(scene_id)
+
+    return {"success": True, "message": "Scene deleted successfully", "max_scene": new_count}
+
 
+@router.put("/{scene_id}/originals")
+async def save_original_canvas(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    canvas_data: dict = Body(...),
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """
+    원본 캔버스 데이터 저장
+    파일 쓰기는 scene_writes가 병합해서 처리하며, 내용이 같으면 쓰지 않습니다.
+    응답의 version은 이후 PATCH .../originals의 base_version으로 사용합니다.
+    """
     try:
         # 원본 캔버스를 originals 폴더에 JSON으로 저장
         canvas_file = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
-
-        async with aiofiles.open(canvas_file, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(canvas_data, ensure_ascii=False, indent=2))
+        version = await save_canvas(canvas_file, canvas_data)
 
         # 씬 db 업데이트
-        async with get_conn() as conn:
-            scene = await conn.fetchrow(
-                """
-                UPDATE scene
-                SET s3_key = $1
-                WHERE id = $2 RETURNING id, s3_key, scene_num
-                """,
-                f"originals/{scene_id}.json",
-                scene_id,
-            )
+        s3_key = f"originals/{scene_id}.json"
+        await update_scene_key(access, s3_key)
 
         return {
             "success": True,
-            "output_url": scene["s3_key"],
+            "output_url": s3_key,
+            "version": version,
+            "versioned_url": versioned_url(f"/{s3_key}", version),
             "message": "Original canvas saved successfully",
         }
 
@@ -507,65 +675,53 @@ async def convert_canvas_to_dots(
     # conversion_options: dict = Body(default={}),
     image: Optional[UploadFile] = File(None),
     target_dots: int = 2000,
-    user: UserResponse = Depends(get_current_user),
+    access: SceneAccess = Depends(get_scene_access),
 ):
     """원본 캔버스를 도트 캔버스로 변환"""
 
-    async with get_conn() as conn:
-        # 씬 존재 여부 확인
-        scene_exists = await conn.fetchrow(
-            """
-            SELECT s.id
-            FROM project_scenes ps
-            JOIN scene s ON ps.scene_id = s.id
-            WHERE s.id = $1 AND ps.project_id = $2
-            """,
-            scene_id,
-            project_id,
-        )
-
-        if not scene_exists:
-            raise HTTPException(status_code=404, detail="Scene not found")
-
     # 파일 위치 정의
     original_path = os.path.join(ORIGINALS_DIR, f"{scene_id}.png")
     temp_processed_path = None
 
     try:
         # 1. 원본 이미지를 받았으면 해당 이미지로 원본 이미지 대체
+        # (임시 파일 + 교체: 복제된 씬과 하드링크로 공유 중인 파일을 덮어쓰지 않음)
         if image:
-            async with aiofiles.open(original_path, "wb") as out_file:
-                content = await image.read()
-                await out_file.write(content)
+            tmp_original_path = f"{original_path}.{uuid.uuid4().hex}.tmp"
+            async with aiofiles.open(tmp_original_path, "wb") as out_file:
+                while chunk := await image.read(1 << 16):
+                    await out_file.write(chunk)
+            os.replace(tmp_original_path, original_path)
 
         # 2. 임시 원본 파일로 변환 작업을 시도
         temp_processed_path = process_image(original_path, target_dots=target_dots)
 
         # 3-1. 변환 성공 시, 임시 변환 파일을 영구 저장소로 이동
         permanent_processed_path = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
+        # 대기 중인 도트 캔버스 저장이 변환 결과를 덮어쓰지 않도록 먼저 버림
+        await discard_canvas(permanent_processed_path)
         shutil.move(temp_processed_path, permanent_processed_path)
-
-        # 4. DB의 s3_key에 변환된 캔버스 json 파일을 저장.
-        async with get_conn() as conn:
-            await conn.execute(
-                """
-                    UPDATE scene
-                    SET s3_key = $1
-                    WHERE id = $2
-                    AND EXISTS (
-                        SELECT 1 FROM project_scenes
-                        WHERE scene_id = $2 AND project_id = $3
-                    )
-                    """,
-                f"processed/{scene_id}.json",
-                scene_id,
-                project_id,
-            )
+        # process_image가 함께 만든 사이드카(.dots)도 같이 이동 (mtime 유지 → 최신 상태 유지)
+        temp_sidecar_path = sidecar_path_for(temp_processed_path)
+        if os.path.exists(temp_sidecar_path):
+            shutil.move(temp_sidecar_path, sidecar_path_for(permanent_processed_path))
+        else:
+            await asyncio.to_thread(write_sidecar_for_json, permanent_processed_path)
+        await asyncio.to_thread(write_precompressed, permanent_processed_path)
+        version = await asyncio.to_thread(file_version, permanent_processed_path)
+        # 썸네일은 변환된 도트 데이터로 서버에서 렌더링 (백그라운드)
+        thumbnail_renderer.schedule(str(scene_id), permanent_processed_path)
+
+        # 4. DB의 s3_key에 변환된 캔버스 json 파일을 저장. (소속 확인은 get_scene_access에서 완료)
+        s3_key = f"processed/{scene_id}.json"
+        await update_scene_key(access, s3_key)
 
         return {
             "success": True,
             "message": "Canvas converted to dots successfully",
-            "output_url": f"processed/{scene_id}.json",
+            "output_url": s3_key,
+            "version": version,
+            "versioned_url": versioned_url(f"/{s3_key}", version),
         }
 
     except Exception as e:
@@ -577,48 +733,28 @@ async def save_dot_canvas(
     project_id: uuid.UUID,
     scene_id: uuid.UUID,
     canvas_data: dict = Body(...),
-    user: UserResponse = Depends(get_current_user),
+    access: SceneAccess = Depends(get_scene_access),
 ):
-    """도트 캔버스 데이터 저장"""
-    async with get_conn() as conn:
-        scene_exists = await conn.fetchrow(
-            """
-            SELECT s.id
-            FROM project_scenes ps
-                     JOIN scene s ON ps.scene_id = s.id
-            WHERE s.id = $1
-              AND ps.project_id = $2
-            """,
-            scene_id,
-            project_id,
-        )
-
-        if not scene_exists:
-            raise HTTPException(status_code=404, detail="Scene not found")
-
+    """
+    도트 캔버스 데이터 저장
+    파일 쓰기는 scene_writes가 병합해서 처리하며, 내용이 같으면 쓰지 않습니다.
+    응답의 version은 이후 PATCH .../processed의 base_version으로 사용합니다.
+    """
     try:
         # 도트 캔버스를 processed 폴더에 저장
+        # (쓰기 직후 내보내기/검증용 바이너리 사이드카(.dots)도 갱신)
         dot_canvas_file = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
-
-        async with aiofiles.open(dot_canvas_file, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(canvas_data, ensure_ascii=False, indent=2))
+        version = await save_canvas(dot_canvas_file, canvas_data, sidecar=True)
 
         # 씬 db 업데이트
-        async with get_conn() as conn:
-            scene = await conn.fetchrow(
-                """
-                UPDATE scene
-                SET s3_key = $1
-                WHERE id = $2
-                RETURNING id, s3_key, scene_num
-                """,
-                f"processed/{scene_id}.json",
-                scene_id,
-            )
+        s3_key = f"processed/{scene_id}.json"
+        await update_scene_key(access, s3_key)
 
         return {
             "success": True,
-            "output_url": scene["s3_key"],
+            "output_url": s3_key,
+            "version": version,
+            "versioned_url": versioned_url(f"/{s3_key}", version),
             "message": "Dot canvas saved successfully",
         }
 
@@ -628,45 +764,150 @@ async def save_dot_canvas(
         )
 
 
+async def patch_canvas(
+    access: SceneAccess,
+    canvas_file: str,
+    s3_key: str,
+    patch_data: CanvasPatch,
+    *,
+    sidecar: bool = False,
+) -> dict:
+    """
+    서버의 캔버스 사본에 JSON Patch / 객체 delta를 적용해 저장합니다.
+    base_version이 현재 버전과 다르면 409와 함께 현재 버전을 돌려줍니다.
+    """
+    if (patch_data.patch is None) == (patch_data.objects is None):
+        raise HTTPException(
+            status_code=400, detail="Provide exactly one of 'patch' or 'objects'"
+        )
+
+    async with canvas_cache.lock(canvas_file):
+        current = await canvas_cache.load(canvas_file)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Canvas not found")
+        if patch_data.base_version != current.version:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "Canvas has changed since base_version",
+                    "version": current.version,
+                },
+            )
+
+        try:
+            if patch_data.patch is not None:
+                canvas_data = apply_json_patch(current.data, patch_data.patch)
+            else:
+                canvas_data = apply_object_delta(current.data, patch_data.objects)
+        except PatchError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if not isinstance(canvas_data, dict):
+            raise HTTPException(status_code=422, detail="Canvas must be a JSON object")
+
+        version = await save_canvas(canvas_file, canvas_data, sidecar=sidecar)
+
+    await update_scene_key(access, s3_key)
+    return {
+        "success": True,
+        "output_url": s3_key,
+        "version": version,
+        "versioned_url": versioned_url(f"/{s3_key}", version),
+    }
+
+
+@router.patch("/{scene_id}/originals")
+async def patch_original_canvas(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    patch_data: CanvasPatch,
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """원본 캔버스 부분 저장 (JSON Patch / 객체 delta)"""
+    return await patch_canvas(
+        access,
+        os.path.join(ORIGINALS_DIR, f"{scene_id}.json"),
+        f"originals/{scene_id}.json",
+        patch_data,
+    )
+
+
+@router.patch("/{scene_id}/processed")
+async def patch_dot_canvas(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    patch_data: CanvasPatch,
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """도트 캔버스 부분 저장 (JSON Patch / 객체 delta)"""
+    return await patch_canvas(
+        access,
+        os.path.join(PROCESSED_DIR, f"{scene_id}.json"),
+        f"processed/{scene_id}.json",
+        patch_data,
+        sidecar=True,
+    )
+
+
+@router.get("/{scene_id}/validation")
+async def validate_scene(
+    project_id: uuid.UUID,
+    scene_id: uuid.UUID,
+    transform: ExportTransform = Depends(get_export_transform),
+    limit: int = 100,
+    access: SceneAccess = Depends(get_scene_access),
+):
+    """
+    처리된 씬의 최소 간격(project.min_separation) 검증
+    내보내기와 같은 변환(scale / offset) 적용 후, 가까운 쌍부터 limit 개를 좌표와 함께 반환합니다.
+    """
+    await scene_writes.flush([os.path.join(PROCESSED_DIR, f"{scene_id}.json")])
+    show_scene = await asyncio.to_thread(
+        build_scene_data, scene_id, access.scene_num, 0, transform
+    )
+    if show_scene is None:
+        raise HTTPException(status_code=404, detail="Processed scene not found")
+
+    min_separation = float(access.min_separation or 2.0)
+    report = await asyncio.to_thread(
+        validate_separation, show_scene, min_separation, str(scene_id)
+    )
+    return {"success": True, **report.to_dict(limit=max(0, limit))}
+
+
 @router.post("/{scene_id}/thumbnail")
 async def upload_scene_thumbnail(
     project_id: uuid.UUID,
     scene_id: uuid.UUID,
     thumbnail: UploadFile = File(...),
-    user: UserResponse = Depends(get_current_user),
+    access: SceneAccess = Depends(get_scene_access),
 ):
-    """씬 썸네일 이미지 업로드"""
-
-    # 1. 씬 존재 여부 확인
-    async with get_conn() as conn:
-        scene_exists = await conn.fetchrow(
-            """
-            SELECT s.id
-            FROM project_scenes ps
-                     JOIN scene s ON ps.scene_id = s.id
-            WHERE s.id = $1
-              AND ps.project_id = $2
-            """,
-            scene_id,
-            project_id,
-        )
-        if not scene_exists:
-            raise HTTPException(status_code=404, detail="Scene not found")
+    """
+    씬 썸네일 이미지 업로드
+    도트 씬(processed)의 썸네일은 저장 후 서버가 직접 렌더링하므로,
+    아직 변환하지 않은 원본 씬에서만 사용합니다.
+    """
 
     # 썸네일 저장 경로 정의
     thumbnail_filename = f"{scene_id}.png"
     thumbnail_save_path = os.path.join(THUMBNAILS_DIR, thumbnail_filename)
 
     try:
-        # 2. 썸네일 파일 저장
-        async with aiofiles.open(thumbnail_save_path, "wb") as f:
-            content = await thumbnail.read()
-            await f.write(content)
+        # 2. 썸네일 파일 저장 (메모리에 한 번에 읽지 않고 조각 단위로 쓰면서 해시)
+        digest = hashlib.sha256()
+        tmp_path = f"{thumbnail_save_path}.{uuid.uuid4().hex}.tmp"
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await thumbnail.read(1 << 16):
+                digest.update(chunk)
+                await f.write(chunk)
+        os.replace(tmp_path, thumbnail_save_path)
+        version = digest.hexdigest()[:VERSION_LENGTH]
+        remember_version(thumbnail_save_path, version)
 
         return {
             "success": True,
             "message": "Thumbnail uploaded successfully",
             "thumbnail_url": f"thumbnails/{thumbnail_filename}",
+            "versioned_url": versioned_url(f"/thumbnails/{thumbnail_filename}", version),
         }
 
     except Exception as e:
@@ -685,3 +926,13 @@ def get_display_url(original_s3_key: str) -> str:
         )
 
     return original_s3_key
+
+
+def _render_thumbnail_after_write(path: str) -> None:
+    """scene_writes가 processed/{scene_id}.json을 쓰면 썸네일 렌더링을 예약합니다."""
+    directory, filename = os.path.split(path)
+    if filename.endswith(".json") and directory == os.path.realpath(PROCESSED_DIR):
+        thumbnail_renderer.schedule(filename[: -len(".json")], path)
+
+
+scene_writes.add_listener(_render_thumbnail_after_write)
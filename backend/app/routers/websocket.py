@@ -1,28 +1,60 @@
-import json  # JSON 라이브러리 import
-from typing import List
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+from app.dependencies import get_current_user
+from app.utils import jsonio
+
 
-# (ConnectionManager 클래스는 변경 없음)
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # 로그인 쿠키(access_token)로 인증된 연결의 사용자 ID
+        self.connection_users: Dict[WebSocket, Any] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, user_id: Optional[Any] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        if user_id is not None:
+            self.connection_users[websocket] = user_id
 
     def disconnect(self, websocket: WebSocket):
         self.active_connections.remove(websocket)
+        self.connection_users.pop(websocket, None)
+
+    async def send_json_to_user(self, user_id: Any, data: Any):
+        """user_id로 인증된 연결에만 객체를 전송합니다. (내보내기 작업 진행 등 사용자별 이벤트)"""
+        message = jsonio.dumps(data).decode("utf-8")
+        for connection, owner in list(self.connection_users.items()):
+            if owner != user_id:
+                continue
+            try:
+                await connection.send_text(message)
+            except Exception as e:
+                print(f"[웹소켓] 사용자 이벤트 전송 실패: {e}")
 
     async def broadcast(self, message: str):
         for connection in self.active_connections:
             await connection.send_text(message)
 
+    async def broadcast_json(self, data: Any):
+        """객체를 한 번만 직렬화해서 모든 연결에 전송합니다."""
+        await self.broadcast(jsonio.dumps(data).decode("utf-8"))
+
 
 manager = ConnectionManager()
 
+
+async def _connection_user_id(websocket: WebSocket) -> Optional[Any]:
+    """쿠키의 access_token으로 연결한 사용자 ID (없거나 유효하지 않으면 None, 연결은 허용)"""
+    token = websocket.cookies.get("access_token")
+    if token is None:
+        return None
+    try:
+        return (await get_current_user(token)).id
+    except HTTPException:
+        return None
+
 router = APIRouter(
     prefix="/ws",
     tags=["websocket"],
@@ -31,7 +63,7 @@ router = APIRouter(
 
 @router.websocket("/unity")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    await manager.connect(websocket, await _connection_user_id(websocket))
     try:
         while True:
             data = await websocket.receive_text()
@@ -39,9 +71,9 @@ async def websocket_endpoint(websocket: WebSocket):
             print("[웹소켓] 수신된 원문 메시지:", data)
             # JSON으로 파싱 가능하면 보기 좋게 출력
             try:
-                parsed = json.loads(data)
+                parsed = jsonio.loads(data)
                 print("[웹소켓] 파싱된 JSON:")
-                print(json.dumps(parsed, ensure_ascii=False, indent=2))
+                print(jsonio.dumps(parsed, indent=True).decode("utf-8"))
             except Exception:
                 # JSON이 아니면 무시
                 pass
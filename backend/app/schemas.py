@@ -201,6 +201,28 @@ class ScenePatch(BaseModel):
     status: str
 
 
+class SceneMove(BaseModel):
+    """씬 순서 변경 요청"""
+
+    scene_num: int = Field(..., ge=1, description="옮길 위치 (1부터)")
+
+
+class SceneLink(BaseModel):
+    """다른 프로젝트로 씬 연결 요청"""
+
+    project_id: uuid.UUID = Field(..., description="씬을 추가할 프로젝트 ID")
+
+
+class CanvasPatch(BaseModel):
+    """캔버스 부분 저장 요청: patch(RFC 6902) 또는 objects(객체 delta) 중 하나"""
+
+    base_version: str = Field(..., description="패치를 만든 기준 캔버스 버전")
+    patch: Optional[List[dict]] = Field(None, description="RFC 6902 JSON Patch 연산 목록")
+    objects: Optional[dict] = Field(
+        None, description="객체 id → 바꿀 속성 (null이면 삭제)"
+    )
+
+
 class DeleteImageRequest(BaseModel):
     imageUrl: str
 
@@ -0,0 +1,341 @@
+"""
+연속된 씬 사이의 드론 ↔ 도트 배정
+
+씬 i의 드론 k가 씬 i+1에서 어느 도트로 이동할지 정해, 전체 이동 거리의 합이
+최소가 되도록(cost=distance**power) 배정합니다.
+
+- 배정: ε-scaling 옥션 알고리즘. 배정되지 않은 드론들이 한 라운드에 동시에 입찰(Jacobi 방식)하므로,
+  라운드마다 NumPy 배열 연산 몇 번으로 처리됩니다. 결과는 최적해의 n·ε 이내입니다.
+- 후보: 드론마다 입찰에 쓰는 후보 도트 몇 개와, 후보 밖 도트의 가치(benefit - 가격) 상한을 둡니다.
+  후보의 가치가 모두 상한보다 못해지면 후보를 다시 고릅니다. (_Candidates)
+  후보만으로 배정하지 못하는 드론은 없고, 결과는 후보를 제한하지 않은 옥션과 같습니다.
+- 도트가 드론보다 많으면 남는 도트를 맡는 가상 드론을 두어 정사각 문제로 풉니다.
+
+power=1은 이동 거리 합 최소, power=2는 긴 이동에 더 큰 벌점을 주어 최대 이동 거리를
+줄이는 쪽으로 배정합니다.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_NEIGHBORS = 16
+# 후보를 다시 고를 때 먼저 살펴보는 가까운 도트 수
+_POOL_NEIGHBORS = 256
+# 가격 격자 칸당 평균 도트 수
+_GRID_OCCUPANCY = 32
+_BLOCK = 1024
+_EPS_DIVISOR = 5.0
+
+
+def _squared_distances(sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """(len(sources), len(targets)) 제곱 거리"""
+    d2 = (
+        np.einsum("ij,ij->i", sources, sources)[:, None]
+        - 2.0 * sources @ targets.T
+        + np.einsum("ij,ij->i", targets, targets)[None, :]
+    )
+    return np.maximum(d2, 0.0, out=d2)
+
+
+def _knn(
+    sources: np.ndarray, targets: np.ndarray, k: int, power: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """각 source에 대해 가까운 target k개의 (인덱스, 비용)을 구합니다. (비용 오름차순)"""
+    n = sources.shape[0]
+    k = min(k, targets.shape[0])
+    idx = np.empty((n, k), dtype=np.int64)
+    cost = np.empty((n, k), dtype=np.float64)
+
+    for start in range(0, n, _BLOCK):
+        d2 = _squared_distances(sources[start : start + _BLOCK], targets)
+        if k < targets.shape[0]:
+            part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(k), d2.shape)
+        part_d2 = np.take_along_axis(d2, part, axis=1)
+        order = np.argsort(part_d2, axis=1)
+        idx[start : start + d2.shape[0]] = np.take_along_axis(part, order, axis=1)
+        cost[start : start + d2.shape[0]] = np.sqrt(
+            np.take_along_axis(part_d2, order, axis=1)
+        ) ** power
+
+    return idx, cost
+
+
+def _top_values(values: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """행마다 가치가 큰 순서로 (상위 width개의 열, width+1번째 가치). width < 열 수"""
+    top = np.argpartition(-values, width, axis=1)[:, : width + 1]
+    order = np.argsort(-np.take_along_axis(values, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    return top[:, :width], values[np.arange(values.shape[0]), top[:, width]]
+
+
+def _scan_all(
+    bidders: np.ndarray, objects: np.ndarray, prices: np.ndarray, power: float, width: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """모든 object 중 현재 가치가 가장 높은 width개의 (인덱스, benefit, width+1번째 가치)"""
+    n = bidders.shape[0]
+    idx = np.empty((n, width), dtype=np.int64)
+    benefit = np.empty((n, width), dtype=np.float64)
+    next_value = np.empty(n, dtype=np.float64)
+
+    for start in range(0, n, _BLOCK):
+        full = -(np.sqrt(_squared_distances(bidders[start : start + _BLOCK], objects)) ** power)
+        top, after = _top_values(full - prices[None, :], width)
+        end = start + full.shape[0]
+        idx[start:end] = top
+        benefit[start:end] = np.take_along_axis(full, top, axis=1)
+        next_value[start:end] = after
+
+    return idx, benefit, next_value
+
+
+class _PriceGrid:
+    """
+    object를 균일 격자 칸으로 나눠, 칸별 최저 가격과 칸까지의 최소 거리로
+    어떤 점에서 radius보다 먼 object의 가치(-cost - 가격) 상한을 구합니다.
+    """
+
+    def __init__(self, objects: np.ndarray):
+        m, dims = objects.shape
+        lo = objects.min(axis=0)
+        per_axis = max(1, int(round((m / _GRID_OCCUPANCY) ** (1.0 / dims))))
+        size = np.maximum((objects.max(axis=0) - lo) / per_axis, 1e-9)
+        cells = np.minimum(((objects - lo) / size).astype(np.int64), per_axis - 1)
+        keys = np.ravel_multi_index(tuple(cells.T), (per_axis,) * dims)
+        self.order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[self.order]
+        self.starts = np.flatnonzero(
+            np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+        )
+        used = np.stack(
+            np.unravel_index(sorted_keys[self.starts], (per_axis,) * dims), axis=1
+        )
+        self.box_lo = lo + used * size
+        self.box_hi = self.box_lo + size
+
+    def bound(
+        self, points: np.ndarray, radius: np.ndarray, prices: np.ndarray, power: float
+    ) -> np.ndarray:
+        min_price = np.minimum.reduceat(prices[self.order], self.starts)
+        gap = np.maximum(self.box_lo[None, :, :] - points[:, None, :], 0.0) + np.maximum(
+            points[:, None, :] - self.box_hi[None, :, :], 0.0
+        )
+        dist = np.maximum(np.sqrt(np.einsum("ijk,ijk->ij", gap, gap)), radius[:, None])
+        return (-(dist**power) - min_price[None, :]).max(axis=1)
+
+
+class _Candidates:
+    """
+    입찰자별 후보(cand, benefit: 입찰에 쓰는 width개)와 후보 밖 가치의 상한(outside)
+
+    후보는 풀(pool)에서 현재 가치가 높은 순서로 고릅니다.
+    - 처음 풀: 가까운 _POOL_NEIGHBORS개 + 두 씬의 무게중심을 맞춘 위치에서 가까운 k개
+      (씬 전체가 평행 이동해도 짝이 풀에 들어감). 풀 밖 object는 풀 반경보다 멀고,
+      그 가치 상한은 _PriceGrid로 가격이 오를수록 더 좁게 구합니다.
+    - 풀 안에 상한보다 나은 object가 없으면 모든 object를 훑어 현재 가치가 가장 높은 object들로
+      풀을 바꾸고, 그 다음 순위 가치를 풀 밖 상한으로 둡니다.
+    가격은 내려가지 않으므로 한 번 구한 상한은 계속 유효합니다.
+    """
+
+    def __init__(self, bidders: np.ndarray, objects: np.ndarray, k: int, power: float):
+        n, m = bidders.shape[0], objects.shape[0]
+        self.bidders = bidders
+        self.objects = objects
+        self.power = power
+        self.width = min(2 * k, m)
+        self.grid: Optional[_PriceGrid] = None
+
+        size = max(_POOL_NEIGHBORS, 4 * k)
+        if self.width >= m or size + k >= m:
+            # 모든 object가 풀
+            pool, cost = _knn(bidders, objects, m, power)
+            self.pool, self.pool_benefit = pool, -cost
+            self.pool_bound = np.full(n, -np.inf)
+            self.pool_radius = np.full(n, np.inf)
+        else:
+            near, near_cost = _knn(bidders, objects, size, power)
+            shift = objects.mean(axis=0) - bidders.mean(axis=0)
+            shifted, _ = _knn(bidders + shift, objects, k, power)
+            diff = objects[shifted] - bidders[:, None, :]
+            pool = np.concatenate([near, shifted], axis=1)
+            benefit = np.concatenate(
+                [-near_cost, -(np.sqrt(np.einsum("ijk,ijk->ij", diff, diff)) ** power)],
+                axis=1,
+            )
+            order = np.argsort(pool, axis=1, kind="stable")
+            self.pool = np.take_along_axis(pool, order, axis=1)
+            self.pool_benefit = np.take_along_axis(benefit, order, axis=1)
+            # 겹친 칸은 빈 칸
+            self.pool_benefit[:, 1:][self.pool[:, 1:] == self.pool[:, :-1]] = -np.inf
+            self.pool_bound = -near_cost[:, -1]
+            self.pool_radius = near_cost[:, -1] ** (1.0 / power)
+            self.grid = _PriceGrid(objects)
+
+        if self.width >= m:
+            self.cand, self.benefit = self.pool, self.pool_benefit
+            self.outside = np.full(n, -np.inf)
+        else:
+            self.cand = np.empty((n, self.width), dtype=np.int64)
+            self.benefit = np.empty((n, self.width), dtype=np.float64)
+            self.outside = np.empty(n, dtype=np.float64)
+            self.refresh(np.arange(n), np.zeros(m))
+
+    def refresh(self, rows: np.ndarray, prices: np.ndarray) -> None:
+        """rows 입찰자의 후보를 현재 가격 기준으로 다시 고릅니다."""
+        values = self.pool_benefit[rows] - prices[self.pool[rows]]
+        bound = self.pool_bound[rows]
+        if self.grid is not None:
+            bound = np.minimum(
+                bound,
+                self.grid.bound(self.bidders[rows], self.pool_radius[rows], prices, self.power),
+            )
+
+        loose = values.max(axis=1) < bound
+        if loose.any():
+            # 풀 밖이 더 나을 수 있음 → 모든 object에서 풀을 다시 고름
+            scan = rows[loose]
+            self.pool[scan], self.pool_benefit[scan], self.pool_bound[scan] = _scan_all(
+                self.bidders[scan], self.objects, prices, self.power, self.pool.shape[1]
+            )
+            self.pool_radius[scan] = 0.0
+            values[loose] = self.pool_benefit[scan] - prices[self.pool[scan]]
+            bound[loose] = self.pool_bound[scan]
+
+        top, next_value = _top_values(values, self.width)
+        self.cand[rows] = np.take_along_axis(self.pool[rows], top, axis=1)
+        self.benefit[rows] = np.take_along_axis(self.pool_benefit[rows], top, axis=1)
+        self.outside[rows] = np.maximum(next_value, bound)
+
+
+def _auction(
+    bidders: np.ndarray, objects: np.ndarray, power: float, neighbors: int
+) -> np.ndarray:
+    """
+    len(bidders) <= len(objects)일 때 모든 bidder를 서로 다른 object에 배정하는
+    ε-scaling Jacobi 옥션 (benefit = -cost 최대화). 반환: bidder별 object 인덱스
+
+    object가 입찰자보다 많으면 모든 object에 benefit 0인 가상 입찰자(번호 n 이후)를
+    남는 수만큼 두어 정사각 문제로 풉니다. (배정되지 않고 남는 object의 가격이 이전 단계에서
+    올라간 채로 남아 배정을 왜곡하는 것을 막음) 가상 입찰자는 모두 같으므로 남은 W명이
+    가장 싼 W개의 object에 (W+1번째 가격 + ε)로 한 번에 입찰합니다.
+    """
+    n, m = bidders.shape[0], objects.shape[0]
+    if m == 1:
+        return np.zeros(n, dtype=np.int64)
+    candidates = _Candidates(bidders, objects, max(1, neighbors), power)
+
+    # 최종 ε: 전체 비용 합이 최적해와 n·ε 이내 → 가장 가까운 도트 비용 중앙값의 0.1% 수준
+    benefit = candidates.benefit
+    finite = benefit[np.isfinite(benefit)]
+    eps_final = max(float(np.median(-benefit.max(axis=1))), 1e-9) * 1e-3
+    eps = max(float(finite.max() - finite.min()) / 4.0, eps_final)
+    prices = np.zeros(m, dtype=np.float64)
+
+    while True:
+        assigned = np.full(m, -1, dtype=np.int64)
+        owner = np.full(m, -1, dtype=np.int64)
+
+        while True:
+            waiting = np.flatnonzero(assigned[:n] == -1)
+            values = candidates.benefit[waiting] - prices[candidates.cand[waiting]]
+
+            # 후보가 모두 후보 밖 상한보다 못해진 입찰자는 후보를 다시 고름
+            stale = values.max(axis=1) < candidates.outside[waiting]
+            if stale.any():
+                rows = waiting[stale]
+                candidates.refresh(rows, prices)
+                values[stale] = candidates.benefit[rows] - prices[candidates.cand[rows]]
+
+            # 가장 높은 가치와 두 번째 가치 (후보 밖 상한 포함)
+            top2 = np.argpartition(-values, 1, axis=1)[:, :2]
+            v = np.take_along_axis(values, top2, axis=1)
+            best_col = np.where(v[:, 1] > v[:, 0], top2[:, 1], top2[:, 0])
+            best_val = np.maximum(v[:, 0], v[:, 1])
+            second_val = np.maximum(
+                np.minimum(v[:, 0], v[:, 1]), candidates.outside[waiting]
+            )
+            round_bidders = waiting
+            targets = candidates.cand[waiting, best_col]
+            bids = prices[targets] + (best_val - second_val) + eps
+
+            dummies = n + np.flatnonzero(assigned[n:] == -1)
+            if dummies.size:
+                cheapest = np.argpartition(prices, dummies.size)
+                round_bidders = np.concatenate([round_bidders, dummies])
+                targets = np.concatenate([targets, cheapest[: dummies.size]])
+                bids = np.concatenate(
+                    [bids, np.full(dummies.size, prices[cheapest[dummies.size]] + eps)]
+                )
+            if round_bidders.size == 0:
+                break
+
+            # object마다 가장 높은 입찰만 채택
+            order = np.lexsort((-bids, targets))
+            targets_sorted = targets[order]
+            first = np.ones(order.size, dtype=bool)
+            first[1:] = targets_sorted[1:] != targets_sorted[:-1]
+            win = order[first]
+            win_targets = targets[win]
+            win_bidders = round_bidders[win]
+
+            previous = owner[win_targets]
+            assigned[previous[previous >= 0]] = -1
+            owner[win_targets] = win_bidders
+            assigned[win_bidders] = win_targets
+            prices[win_targets] = bids[win]
+
+        if eps <= eps_final:
+            return assigned[:n]
+        eps = max(eps / _EPS_DIVISOR, eps_final)
+
+
+def assign_targets(
+    sources: np.ndarray,
+    targets: np.ndarray,
+    *,
+    power: float = 1.0,
+    neighbors: int = DEFAULT_NEIGHBORS,
+) -> np.ndarray:
+    """
+    sources(드론의 현재 위치, (n, d))를 targets(다음 씬 도트, (m, d))에 배정합니다.
+
+    반환값 order (길이 max(n, m)): order[i]는 i번째 드론이 이동할 도트 인덱스입니다.
+    - n <= m: targets[order]가 드론 순서대로 정렬된 다음 씬이고, order[n:]는 새로 추가되는 드론의 도트
+    - n > m: 도트를 배정받지 못한 드론은 -1 (주차 슬롯, 드론 번호는 그대로 유지)
+    """
+    sources = np.asarray(sources, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    n, m = sources.shape[0], targets.shape[0]
+    if m == 0:
+        return np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return np.arange(m)
+
+    if n > m:
+        # 도트가 드론보다 적으면 도트가 드론을 고르도록 뒤집어서 풉니다.
+        drone_of_dot = _auction(targets, sources, power, neighbors)
+        order = np.full(n, -1, dtype=np.int64)
+        order[drone_of_dot] = np.arange(m)
+        return order
+
+    dot_of_drone = _auction(sources, targets, power, neighbors)
+    rest = np.ones(m, dtype=bool)
+    rest[dot_of_drone] = False
+    return np.concatenate([dot_of_drone, np.flatnonzero(rest)])
+
+
+def assignment_cost(
+    sources: np.ndarray, targets_ordered: np.ndarray
+) -> Tuple[float, float]:
+    """배정 결과의 (이동 거리 합, 최대 이동 거리). 공통 길이만 비교합니다."""
+    n = min(len(sources), len(targets_ordered))
+    if n == 0:
+        return 0.0, 0.0
+    d = np.linalg.norm(
+        np.asarray(targets_ordered[:n], dtype=np.float64)
+        - np.asarray(sources[:n], dtype=np.float64),
+        axis=1,
+    )
+    return float(d.sum()), float(d.max())
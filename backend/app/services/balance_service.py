@@ -0,0 +1,158 @@
+"""
+씬별 드론 수 맞추기 (fleet balancing)
+
+모든 씬의 action_data 길이를 같은 드론 수(fleet)로 맞춥니다.
+- 도트가 부족한 씬: 남는 드론을 꺼진 상태(led_rgb 0, led_intensity 0)로 주차 위치에 둡니다.
+  주차 위치는 형상 뒤쪽(z + 여유 거리) 평면의 격자로, 간격은 min_separation보다 넓습니다.
+- 도트가 많은 씬: 균일 격자(voxel)로 공간을 나눠 칸마다 중심에 가장 가까운 도트 하나를 남깁니다.
+  칸 크기는 남는 칸 수가 fleet 이상이 되는 가장 큰 값을 이분 탐색으로 찾고,
+  초과분은 도트가 적은 칸부터 뺍니다. 원래 도트의 부분 집합이므로 색과 형상이 유지됩니다.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+
+# 주차 격자 간격 = min_separation * PARKING_SPACING_FACTOR
+PARKING_SPACING_FACTOR = 1.5
+_SEARCH_STEPS = 40
+
+
+@dataclass(frozen=True)
+class FleetSpec:
+    """모든 씬에 맞출 드론 수와 주차 간격 기준"""
+
+    size: int
+    min_separation: float
+
+
+def _voxel_groups(
+    positions: np.ndarray, cell_size: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(도트를 칸 순서로 정렬한 인덱스, 칸별 시작 위치)"""
+    cells = np.floor((positions - positions.min(axis=0)) / cell_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(
+        np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+    )
+    return order, starts
+
+
+def decimate_indices(positions: np.ndarray, count: int) -> np.ndarray:
+    """
+    positions (n, 3) 중 형상을 유지하는 count 개 도트의 인덱스 (원래 순서)
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    n = positions.shape[0]
+    if count >= n:
+        return np.arange(n)
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    extent = float((positions.max(axis=0) - positions.min(axis=0)).max())
+    if extent <= 0:
+        return np.arange(count)
+
+    # 칸 수가 count 이상인 가장 큰 칸 크기 (칸이 클수록 칸 수는 줄어듦)
+    lo, hi = extent / (4.0 * n), extent * 2.0
+    for _ in range(_SEARCH_STEPS):
+        mid = (lo + hi) / 2.0
+        if _voxel_groups(positions, mid)[1].shape[0] >= count:
+            lo = mid
+        else:
+            hi = mid
+    order, starts = _voxel_groups(positions, lo)
+    sizes = np.diff(np.append(starts, n))
+
+    # 칸마다 중심에 가장 가까운 도트
+    sorted_pos = positions[order]
+    centroids = np.add.reduceat(sorted_pos, starts, axis=0) / sizes[:, None]
+    cell_of = np.repeat(np.arange(starts.shape[0]), sizes)
+    gap = np.einsum(
+        "ij,ij->i", sorted_pos - centroids[cell_of], sorted_pos - centroids[cell_of]
+    )
+    nearest = np.lexsort((gap, cell_of))
+    first = np.concatenate([[True], cell_of[nearest][1:] != cell_of[nearest][:-1]])
+    representatives = order[nearest[first]]
+
+    # 칸이 count보다 많으면 도트가 적은 칸부터 제외
+    keep = representatives[np.argsort(-sizes, kind="stable")[:count]]
+    if keep.shape[0] < count:
+        # 같은 위치에 겹친 도트가 많아 칸 수가 모자라면 남은 도트로 채움
+        rest = np.setdiff1d(np.arange(n), keep)[: count - keep.shape[0]]
+        keep = np.concatenate([keep, rest])
+    return np.sort(keep)
+
+
+def parking_positions(
+    count: int, bbox_min: np.ndarray, bbox_max: np.ndarray, spacing: float
+) -> np.ndarray:
+    """
+    형상 뒤쪽 평면(z = bbox_max.z + spacing)에 count 개 주차 위치를 격자로 배치합니다.
+    형상의 x 범위에 맞춰 열 수를 정하고, 모자라면 y 방향으로 줄을 늘립니다.
+    """
+    if count <= 0:
+        return np.empty((0, 3), dtype=np.float64)
+    spacing = max(float(spacing), 1e-6)
+    width = float(bbox_max[0] - bbox_min[0])
+    columns = max(1, int(width // spacing) + 1)
+    index = np.arange(count)
+    out = np.empty((count, 3), dtype=np.float64)
+    out[:, 0] = bbox_min[0] + (index % columns) * spacing
+    out[:, 1] = bbox_min[1] + (index // columns) * spacing
+    out[:, 2] = bbox_max[2] + spacing
+    return out
+
+
+def park_unassigned(scene: ShowScene, order: np.ndarray, min_separation: float) -> ShowScene:
+    """
+    order 순서로 드론(행)을 재배열하되, order가 -1인 드론은 꺼진 상태로 주차 위치에 둡니다.
+    (assign_targets가 도트보다 많은 드론에 돌려주는 주차 슬롯 → 드론 번호가 그대로 유지됨)
+    """
+    order = np.asarray(order, dtype=np.int64)
+    parked = order < 0
+    if not parked.any():
+        return scene.reordered(order)
+
+    if len(scene):
+        bbox_min = scene.transform_pos.min(axis=0)
+        bbox_max = scene.transform_pos.max(axis=0)
+    else:
+        bbox_min = bbox_max = np.zeros(3)
+    spacing = min_separation * PARKING_SPACING_FACTOR
+
+    transform_pos = np.empty((len(order), 3), dtype=np.float64)
+    led_rgb = np.zeros((len(order), 3), dtype=np.uint8)
+    led_intensity = np.zeros(len(order), dtype=np.float64)
+    kept = order[~parked]
+    transform_pos[~parked] = scene.transform_pos[kept]
+    transform_pos[parked] = parking_positions(int(parked.sum()), bbox_min, bbox_max, spacing)
+    led_rgb[~parked] = np.asarray(scene.led_rgb)[kept]
+    led_intensity[~parked] = np.asarray(scene.led_intensity, dtype=np.float64)[kept]
+
+    return ShowScene(
+        scene_number=scene.scene_number,
+        scene_holder=scene.scene_holder,
+        transform_pos=transform_pos,
+        led_rgb=led_rgb,
+        led_intensity=led_intensity,
+        scene_size=scene.scene_size,
+    )
+
+
+def balance_scene(scene: ShowScene, fleet: FleetSpec) -> ShowScene:
+    """씬의 드론 수를 fleet.size로 맞춥니다. (부족하면 주차, 많으면 격자 솎아내기)"""
+    n = len(scene)
+    if n == fleet.size:
+        return scene
+    if n > fleet.size:
+        return scene.reordered(decimate_indices(scene.transform_pos, fleet.size))
+
+    order = np.concatenate([np.arange(n), np.full(fleet.size - n, -1)])
+    return park_unassigned(scene, order, fleet.min_separation)
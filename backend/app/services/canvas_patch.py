@@ -0,0 +1,351 @@
+"""
+캔버스 부분 저장 (JSON Patch / 객체 delta)
+
+자동 저장마다 Fabric 캔버스 전체(수 MB)를 보내지 않도록, 서버가 가진 캔버스 사본에
+변경분만 적용합니다.
+
+- RFC 6902 JSON Patch: [{"op": "replace", "path": "/objects/12/left", "value": 30}, ...]
+  (add / remove / replace / move / copy / test)
+- 객체 delta: {"<object id>": {바꿀 속성...} | null}
+  objects 배열에서 OBJECT_ID_KEY 값이 같은 객체에 속성을 덮어쓰고, 없으면 끝에 추가,
+  null이면 삭제합니다.
+
+버전은 저장된 JSON bytes의 해시(canvas_version)로, 서버 재시작 후에도 같은 내용이면 같습니다.
+요청의 base_version이 현재 버전과 다르면 적용하지 않습니다. (다른 편집이 먼저 저장됨)
+
+패치는 바뀌는 경로의 컨테이너만 얕은 복사(copy-on-write)해서 적용하므로, 실패해도
+캐시된 사본은 그대로이고 비용은 캔버스 전체가 아니라 변경 경로 크기에 비례합니다.
+"""
+
+import asyncio
+import copy
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.services.dot_sidecar import content_hash
+from app.services.scene_writes import scene_writes
+from app.utils import jsonio
+from app.utils.asset_versions import VERSION_LENGTH, content_version
+
+OBJECT_ID_KEY = "id"
+CANVAS_CACHE_SIZE = int(os.getenv("CANVAS_CACHE_SIZE", "64"))
+
+
+class PatchError(ValueError):
+    """패치를 적용할 수 없음 (잘못된 경로 / 연산, test 실패 등)"""
+
+
+def canvas_version(payload: bytes) -> str:
+    """저장된 캔버스 JSON bytes의 버전 문자열 (정적 파일 ETag / ?v= 값과 같음)"""
+    return content_version(payload)
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {pointer}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _array_index(container: list, token: str, *, allow_end: bool) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """
+    RFC 6902 test 비교: 숫자는 값으로 (1 == 1.0), 그 밖에는 타입까지 같아야 합니다.
+    (파이썬에서는 True == 1이지만 JSON의 true와 1은 다른 값)
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(_json_equal, a, b))
+    return type(a) is type(b) and a == b
+
+
+class _PatchTarget:
+    """
+    문서 사본. 처음 건드리는 컨테이너만 얕은 복사해 원본을 바꾸지 않습니다.
+    이미 복사한 컨테이너(id)는 다시 복사하지 않습니다.
+    """
+
+    def __init__(self, doc: Any):
+        self.doc = doc
+        self._owned: Set[int] = set()
+
+    def _own(self, value: Any) -> Any:
+        if id(value) in self._owned or not isinstance(value, (dict, list)):
+            return value
+        owned = value.copy()
+        self._owned.add(id(owned))
+        return owned
+
+    def _get(self, tokens: List[str]) -> Any:
+        value = self.doc
+        for token in tokens:
+            if isinstance(value, dict):
+                if token not in value:
+                    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+                value = value[token]
+            elif isinstance(value, list):
+                value = value[_array_index(value, token, allow_end=False)]
+            else:
+                raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+        return value
+
+    def _parent(self, tokens: List[str]) -> Any:
+        """tokens[:-1] 경로의 컨테이너를 (복사해서) 반환합니다."""
+        self.doc = self._own(self.doc)
+        parent = self.doc
+        for token in tokens[:-1]:
+            if isinstance(parent, dict):
+                if token not in parent:
+                    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+                parent[token] = self._own(parent[token])
+                parent = parent[token]
+            elif isinstance(parent, list):
+                index = _array_index(parent, token, allow_end=False)
+                parent[index] = self._own(parent[index])
+                parent = parent[index]
+            else:
+                raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+        if not isinstance(parent, (dict, list)):
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent
+
+    def get(self, pointer: str) -> Any:
+        return self._get(_parse_pointer(pointer))
+
+    def add(self, pointer: str, value: Any) -> None:
+        tokens = _parse_pointer(pointer)
+        if not tokens:
+            self.doc = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            parent[tokens[-1]] = value
+        else:
+            parent.insert(_array_index(parent, tokens[-1], allow_end=True), value)
+
+    def remove(self, pointer: str) -> Any:
+        tokens = _parse_pointer(pointer)
+        if not tokens:
+            raise PatchError("Cannot remove the document root")
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            if tokens[-1] not in parent:
+                raise PatchError(f"Path not found: {pointer}")
+            return parent.pop(tokens[-1])
+        return parent.pop(_array_index(parent, tokens[-1], allow_end=False))
+
+    def replace(self, pointer: str, value: Any) -> None:
+        tokens = _parse_pointer(pointer)
+        if not tokens:
+            self.doc = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            if tokens[-1] not in parent:
+                raise PatchError(f"Path not found: {pointer}")
+            parent[tokens[-1]] = value
+        else:
+            parent[_array_index(parent, tokens[-1], allow_end=False)] = value
+
+
+def apply_json_patch(doc: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    RFC 6902 JSON Patch를 적용한 새 문서를 반환합니다. (doc은 바뀌지 않음)
+    연산 하나라도 실패하면 PatchError를 던지고 아무것도 적용하지 않습니다.
+    """
+    target = _PatchTarget(doc)
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError("Patch operation must be an object")
+        op = operation.get("op")
+        path = operation.get("path")
+        if not isinstance(path, str):
+            raise PatchError("Patch operation requires a string 'path'")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"'{op}' requires a 'value'")
+        if op in ("move", "copy") and not isinstance(operation.get("from"), str):
+            raise PatchError(f"'{op}' requires a string 'from'")
+
+        if op == "add":
+            target.add(path, operation["value"])
+        elif op == "remove":
+            target.remove(path)
+        elif op == "replace":
+            target.replace(path, operation["value"])
+        elif op == "move":
+            source = operation["from"]
+            if path != source and path.startswith(source + "/"):
+                raise PatchError("Cannot move a value into one of its children")
+            target.add(path, target.remove(source))
+        elif op == "copy":
+            target.add(path, copy.deepcopy(target.get(operation["from"])))
+        elif op == "test":
+            if not _json_equal(target.get(path), operation["value"]):
+                raise PatchError(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown patch operation: {op}")
+    return target.doc
+
+
+def apply_object_delta(
+    doc: Dict[str, Any], delta: Dict[str, Optional[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    objects 배열에 객체 delta({id: 속성 | None})를 적용한 새 문서를 반환합니다.
+    objects 배열과 바뀐 객체만 복사합니다.
+    delta의 키는 JSON 객체 키라 문자열이므로 객체 id와 문자열로 비교하고,
+    기존 객체의 id 값(숫자 등)은 그대로 둡니다.
+    """
+    if not isinstance(doc, dict):
+        raise PatchError("Canvas must be a JSON object")
+    objects = doc.get("objects", [])
+    if not isinstance(objects, list):
+        raise PatchError("Canvas 'objects' must be an array")
+
+    positions = {
+        str(obj[OBJECT_ID_KEY]): index
+        for index, obj in enumerate(objects)
+        if isinstance(obj, dict) and OBJECT_ID_KEY in obj
+    }
+    objects = list(objects)
+    removed: Set[int] = set()
+    for object_id, props in delta.items():
+        index = positions.get(object_id)
+        if props is None:
+            if index is None:
+                raise PatchError(f"Object not found: {object_id}")
+            removed.add(index)
+        elif not isinstance(props, dict):
+            raise PatchError(f"Object delta for {object_id} must be an object or null")
+        elif OBJECT_ID_KEY in props and str(props[OBJECT_ID_KEY]) != object_id:
+            raise PatchError(f"Object delta for {object_id} cannot change its id")
+        elif index is None:
+            positions[object_id] = len(objects)
+            objects.append({OBJECT_ID_KEY: object_id, **props})
+        else:
+            objects[index] = {
+                **objects[index],
+                **props,
+                OBJECT_ID_KEY: objects[index][OBJECT_ID_KEY],
+            }
+
+    if removed:
+        objects = [obj for index, obj in enumerate(objects) if index not in removed]
+    return {**doc, "objects": objects}
+
+
+@dataclass
+class CanvasEntry:
+    data: Dict[str, Any]
+    version: str
+
+
+class CanvasCache:
+    """
+    최근에 저장 / 패치한 캔버스의 파싱된 사본과 버전 (경로별, LRU)
+    같은 경로의 패치는 lock(path)로 순서대로 적용합니다.
+    """
+
+    def __init__(self, size: int = CANVAS_CACHE_SIZE):
+        self.size = max(1, size)
+        self._entries: "OrderedDict[str, CanvasEntry]" = OrderedDict()
+        # 경로별 잠금과 잡고 있거나 기다리는 요청 수 (0이 되면 잠금을 지움)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def lock(self, path: str) -> AsyncIterator[None]:
+        path = str(path)
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        self._lock_users[path] = self._lock_users.get(path, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[path] -= 1
+            if not self._lock_users[path]:
+                del self._lock_users[path]
+                del self._locks[path]
+
+    def put(self, path: str, data: Dict[str, Any], version: str) -> None:
+        path = str(path)
+        self._entries[path] = CanvasEntry(data, version)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def discard(self, path: str) -> None:
+        self._entries.pop(str(path), None)
+
+    async def load(self, path: str) -> Optional[CanvasEntry]:
+        """캐시에 없으면 (대기 중인 저장을 내려보낸 뒤) 디스크에서 읽습니다. 파일이 없으면 None"""
+        path = str(path)
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+            return entry
+
+        await scene_writes.flush([path])
+        try:
+            payload = await asyncio.to_thread(_read_bytes, path)
+        except FileNotFoundError:
+            return None
+        data = await asyncio.to_thread(jsonio.loads, payload)
+        self.put(path, data, canvas_version(payload))
+        return self._entries[path]
+
+
+async def save_canvas(
+    path: str,
+    data: Dict[str, Any],
+    payload: Optional[bytes] = None,
+    *,
+    sidecar: bool = False,
+) -> str:
+    """
+    캔버스를 scene_writes로 저장하고 캐시 사본을 갱신합니다. 새 버전을 반환합니다.
+    sidecar: processed 캔버스이면 True (쓰기 직후 .dots 사이드카 갱신)
+    """
+    if payload is None:
+        payload = jsonio.dumps(data)
+    digest = content_hash(payload)
+    await scene_writes.submit(
+        path, payload, data=data if sidecar else None, sidecar=sidecar, digest=digest
+    )
+    version = digest[:VERSION_LENGTH]
+    canvas_cache.put(path, data, version)
+    return version
+
+
+async def discard_canvas(*paths: str) -> None:
+    """대기 중인 저장과 캐시 사본을 버립니다. (파일 삭제 / 변환 결과로 교체 전에 호출)"""
+    await scene_writes.discard(*paths)
+    for path in paths:
+        canvas_cache.discard(path)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+canvas_cache = CanvasCache()
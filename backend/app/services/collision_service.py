@@ -0,0 +1,287 @@
+"""
+전환 구간 연속 충돌 검사
+
+키프레임(씬)에서만 min_separation을 검사하면, 전환 중에 경로가 교차하는 드론 쌍을 놓칩니다.
+여기서는 trajectory_service와 같은 비행 경로(직선 + 사다리꼴 속도)를 따라 시간을 진행하며
+검사합니다.
+
+1. 거친 샘플링: 간격 dt마다 모든 드론 위치를 청크 단위로 계산하고, 공간 해시
+   (validation_service.find_close_pairs)로 후보 쌍을 찾습니다. 샘플 전후 dt/2 동안 두 드론의
+   거리는 (v_a + v_b)·dt/2 이상 줄어들 수 없으므로, 샘플 거리가 min_separation + (v_a + v_b)·dt/2
+   이상인 쌍은 그 구간에서 안전합니다. (v는 드론별 최고 속도, dt는 1/hz 이하이면서
+   vmax·dt <= min_separation 이 되도록 정함)
+2. 정밀 검사: 후보 쌍만 해당 샘플 주변 구간을 refine 배로 잘게 나누어 다시 계산하고,
+   쌍마다 처음으로 min_separation보다 가까워지는 시각을 구합니다.
+
+전환끼리는 서로 독립이므로 프로세스 풀에서 병렬로 검사합니다. (check_transition은 순수 함수)
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.trajectory_service import (
+    profile_fraction,
+    sample_transition,
+    transition_profile,
+)
+from app.services.validation_service import find_close_pairs
+
+COLLISION_MAX_WORKERS = int(os.getenv("COLLISION_MAX_WORKERS", str(os.cpu_count() or 2)))
+
+# 거친 샘플링 한 청크의 최대 원소 수 (frames * drones * 3)
+_CHUNK_VALUES = 8_000_000
+# 정밀 검사를 한 번에 처리하는 후보 수
+_REFINE_BLOCK = 50_000
+
+
+@dataclass
+class CollisionReport:
+    """전환 하나의 연속 충돌 검사 결과 (쌍마다 가장 이른 위반만)"""
+
+    from_scene: int
+    to_scene: int
+    start_time: float
+    duration: float
+    drone_count: int
+    min_separation: float
+    samples: int
+    pairs: np.ndarray = field(repr=False)  # (K, 2) 드론 번호
+    times: np.ndarray = field(repr=False)  # (K,) 쇼 시작 기준 초
+    distances: np.ndarray = field(repr=False)  # (K,)
+    pair_positions: np.ndarray = field(repr=False)  # (K, 2, 3)
+
+    @property
+    def violation_count(self) -> int:
+        return int(self.times.shape[0])
+
+    @property
+    def valid(self) -> bool:
+        return self.violation_count == 0
+
+    def to_dict(self, limit: Optional[int] = 100) -> Dict[str, Any]:
+        """가장 이른 위반부터 limit 개까지 반환합니다."""
+        shown = self.violation_count if limit is None else min(limit, self.violation_count)
+        return {
+            "from_scene": self.from_scene,
+            "to_scene": self.to_scene,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "drone_count": self.drone_count,
+            "min_separation": self.min_separation,
+            "samples": self.samples,
+            "valid": self.valid,
+            "violation_count": self.violation_count,
+            "violations": [
+                {
+                    "drone_a": int(a),
+                    "drone_b": int(b),
+                    "time": float(t),
+                    "distance": float(d),
+                    "pos_a": pa,
+                    "pos_b": pb,
+                }
+                for (a, b), t, d, pa, pb in zip(
+                    self.pairs[:shown].tolist(),
+                    self.times[:shown].tolist(),
+                    self.distances[:shown].tolist(),
+                    self.pair_positions[:shown, 0].tolist(),
+                    self.pair_positions[:shown, 1].tolist(),
+                )
+            ],
+            "truncated": shown < self.violation_count,
+        }
+
+
+def check_transition(
+    start: np.ndarray,
+    end: np.ndarray,
+    duration: float,
+    max_accel: float,
+    min_separation: float,
+    *,
+    hz: float = 10.0,
+    refine: int = 16,
+    start_time: float = 0.0,
+    from_scene: int = 0,
+    to_scene: int = 0,
+) -> CollisionReport:
+    """
+    start → end 전환(드론 순서 = 배정 결과)에서 min_separation 위반 쌍과 가장 이른 위반 시각을 구합니다.
+    start / end는 (N, 3)이며, 씬에 없는 드론은 NaN입니다. (다음 씬에 없는 드론은 제자리 비행)
+    """
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    end = np.where(np.isnan(end), start, end)
+    present = np.flatnonzero(~np.isnan(start).any(axis=1))
+    s, e = start[present], end[present]
+    n = present.shape[0]
+
+    def _report(pairs, times, distances, positions, samples) -> CollisionReport:
+        order = np.argsort(times, kind="stable")
+        return CollisionReport(
+            from_scene=int(from_scene),
+            to_scene=int(to_scene),
+            start_time=float(start_time),
+            duration=float(duration),
+            drone_count=int(n),
+            min_separation=float(min_separation),
+            samples=int(samples),
+            pairs=present[pairs[order]],
+            times=start_time + times[order],
+            distances=distances[order],
+            pair_positions=positions[order],
+        )
+
+    empty = (
+        np.empty((0, 2), dtype=np.int64),
+        np.empty(0),
+        np.empty(0),
+        np.empty((0, 2, 3)),
+    )
+    if n < 2 or duration <= 0 or min_separation <= 0:
+        return _report(*empty, 0)
+
+    dist, accel, cruise, t_acc = transition_profile(s, e, duration, max_accel)
+    vmax = float(cruise.max())
+
+    # 1. 거친 샘플링 + 공간 해시로 후보 (쌍, 샘플 번호) 수집
+    dt = 1.0 / hz
+    if vmax > 0:
+        dt = min(dt, min_separation / vmax)
+    steps = max(1, int(np.ceil(duration / dt)))
+    dt = duration / steps
+    times = np.linspace(0.0, duration, steps + 1)
+    radius = min_separation + vmax * dt
+
+    codes: List[np.ndarray] = []
+    sample_index: List[np.ndarray] = []
+    chunk = max(1, _CHUNK_VALUES // (n * 3))
+    for first in range(0, times.shape[0], chunk):
+        frames = sample_transition(s, e, duration, times[first : first + chunk], max_accel)
+        for offset, positions in enumerate(frames):
+            pairs, distances = find_close_pairs(positions, radius)
+            # 샘플 전후 dt/2 동안 두 드론이 좁힐 수 있는 거리는 (v_a + v_b)·dt/2 이하
+            reach = (cruise[pairs[:, 0]] + cruise[pairs[:, 1]]) * (dt / 2.0)
+            pairs = pairs[distances < min_separation + reach]
+            if pairs.shape[0]:
+                codes.append(pairs[:, 0] * n + pairs[:, 1])
+                sample_index.append(np.full(pairs.shape[0], first + offset))
+
+    if not codes:
+        return _report(*empty, times.shape[0])
+
+    # 쌍(code)별로 샘플 순서대로 정렬: 같은 쌍의 r번째 후보 구간을 한 번에 처리합니다.
+    codes_all = np.concatenate(codes)
+    ks_all = np.concatenate(sample_index)
+    order = np.lexsort((ks_all, codes_all))
+    codes_all, ks_all = codes_all[order], ks_all[order]
+    group_start = np.flatnonzero(
+        np.concatenate([[True], codes_all[1:] != codes_all[:-1]])
+    )
+    group_size = np.diff(np.append(group_start, codes_all.shape[0]))
+    groups = group_start.shape[0]
+
+    # 2. 후보 구간 정밀 검사: 쌍마다 가장 이른 후보 구간부터 위반이 나올 때까지
+    offsets = np.linspace(-0.5, 0.5, max(2, refine) + 1) * dt
+    hit_time = np.full(groups, np.nan)
+    hit_gap = np.zeros(groups)
+    hit_pos = np.zeros((groups, 2, 3))
+
+    pending = np.arange(groups)
+    round_index = 0
+    while pending.shape[0]:
+        pending = pending[group_size[pending] > round_index]
+        still_pending = []
+        for first in range(0, pending.shape[0], _REFINE_BLOCK):
+            block = pending[first : first + _REFINE_BLOCK]
+            occurrence = group_start[block] + round_index
+            code = codes_all[occurrence]
+            a, b = code // n, code % n
+            t = np.clip(times[ks_all[occurrence]][:, None] + offsets, 0.0, duration)
+            pos_a = _positions(s, e, dist, accel, cruise, t_acc, duration, a, t)
+            pos_b = _positions(s, e, dist, accel, cruise, t_acc, duration, b, t)
+            gap = np.linalg.norm(pos_a - pos_b, axis=2)
+
+            hit = gap < min_separation
+            rows = hit.any(axis=1)
+            cols = hit[rows].argmax(axis=1)
+            hit_groups = block[rows]
+            row_index = np.flatnonzero(rows)
+            hit_time[hit_groups] = t[row_index, cols]
+            hit_gap[hit_groups] = gap[row_index, cols]
+            hit_pos[hit_groups, 0] = pos_a[row_index, cols]
+            hit_pos[hit_groups, 1] = pos_b[row_index, cols]
+            still_pending.append(block[~rows])
+        pending = (
+            np.concatenate(still_pending) if still_pending else np.empty(0, np.int64)
+        )
+        round_index += 1
+
+    violated = np.flatnonzero(~np.isnan(hit_time))
+    code = codes_all[group_start[violated]]
+    return _report(
+        np.column_stack([code // n, code % n]),
+        hit_time[violated],
+        hit_gap[violated],
+        hit_pos[violated],
+        times.shape[0],
+    )
+
+
+def _positions(s, e, dist, accel, cruise, t_acc, duration, drones, t) -> np.ndarray:
+    """drones (M,)의 시각 t (M, R)에서의 위치 (M, R, 3)"""
+    fraction = profile_fraction(
+        dist[drones, None],
+        accel[drones, None],
+        cruise[drones, None],
+        t_acc[drones, None],
+        duration,
+        t,
+    )
+    return s[drones, None, :] + fraction[:, :, None] * (e[drones] - s[drones])[:, None, :]
+
+
+def collision_summary(
+    reports: List[CollisionReport], limit: Optional[int] = 100
+) -> Dict[str, Any]:
+    """여러 전환의 충돌 검사 요약. 위반이 있는 전환만 상세 목록(transitions)에 포함합니다."""
+    invalid = [report for report in reports if not report.valid]
+    return {
+        "valid": not invalid,
+        "transitions_checked": len(reports),
+        "invalid_transitions": len(invalid),
+        "violation_count": sum(report.violation_count for report in invalid),
+        "earliest_violation": (
+            min(float(report.times[0]) for report in invalid) if invalid else None
+        ),
+        "transitions": [report.to_dict(limit=limit) for report in invalid],
+    }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_collision_pool() -> ProcessPoolExecutor:
+    """
+    전환 검사용 프로세스 풀 (처음 사용할 때 생성)
+    서버 프로세스의 스레드/이벤트 루프 상태를 복제하지 않도록 spawn 방식으로 띄웁니다.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max(1, COLLISION_MAX_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_collision_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
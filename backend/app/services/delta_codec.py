@@ -0,0 +1,156 @@
+"""
+씬 간 델타 인코딩
+
+드론 배정으로 드론 번호가 씬 사이에 고정되면, 이웃한 씬 사이에 LED 색과 위치가 그대로인
+드론이 많습니다. 첫 씬(키프레임)은 기존 dsj 씬 그대로 두고, 이후 씬은 바뀐 드론만 담은
+"delta" 객체로 저장해 GCS / Unity로 보내는 크기를 줄입니다.
+
+    {
+      "scene_number": 2, "scene_holder": 0, "scene_size": [...],
+      "delta": {
+        "drones": N,
+        "pos_index": [...], "pos_delta": [[dx, dy, dz], ...],   # int16, 단위 position_quantum
+        "pos_abs_index": [...], "pos_abs": [[x, y, z], ...],     # int16 범위를 넘는 이동
+        "rgb_index": [...], "rgb": [[r, g, b], ...],
+        "intensity_index": [...], "intensity": [...]
+      }
+    }
+
+위치 델타는 직전 씬의 "복원된" 위치를 기준으로 양자화하므로 오차가 누적되지 않습니다.
+(복원 위치와 실제 위치의 차이는 축마다 position_quantum / 2 이하)
+드론 수가 직전 씬과 다르면 그 씬은 다시 키프레임(action_data 전체)으로 저장합니다.
+쇼 JSON의 "encoding": {"type": "delta", "position_quantum": q}로 델타 인코딩 여부를 표시합니다.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene, scene_json
+
+DELTA_ENCODING = "delta"
+DEFAULT_POSITION_QUANTUM = 0.001
+_INT16_MAX = np.iinfo(np.int16).max
+
+
+class SceneDeltaEncoder:
+    """씬을 순서대로 받아 키프레임 또는 delta 씬 JSON을 만듭니다."""
+
+    def __init__(self, position_quantum: float = DEFAULT_POSITION_QUANTUM):
+        if position_quantum <= 0:
+            raise ValueError("position_quantum must be positive")
+        self.quantum = float(position_quantum)
+        self._pos: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        self._intensity: Optional[np.ndarray] = None
+
+    def header(self) -> Dict[str, Any]:
+        """쇼 JSON의 "encoding" 값"""
+        return {"type": DELTA_ENCODING, "position_quantum": self.quantum}
+
+    def encode(self, scene: ShowScene) -> Dict[str, Any]:
+        pos = np.asarray(scene.transform_pos, dtype=np.float64)
+        rgb = np.asarray(scene.led_rgb, dtype=np.int64)
+        intensity = np.asarray(scene.led_intensity, dtype=np.float64)
+
+        if self._pos is None or self._pos.shape[0] != pos.shape[0]:
+            self._pos, self._rgb, self._intensity = pos.copy(), rgb.copy(), intensity.copy()
+            return scene.to_json()
+
+        data = scene_json(scene.scene_number, scene.scene_holder, None, scene.scene_size)
+        del data["action_data"]
+        data["delta"] = self._delta(pos, rgb, intensity)
+        return data
+
+    def _delta(
+        self, pos: np.ndarray, rgb: np.ndarray, intensity: np.ndarray
+    ) -> Dict[str, Any]:
+        steps = np.rint((pos - self._pos) / self.quantum)
+        changed = (steps != 0).any(axis=1)
+        fits = (np.abs(steps) <= _INT16_MAX).all(axis=1)
+        moved = np.flatnonzero(changed & fits)
+        placed = np.flatnonzero(changed & ~fits)
+        pos_delta = steps[moved].astype(np.int16)
+        # 디코더와 같은 연산으로 복원 위치를 갱신 (오차 누적 방지)
+        self._pos[moved] += pos_delta * self.quantum
+        self._pos[placed] = pos[placed]
+
+        recolored = np.flatnonzero((rgb != self._rgb).any(axis=1))
+        self._rgb[recolored] = rgb[recolored]
+        dimmed = np.flatnonzero(intensity != self._intensity)
+        self._intensity[dimmed] = intensity[dimmed]
+
+        return {
+            "drones": int(pos.shape[0]),
+            "pos_index": moved,
+            "pos_delta": pos_delta,
+            "pos_abs_index": placed,
+            "pos_abs": pos[placed],
+            "rgb_index": recolored,
+            "rgb": rgb[recolored],
+            "intensity_index": dimmed,
+            "intensity": intensity[dimmed],
+        }
+
+
+class SceneDeltaDecoder:
+    """SceneDeltaEncoder가 만든 씬 JSON을 순서대로 받아 전체 배열(ShowScene)로 복원합니다."""
+
+    def __init__(self, encoding: Optional[Dict[str, Any]] = None):
+        encoding = encoding or {}
+        self.quantum = float(encoding.get("position_quantum", DEFAULT_POSITION_QUANTUM))
+        self._pos: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        self._intensity: Optional[np.ndarray] = None
+
+    def decode(self, data: Dict[str, Any]) -> ShowScene:
+        if "delta" in data:
+            self._apply(data["delta"])
+        else:
+            actions = data["action_data"]
+            self._pos = np.array(
+                [a["transform_pos"] for a in actions], dtype=np.float64
+            ).reshape(-1, 3)
+            self._rgb = np.array([a["led_rgb"] for a in actions], dtype=np.int64).reshape(
+                -1, 3
+            )
+            self._intensity = np.array(
+                [a["led_intensity"] for a in actions], dtype=np.float64
+            )
+
+        size = data.get("scene_size")
+        return ShowScene(
+            scene_number=int(data["scene_number"]),
+            scene_holder=int(data["scene_holder"]),
+            transform_pos=self._pos.copy(),
+            led_rgb=self._rgb.copy(),
+            led_intensity=self._intensity.copy(),
+            scene_size=tuple(size) if size is not None else None,
+        )
+
+    def _apply(self, delta: Dict[str, Any]) -> None:
+        if self._pos is None or self._pos.shape[0] != int(delta["drones"]):
+            raise ValueError("Delta scene does not match the previous scene")
+        moved = np.asarray(delta["pos_index"], dtype=np.int64)
+        self._pos[moved] += (
+            np.asarray(delta["pos_delta"], dtype=np.int16).reshape(-1, 3) * self.quantum
+        )
+        placed = np.asarray(delta["pos_abs_index"], dtype=np.int64)
+        self._pos[placed] = np.asarray(delta["pos_abs"], dtype=np.float64).reshape(-1, 3)
+        recolored = np.asarray(delta["rgb_index"], dtype=np.int64)
+        self._rgb[recolored] = np.asarray(delta["rgb"], dtype=np.int64).reshape(-1, 3)
+        dimmed = np.asarray(delta["intensity_index"], dtype=np.int64)
+        self._intensity[dimmed] = np.asarray(delta["intensity"], dtype=np.float64)
+
+
+def decode_scenes(show: Dict[str, Any]) -> List[ShowScene]:
+    """쇼 JSON(델타 인코딩 여부와 무관)의 모든 씬을 전체 배열로 복원합니다."""
+    decoder = SceneDeltaDecoder(show.get("encoding"))
+    return [decoder.decode(data) for data in show["scenes"]]
+
+
+def decode_show(show: Dict[str, Any]) -> Dict[str, Any]:
+    """델타 인코딩된 쇼 JSON을 모든 씬이 action_data를 가진 일반 dsj 쇼 JSON으로 되돌립니다."""
+    decoded = {key: value for key, value in show.items() if key != "encoding"}
+    decoded["scenes"] = [scene.to_json() for scene in decode_scenes(show)]
+    return decoded
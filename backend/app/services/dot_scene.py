@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class DotScene:
+    """
+    한 씬의 도트(드론) 데이터를 배열 형태로 보관합니다.
+
+    - positions: (N, 2) float64, 캔버스 좌표계의 (x, y)
+    - colors:    (N, 3) uint8, (r, g, b)
+    - opacity:   (N,) float64, LED 밝기로 사용되는 불투명도
+    - width / height: 캔버스 크기 (scene_size)
+    """
+
+    positions: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, 2), dtype=np.float64)
+    )
+    colors: np.ndarray = field(default_factory=lambda: np.zeros((0, 3), dtype=np.uint8))
+    opacity: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64))
+    width: float = 0.0
+    height: float = 0.0
+
+    def __len__(self) -> int:
+        return int(self.positions.shape[0])
+
+    @property
+    def size(self) -> Tuple[float, float, float]:
+        """scene_size 필드에 쓰이는 (width, height, z)"""
+        return float(self.width), float(self.height), 0.0
+
+    def to_coords(self) -> List[Tuple[float, float]]:
+        """기존 API 호환용: [(x, y), ...]"""
+        return [(float(x), float(y)) for x, y in self.positions.tolist()]
+
+    def to_coords_with_colors(
+        self,
+    ) -> List[Tuple[float, float, Tuple[int, int, int], float]]:
+        """기존 API 호환용: [(x, y, (r, g, b), opacity), ...]"""
+        return [
+            (x, y, (r, g, b), o)
+            for (x, y), (r, g, b), o in zip(
+                self.positions.tolist(), self.colors.tolist(), self.opacity.tolist()
+            )
+        ]
@@ -0,0 +1,232 @@
+"""
+처리된 씬(processed/{scene_id}.json)의 바이너리 사이드카 인덱스
+
+내보내기·검증 경로가 매번 수 MB의 Fabric JSON을 다시 파싱하지 않도록,
+처리된 씬을 저장할 때 같은 폴더에 {scene_id}.dots 파일을 함께 기록합니다.
+
+파일 구조 (little-endian):
+- 헤더 (HEADER_DTYPE, 80 bytes): magic, version, 도트 수, 캔버스 크기,
+  원본 JSON의 크기/수정 시각(ns), 원본 JSON 내용의 sha256
+- 레코드 (RECORD_DTYPE, 32 bytes × N): x, y, opacity, r, g, b
+
+좌표, 불투명도, 캔버스 크기는 float64로 저장합니다. (JSON에서 바로 만든 DotScene과
+사이드카에서 읽은 DotScene이 같은 값을 내보내도록, 캐시 상태에 따라 led_intensity가
+0.3 / 0.30000001192... 로 달라지지 않음)
+
+헤더의 크기/수정 시각이 원본 JSON과 다르면 오래된 사이드카로 보고
+필요할 때(load_dot_scene 호출 시) 다시 생성합니다.
+"""
+
+import hashlib
+import os
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.dot_scene import DotScene
+from app.services.fabric_json_service import fabric_data_to_dot_scene
+from app.utils import jsonio
+
+SIDECAR_EXT = ".dots"
+SIDECAR_MAGIC = b"WDOT"
+SIDECAR_VERSION = 3
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("reserved", "<u2"),
+        ("count", "<u4"),
+        ("width", "<f8"),
+        ("height", "<f8"),
+        ("src_size", "<u8"),
+        ("src_mtime_ns", "<i8"),
+        ("content_hash", "u1", (32,)),
+        ("padding", "S4"),
+    ]
+)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("opacity", "<f8"),
+        ("r", "u1"),
+        ("g", "u1"),
+        ("b", "u1"),
+        ("padding", "S5"),
+    ]
+)
+
+assert HEADER_DTYPE.itemsize == 80
+assert RECORD_DTYPE.itemsize == 32
+
+
+def sidecar_path_for(json_path: str) -> str:
+    """processed/{scene_id}.json → processed/{scene_id}.dots"""
+    return os.path.splitext(json_path)[0] + SIDECAR_EXT
+
+
+def content_hash(payload: bytes) -> str:
+    """원본 JSON bytes의 sha256 (hex)"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def write_sidecar(
+    json_path: str,
+    dot_scene: DotScene,
+    payload_hash: str,
+) -> str:
+    """
+    DotScene을 json_path 옆의 사이드카 파일로 기록합니다.
+    반드시 원본 JSON을 모두 쓴 뒤에 호출해야 합니다. (크기/수정 시각을 헤더에 기록)
+    임시 파일에 쓴 뒤 rename 하므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않습니다.
+    """
+    st = os.stat(json_path)
+    n = len(dot_scene)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["magic"] = SIDECAR_MAGIC
+    header["version"] = SIDECAR_VERSION
+    header["count"] = n
+    header["width"] = dot_scene.width
+    header["height"] = dot_scene.height
+    header["src_size"] = st.st_size
+    header["src_mtime_ns"] = st.st_mtime_ns
+    header["content_hash"] = np.frombuffer(
+        bytes.fromhex(payload_hash), dtype=np.uint8
+    )
+
+    records = np.zeros(n, dtype=RECORD_DTYPE)
+    if n:
+        records["x"] = dot_scene.positions[:, 0]
+        records["y"] = dot_scene.positions[:, 1]
+        records["r"] = dot_scene.colors[:, 0]
+        records["g"] = dot_scene.colors[:, 1]
+        records["b"] = dot_scene.colors[:, 2]
+        records["opacity"] = dot_scene.opacity
+
+    out_path = sidecar_path_for(json_path)
+    # 같은 프로세스의 여러 스레드가 동시에 써도 겹치지 않는 임시 파일 이름
+    tmp_path = f"{out_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(records.tobytes())
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def write_sidecar_for_json(
+    json_path: str,
+    payload: Optional[bytes] = None,
+    fabric_data: Optional[Dict[str, Any]] = None,
+) -> DotScene:
+    """
+    저장된 Fabric JSON으로부터 사이드카를 생성합니다.
+    이미 메모리에 있는 payload(bytes) / fabric_data(dict)가 있으면 다시 읽거나 파싱하지 않습니다.
+    """
+    if payload is None:
+        with open(json_path, "rb") as f:
+            payload = f.read()
+    if fabric_data is None:
+        fabric_data = jsonio.loads(payload)
+
+    dot_scene = fabric_data_to_dot_scene(fabric_data)
+    write_sidecar(json_path, dot_scene, content_hash(payload))
+    return dot_scene
+
+
+def read_sidecar(dots_path: str) -> Tuple[np.void, np.ndarray]:
+    """사이드카 파일을 mmap으로 열어 (header, records)를 반환합니다."""
+    header = np.fromfile(dots_path, dtype=HEADER_DTYPE, count=1)
+    if header.shape[0] != 1 or header["magic"][0] != SIDECAR_MAGIC:
+        raise ValueError(f"Invalid dot sidecar: {dots_path}")
+    if int(header["version"][0]) != SIDECAR_VERSION:
+        raise ValueError(f"Unsupported dot sidecar version: {dots_path}")
+
+    count = int(header["count"][0])
+    if count == 0:
+        return header[0], np.zeros(0, dtype=RECORD_DTYPE)
+    records = np.memmap(
+        dots_path,
+        dtype=RECORD_DTYPE,
+        mode="r",
+        offset=HEADER_DTYPE.itemsize,
+        shape=(count,),
+    )
+    return header[0], records
+
+
+def _is_fresh(header: np.void, json_path: str) -> bool:
+    try:
+        st = os.stat(json_path)
+    except OSError:
+        return False
+    return (
+        int(header["src_size"]) == st.st_size
+        and int(header["src_mtime_ns"]) == st.st_mtime_ns
+    )
+
+
+def _open_fresh_sidecar(json_path: str) -> Optional[Tuple[np.void, np.ndarray]]:
+    dots_path = sidecar_path_for(json_path)
+    if not os.path.exists(dots_path):
+        return None
+    try:
+        header, records = read_sidecar(dots_path)
+    except (OSError, ValueError):
+        return None
+    if not _is_fresh(header, json_path):
+        return None
+    return header, records
+
+
+def load_dot_scene(json_path: str) -> DotScene:
+    """
+    처리된 씬을 DotScene으로 읽습니다.
+    최신 사이드카가 있으면 JSON을 파싱하지 않고 mmap에서 읽고,
+    없거나 오래되었으면 JSON에서 사이드카를 다시 생성합니다.
+    """
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"Fabric.js JSON not found: {json_path}")
+
+    opened = _open_fresh_sidecar(json_path)
+    if opened is None:
+        return write_sidecar_for_json(json_path)
+
+    header, records = opened
+    positions = np.empty((records.shape[0], 2), dtype=np.float64)
+    positions[:, 0] = records["x"]
+    positions[:, 1] = records["y"]
+    colors = np.empty((records.shape[0], 3), dtype=np.uint8)
+    colors[:, 0] = records["r"]
+    colors[:, 1] = records["g"]
+    colors[:, 2] = records["b"]
+    return DotScene(
+        positions=positions,
+        colors=colors,
+        opacity=np.array(records["opacity"], dtype=np.float64),
+        width=float(header["width"]),
+        height=float(header["height"]),
+    )
+
+
+def load_content_hash(json_path: str) -> str:
+    """처리된 씬 JSON의 내용 해시. 최신 사이드카가 없으면 다시 생성합니다."""
+    opened = _open_fresh_sidecar(json_path)
+    if opened is None:
+        write_sidecar_for_json(json_path)
+        opened = _open_fresh_sidecar(json_path)
+        if opened is None:
+            raise ValueError(f"Failed to build dot sidecar for {json_path}")
+    header, _ = opened
+    return header["content_hash"].tobytes().hex()
+
+
+def remove_sidecar(json_path: str) -> None:
+    """json_path에 딸린 사이드카를 삭제합니다. (없으면 무시)"""
+    try:
+        os.remove(sidecar_path_for(json_path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,110 @@
+"""
+프로젝트 내보내기 결과 캐시
+
+리허설 중에는 씬이 바뀌지 않은 상태로 같은 내보내기를 반복 요청하는 경우가 많습니다.
+캐시 키는 다음 값으로 만듭니다.
+- 프로젝트 설정 (이름, 포맷, 드론 수, 제약 조건)
+- 변환 쿼리 파라미터 (ExportTransform)
+- 각 씬의 id / 번호 / 처리된 파일의 크기와 수정 시각(ns)
+
+키가 같고 이전 결과 파일이 남아 있으면, 씬을 다시 읽거나 파일을 다시 쓰지 않고
+이전 결과를 그대로 돌려줍니다. 키는 응답의 ETag로도 사용됩니다.
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import PROCESSED_DIR, SVG_JSON_DIR
+from app.services.show_exporter import ExportTransform
+from app.utils import jsonio
+
+
+@dataclass(frozen=True)
+class CachedExport:
+    """캐시된 내보내기 결과"""
+
+    key: str
+    out_name: str
+    scenes_processed: int
+    total_scenes: int
+    # 전환 시간 검증 결과 (seconds_per_scene을 지정한 내보내기만)
+    timing: Optional[Dict[str, Any]] = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key}"'
+
+    @property
+    def out_path(self) -> str:
+        return os.path.join(SVG_JSON_DIR, self.out_name)
+
+
+_cache: Dict[uuid.UUID, CachedExport] = {}
+_lock = threading.Lock()
+
+
+def scene_fingerprints(scenes: List[Dict[str, Any]]) -> List[Tuple[str, int, int, int]]:
+    """
+    씬마다 (id, scene_num, 파일 크기, 수정 시각 ns)를 구합니다.
+    처리된 파일이 없는 씬은 크기/시각을 -1로 기록합니다. (stat만 하므로 JSON을 읽지 않음)
+    """
+    fingerprints = []
+    for scene in scenes:
+        path = os.path.join(PROCESSED_DIR, f"{scene['id']}.json")
+        try:
+            st = os.stat(path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, -1
+        fingerprints.append((str(scene["id"]), int(scene["scene_num"]), size, mtime_ns))
+    return fingerprints
+
+
+def export_cache_key(
+    project: Dict[str, Any],
+    transform: ExportTransform,
+    fingerprints: List[Tuple[str, int, int, int]],
+    **options: Any,
+) -> str:
+    """캐시 키(sha256 hex)를 만듭니다. options에는 결과에 영향을 주는 추가 옵션을 넘깁니다."""
+    material = {
+        "project": {key: project.get(key) for key in sorted(project)},
+        "transform": asdict(transform),
+        "scenes": fingerprints,
+        "options": options,
+    }
+    return hashlib.sha256(jsonio.dumps(material)).hexdigest()
+
+
+def get_cached_export(project_id: uuid.UUID, key: str) -> Optional[CachedExport]:
+    """키가 일치하고 결과 파일이 아직 있으면 캐시된 결과를 반환합니다."""
+    with _lock:
+        cached = _cache.get(project_id)
+    if cached is None or cached.key != key:
+        return None
+    if not os.path.exists(cached.out_path):
+        invalidate_export(project_id)
+        return None
+    return cached
+
+
+def store_export(project_id: uuid.UUID, cached: CachedExport) -> None:
+    with _lock:
+        _cache[project_id] = cached
+
+
+def invalidate_export(project_id: uuid.UUID) -> None:
+    with _lock:
+        _cache.pop(project_id, None)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 값이 etag와 일치하는지 확인합니다."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,204 @@
+"""
+백그라운드 내보내기 작업
+
+내보내기(검증 → 로드 → 배정 → 직렬화 → 전송)를 요청 처리와 분리해 asyncio 작업으로 실행하고,
+작업 ID로 상태 조회 / 진행 상황 구독 / 취소를 할 수 있게 합니다.
+
+- 단계: validation(선택) → loading → assignment → serialization → upload
+  단계마다 (완료 수, 전체 수)를 보고하며, 이벤트는 PROGRESS_INTERVAL 초 간격으로 묶어 보냅니다.
+  (단계가 바뀌거나 작업이 끝나는 이벤트는 바로 보냄)
+- 구독: 작업별 큐(SSE 엔드포인트용)와 전역 리스너(/ws 전송용, 작업을 만든 사용자의 연결에만 보냄)
+- 작업 기록은 메모리에만 두며, 끝난 작업은 최근 JOB_HISTORY 개까지만 보관합니다.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+JOB_STAGES = ("validation", "loading", "assignment", "serialization", "upload")
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+JOB_HISTORY = 100
+PROGRESS_INTERVAL = 0.2
+_SUBSCRIBER_QUEUE_SIZE = 64
+
+
+class JobCancelled(Exception):
+    """취소(또는 종료)된 작업의 진행 콜백이 호출되면 발생합니다."""
+
+
+@dataclass
+class ExportJob:
+    """내보내기 작업 하나의 상태"""
+
+    id: str
+    project_id: uuid.UUID
+    user_id: Any
+    status: str = "queued"  # queued | running | succeeded | failed | cancelled
+    stage: Optional[str] = None
+    done: int = 0
+    total: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Any = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    _published_at: float = field(default=0.0, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "project_id": str(self.project_id),
+            "status": self.status,
+            "stage": self.stage,
+            "stage_index": JOB_STAGES.index(self.stage) if self.stage else None,
+            "done": self.done,
+            "total": self.total,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+JobWork = Callable[[ExportJob, Callable[[str, int, int], None]], Awaitable[Dict[str, Any]]]
+JobListener = Callable[[ExportJob, Dict[str, Any]], Awaitable[None]]
+
+
+class ExportJobManager:
+    """작업 생성 / 조회 / 취소와 진행 이벤트 발행"""
+
+    def __init__(self, history: int = JOB_HISTORY):
+        self.history = history
+        self.jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+        self.listeners: List[JobListener] = []
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # 리스너 알림 작업 (GC 방지용 참조)
+        self._notifications: Set[asyncio.Task] = set()
+
+    def add_listener(self, listener: JobListener) -> None:
+        """이벤트마다 listener(job, event)를 호출합니다. (받는 쪽에서 job.user_id로 범위를 제한)"""
+        self.listeners.append(listener)
+
+    def create(self, project_id: uuid.UUID, user_id: Any, work: JobWork) -> ExportJob:
+        """
+        work(job, progress)를 백그라운드 작업으로 시작합니다.
+        work는 결과 dict를 반환하고, HTTPException을 던지면 detail이 작업 오류로 기록됩니다.
+        """
+        job = ExportJob(id=uuid.uuid4().hex, project_id=project_id, user_id=user_id)
+        self.jobs[job.id] = job
+        self._evict()
+        job.task = asyncio.create_task(self._run(job, work))
+        self._publish(job, force=True)
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def subscribe(self, job: ExportJob) -> asyncio.Queue:
+        """작업 이벤트 큐. 느린 구독자는 오래된 진행 이벤트를 건너뜁니다."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        queue.put_nowait(job.to_dict())
+        self._subscribers.setdefault(job.id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job: ExportJob, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(job.id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job.id]
+
+    def progress_callback(self, job: ExportJob) -> Callable[[str, int, int], None]:
+        """
+        파이프라인에 넘길 진행 콜백 (스레드 풀에서 호출돼도 이벤트 루프에서 처리)
+        작업이 이미 끝났으면 JobCancelled를 던져 남은 스레드 작업을 멈춥니다.
+        """
+        loop = asyncio.get_running_loop()
+
+        def _progress(stage: str, done: int, total: int) -> None:
+            if job.finished:
+                # 취소된 작업의 스레드 풀 작업(씬 배정 / 직렬화 루프)을 중단시킴
+                raise JobCancelled(job.id)
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                self._set_progress(job, stage, done, total)
+            else:
+                loop.call_soon_threadsafe(self._set_progress, job, stage, done, total)
+
+        return _progress
+
+    def _set_progress(self, job: ExportJob, stage: str, done: int, total: int) -> None:
+        if job.finished:
+            return
+        changed = stage != job.stage
+        job.stage, job.done, job.total = stage, done, total
+        job.updated_at = time.time()
+        self._publish(job, force=changed or done >= total)
+
+    async def _run(self, job: ExportJob, work: JobWork) -> None:
+        job.status = "running"
+        self._publish(job, force=True)
+        try:
+            job.result = await work(job, self.progress_callback(job))
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = e.detail
+        except Exception as e:
+            print(f"Export job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        job.updated_at = time.time()
+        self._publish(job, force=True)
+
+    def _publish(self, job: ExportJob, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - job._published_at < PROGRESS_INTERVAL:
+            return
+        job._published_at = now
+        event = job.to_dict()
+        for queue in self._subscribers.get(job.id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+        for listener in self.listeners:
+            task = asyncio.get_running_loop().create_task(_notify(listener, job, event))
+            self._notifications.add(task)
+            task.add_done_callback(self._notifications.discard)
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
+
+
+async def _notify(listener: JobListener, job: ExportJob, event: Dict[str, Any]) -> None:
+    try:
+        await listener(job, event)
+    except Exception as e:
+        print(f"Export job listener failed: {e}")
+
+
+export_jobs = ExportJobManager()
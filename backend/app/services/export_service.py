@@ -0,0 +1,712 @@
+"""
+프로젝트 → 드론쇼 JSON 내보내기 파이프라인
+
+1. 메타데이터 조회: 프로젝트 설정과 씬 목록을 읽고 DB 커넥션을 바로 반납합니다.
+2. 씬 로드/변환: 각 씬의 처리된 도트 데이터를 스레드 풀에서 병렬로 읽고 변환합니다.
+   (동시 실행 수는 EXPORT_MAX_WORKERS로 제한, 결과 순서는 씬 번호 순서 유지)
+3. 드론 배정(선택): 연속된 씬 사이의 이동 거리가 최소가 되도록 각 씬의 도트 순서를
+   재배열해, action_data의 인덱스가 곧 고정된 드론 번호가 되도록 합니다.
+4. 전환 시간 검증(선택): max_speed / max_accel로 각 전환의 최소 소요 시간을 구합니다.
+5. 조립: 프로젝트 레벨 JSON(또는 바이너리 쇼 파일, show_binary)을 구성합니다.
+   delta_encode이면 첫 씬 이후는 바뀐 드론만 담은 delta 씬으로 저장합니다. (delta_codec)
+"""
+
+import asyncio
+import functools
+import os
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import PROCESSED_DIR
+from app.db.database import get_conn
+from app.services.assignment_service import assign_targets
+from app.services.balance_service import FleetSpec, balance_scene, park_unassigned
+from app.services.collision_service import (
+    CollisionReport,
+    check_transition,
+    get_collision_pool,
+)
+from app.services.delta_codec import DEFAULT_POSITION_QUANTUM, SceneDeltaEncoder
+from app.services.dot_sidecar import load_dot_scene
+from app.services.scene_writes import scene_writes
+from app.services.show_binary import ShowBinaryWriter
+from app.services.show_exporter import (
+    ExportTransform,
+    ShowScene,
+    show_json,
+    show_scene,
+)
+from app.services.timing_service import TransitionReport, analyze_transition
+from app.services.trajectory_service import (
+    TrajectoryPlan,
+    TrajectorySampler,
+    keyframe_times,
+    pad_positions,
+)
+from app.services.validation_service import SeparationReport, validate_separation
+from app.utils import jsonio
+
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=EXPORT_MAX_WORKERS, thread_name_prefix="scene-export"
+)
+
+# 진행 상황 콜백 (단계 이름, 완료 수, 전체 수). 스레드 풀에서 호출될 수도 있습니다.
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    """결과에 영향을 주는 내보내기 옵션 (캐시 키에 포함됨)"""
+
+    # 연속된 씬 사이 드론 ↔ 도트 최소 거리 배정
+    assign_drones: bool = False
+    # 배정 비용 = 거리 ** assignment_power (2이면 긴 이동을 더 강하게 억제)
+    assignment_power: float = 1.0
+    # 설정하면 씬 번호 한 칸당 이 시간(초)을 기준으로 전환 시간을 검증
+    seconds_per_scene: Optional[float] = None
+    # 모든 씬의 드론 수를 fleet 크기로 맞춤 (부족하면 주차, 많으면 솎아내기)
+    balance_drones: bool = False
+    # 첫 씬 이후를 직전 씬과의 차이(delta)로 저장, 위치 델타는 delta_quantum 단위 int16
+    delta_encode: bool = False
+    delta_quantum: float = DEFAULT_POSITION_QUANTUM
+
+
+def scene_encoder(options: ExportOptions) -> Optional[SceneDeltaEncoder]:
+    """delta_encode이면 내보내기 한 번에 쓸 델타 인코더 (씬 순서대로 상태를 유지)"""
+    if not options.delta_encode:
+        return None
+    return SceneDeltaEncoder(options.delta_quantum)
+
+
+def encode_scene(
+    encoder: Optional[SceneDeltaEncoder], scene: ShowScene
+) -> Dict[str, Any]:
+    return encoder.encode(scene) if encoder is not None else scene.to_json()
+
+
+@dataclass
+class ExportMetadata:
+    """내보내기에 필요한 DB 정보 (커넥션 반납 후에도 사용)"""
+
+    project: Dict[str, Any]
+    scenes: List[Dict[str, Any]]
+
+
+async def fetch_export_metadata(
+    project_id: uuid.UUID, user_id: Optional[uuid.UUID] = None
+) -> Optional[ExportMetadata]:
+    """
+    프로젝트 정보와 씬 목록을 조회합니다. 커넥션은 조회가 끝나는 즉시 반납됩니다.
+    씬 파일을 읽기 전에 병합 대기 중인 자동 저장(scene_writes)을 디스크에 내려보냅니다.
+    user_id가 있으면 그 사용자의 프로젝트만 조회합니다. (다른 사용자의 프로젝트는 None → 404)
+    """
+    await scene_writes.flush()
+    async with get_conn() as conn:
+        project = await conn.fetchrow(
+            """
+            SELECT project_name, format, max_scene, max_drone, max_speed, max_accel, min_separation
+            FROM project
+            WHERE id = $1
+              AND ($2::uuid IS NULL OR user_id = $2)
+            """,
+            project_id,
+            user_id,
+        )
+        if not project:
+            return None
+
+        scenes = await conn.fetch(
+            """
+            SELECT s.id, s.scene_num
+            FROM project_scenes ps
+                     JOIN scene s ON ps.scene_id = s.id
+            WHERE ps.project_id = $1
+            ORDER BY s.scene_num
+            """,
+            project_id,
+        )
+
+    return ExportMetadata(
+        project=dict(project), scenes=[dict(scene) for scene in scenes]
+    )
+
+
+def scene_holders(scenes: List[Dict[str, Any]]) -> List[int]:
+    """scene_holder 계산: 다음 씬까지의 간격 (마지막 씬은 0)"""
+    holders = []
+    for i, scene in enumerate(scenes):
+        if i < len(scenes) - 1:
+            holders.append(scenes[i + 1]["scene_num"] - scene["scene_num"] - 1)
+        else:
+            holders.append(0)
+    return holders
+
+
+def build_scene_data(
+    scene_id: uuid.UUID,
+    scene_num: int,
+    scene_holder: int,
+    transform: ExportTransform,
+    fleet: Optional[FleetSpec] = None,
+) -> Optional[ShowScene]:
+    """
+    한 씬의 처리된 도트 데이터를 읽어 쇼 좌표로 변환합니다. (스레드 풀에서 실행)
+    fleet이 주어지면 드론 수를 fleet 크기로 맞춥니다. 처리된 파일이 없으면 None을 반환합니다.
+    """
+    processed_path = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
+    if not os.path.exists(processed_path):
+        return None
+
+    # 바이너리 사이드카(.dots)를 mmap으로 읽고, 좌표 매핑은 배열 연산으로 일괄 적용
+    dot_scene = load_dot_scene(processed_path)
+    scene = show_scene(dot_scene, transform, scene_num, scene_holder)
+    return balance_scene(scene, fleet) if fleet is not None else scene
+
+
+async def load_scenes(
+    scenes: List[Dict[str, Any]],
+    transform: ExportTransform,
+    max_parallel: int = EXPORT_MAX_WORKERS,
+    fleet: Optional[FleetSpec] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> List[Optional[ShowScene]]:
+    """
+    모든 씬을 스레드 풀에서 병렬로 로드/변환합니다.
+    반환 리스트의 순서는 입력 씬 순서와 같고, 실패하거나 처리된 파일이 없는 씬은 None 입니다.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    holders = scene_holders(scenes)
+    done = 0
+
+    async def _run(scene: Dict[str, Any], scene_holder: int):
+        nonlocal done
+        async with semaphore:
+            try:
+                return await loop.run_in_executor(
+                    _executor,
+                    build_scene_data,
+                    scene["id"],
+                    scene["scene_num"],
+                    scene_holder,
+                    transform,
+                    fleet,
+                )
+            except Exception as e:
+                print(f"Error processing scene {scene['id']}: {e}")
+                return None
+            finally:
+                done += 1
+                if progress is not None:
+                    progress("loading", done, len(scenes))
+
+    return await asyncio.gather(
+        *(_run(scene, holder) for scene, holder in zip(scenes, holders))
+    )
+
+
+async def iter_scene_results(
+    scenes: List[Dict[str, Any]],
+    transform: ExportTransform,
+    prefetch: int = 2,
+    fleet: Optional[FleetSpec] = None,
+) -> AsyncIterator[Optional[ShowScene]]:
+    """
+    씬 결과를 씬 순서대로 하나씩 내보냅니다. (스트리밍 내보내기용)
+    동시에 메모리에 올라가는 씬은 prefetch 개로 제한됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    holders = scene_holders(scenes)
+    pending: Deque[Tuple[Dict[str, Any], asyncio.Future]] = deque()
+    items = iter(zip(scenes, holders))
+
+    def _submit() -> None:
+        for scene, scene_holder in items:
+            future = loop.run_in_executor(
+                _executor,
+                build_scene_data,
+                scene["id"],
+                scene["scene_num"],
+                scene_holder,
+                transform,
+                fleet,
+            )
+            pending.append((scene, future))
+            return
+
+    try:
+        for _ in range(max(1, prefetch)):
+            _submit()
+        while pending:
+            scene, future = pending.popleft()
+            try:
+                result = await future
+            except Exception as e:
+                print(f"Error processing scene {scene['id']}: {e}")
+                result = None
+            _submit()
+            yield result
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def assign_next_scene(
+    previous: Optional[ShowScene],
+    scene: ShowScene,
+    options: ExportOptions,
+    min_separation: float,
+) -> ShowScene:
+    """
+    직전 씬(이미 드론 순서로 정렬됨)의 드론 위치를 기준으로 scene의 도트 순서를 재배열합니다.
+    도트보다 드론이 많으면 도트를 받지 못한 드론은 같은 번호로 주차합니다. (꺼진 상태)
+    배정을 끄거나 첫 씬이면 그대로 반환합니다.
+    """
+    if not options.assign_drones or previous is None:
+        return scene
+    order = assign_targets(
+        previous.transform_pos,
+        scene.transform_pos,
+        power=options.assignment_power,
+    )
+    return park_unassigned(scene, order, min_separation)
+
+
+def project_min_separation(project: Dict[str, Any]) -> float:
+    return float(project["min_separation"] or 2.0)
+
+
+def project_motion_limits(project: Dict[str, Any]) -> Tuple[float, float]:
+    """(max_speed, max_accel)"""
+    return float(project["max_speed"] or 6.0), float(project["max_accel"] or 3.0)
+
+
+@dataclass
+class ExportStats:
+    """씬을 순서대로 처리하면서 채워지는 통계 (스트리밍 내보내기는 끝난 뒤에 완성됨)"""
+
+    scenes_processed: int = 0
+    max_drones_in_scenes: int = 0
+    transitions: List[TransitionReport] = field(default_factory=list)
+
+
+def process_next_scene(
+    previous: Optional[ShowScene],
+    scene: ShowScene,
+    options: ExportOptions,
+    project: Dict[str, Any],
+    stats: ExportStats,
+) -> ShowScene:
+    """
+    직전 씬을 기준으로 드론 배정과 전환 시간 검증을 적용하고 통계를 갱신합니다.
+    배정과 검증 모두 직전 씬에만 의존하므로 씬 순서대로 이어서 계산할 수 있습니다.
+    """
+    scene = assign_next_scene(previous, scene, options, project_min_separation(project))
+    if options.seconds_per_scene and previous is not None:
+        max_speed, max_accel = project_motion_limits(project)
+        stats.transitions.append(
+            analyze_transition(
+                previous,
+                scene,
+                max_speed=max_speed,
+                max_accel=max_accel,
+                seconds_per_scene=options.seconds_per_scene,
+            )
+        )
+    stats.scenes_processed += 1
+    stats.max_drones_in_scenes = max(stats.max_drones_in_scenes, len(scene))
+    return scene
+
+
+def assemble_scenes(
+    results: List[Optional[ShowScene]],
+    options: ExportOptions,
+    project: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[List[Dict[str, Any]], ExportStats]:
+    """
+    로드된 씬들을 순서대로 처리(process_next_scene)한 뒤 씬 JSON 리스트로 만듭니다.
+    (스레드 풀에서 실행, 진행 상황은 assignment → serialization 단계로 보고)
+    """
+    stats = ExportStats()
+    loaded = [scene for scene in results if scene is not None]
+    processed: List[ShowScene] = []
+    previous = None
+    for index, scene in enumerate(loaded, 1):
+        previous = process_next_scene(previous, scene, options, project, stats)
+        processed.append(previous)
+        if progress is not None:
+            progress("assignment", index, len(loaded))
+
+    encoder = scene_encoder(options)
+    scenes_data = []
+    for index, scene in enumerate(processed, 1):
+        scenes_data.append(encode_scene(encoder, scene))
+        if progress is not None:
+            progress("serialization", index, len(processed))
+    return scenes_data, stats
+
+
+async def build_scenes_data(
+    results: List[Optional[ShowScene]],
+    options: ExportOptions,
+    project: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[List[Dict[str, Any]], ExportStats]:
+    """assemble_scenes를 내보내기 스레드 풀에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, assemble_scenes, results, options, project, progress
+    )
+
+
+async def iter_processed_scenes(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    stats: ExportStats,
+    prefetch: int = 2,
+) -> AsyncIterator[ShowScene]:
+    """씬을 순서대로 읽어 process_next_scene을 적용한 결과를 하나씩 내보냅니다."""
+    loop = asyncio.get_running_loop()
+    fleet = await resolve_fleet(metadata, options)
+    previous: Optional[ShowScene] = None
+    async for scene in iter_scene_results(
+        metadata.scenes, transform, prefetch, fleet
+    ):
+        if scene is None:
+            continue
+        scene = await loop.run_in_executor(
+            _executor,
+            process_next_scene,
+            previous,
+            scene,
+            options,
+            metadata.project,
+            stats,
+        )
+        previous = scene
+        yield scene
+
+
+async def analyze_project_timing(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    prefetch: int = 2,
+) -> List[TransitionReport]:
+    """내보내기 없이 전환 시간 검증만 실행합니다. (options.seconds_per_scene 필요)"""
+    stats = ExportStats()
+    async for _ in iter_processed_scenes(metadata, transform, options, stats, prefetch):
+        pass
+    return stats.transitions
+
+
+async def validate_project(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    prefetch: int = 2,
+    progress: Optional[ProgressCallback] = None,
+) -> List[SeparationReport]:
+    """
+    프로젝트의 모든 씬에 대해 최소 간격(min_separation)을 검증합니다. (내보내기 전 검사)
+    씬은 iter_scene_results로 순서대로 읽으므로 메모리에는 prefetch 개 씬만 올라갑니다.
+    처리된 파일이 없는 씬은 결과에서 빠집니다.
+    """
+    loop = asyncio.get_running_loop()
+    min_separation = project_min_separation(metadata.project)
+    reports = []
+    index = 0
+    async for scene in iter_scene_results(metadata.scenes, transform, prefetch):
+        scene_id = str(metadata.scenes[index]["id"])
+        index += 1
+        if progress is not None:
+            progress("validation", index, len(metadata.scenes))
+        if scene is None:
+            continue
+        reports.append(
+            await loop.run_in_executor(
+                _executor, validate_separation, scene, min_separation, scene_id
+            )
+        )
+    return reports
+
+
+def _processed_dot_count(scene_id: uuid.UUID) -> Optional[int]:
+    processed_path = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
+    if not os.path.exists(processed_path):
+        return None
+    return len(load_dot_scene(processed_path))
+
+
+async def scene_dot_counts(metadata: ExportMetadata) -> List[Optional[int]]:
+    """씬별 처리된 도트 수 (사이드카 헤더만 읽음). 처리된 파일이 없으면 None"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(
+            loop.run_in_executor(_executor, _processed_dot_count, scene["id"])
+            for scene in metadata.scenes
+        )
+    )
+
+
+async def resolve_fleet(
+    metadata: ExportMetadata, options: ExportOptions
+) -> Optional[FleetSpec]:
+    """
+    드론 수 맞추기(balance_drones)에 쓸 fleet 크기를 정합니다.
+    프로젝트의 max_drone이 있으면 그 값, 없으면 씬별 도트 수의 최댓값입니다.
+    """
+    if not options.balance_drones:
+        return None
+    size = metadata.project["max_drone"]
+    if size is None:
+        counts = await scene_dot_counts(metadata)
+        size = max((count for count in counts if count is not None), default=0)
+    if int(size) <= 0:
+        return None
+    return FleetSpec(
+        size=int(size), min_separation=project_min_separation(metadata.project)
+    )
+
+
+async def plan_trajectory(
+    metadata: ExportMetadata,
+    hz: float,
+    seconds_per_scene: float,
+    fleet: Optional[FleetSpec] = None,
+) -> TrajectoryPlan:
+    """
+    궤적 크기(프레임 수, 드론 수)를 미리 계산합니다. (스트리밍 헤더용)
+    처리된 씬의 도트 수만 읽으므로(사이드카 헤더) 씬 전체를 변환하지 않습니다.
+    """
+    counts = await scene_dot_counts(metadata)
+    numbers = [
+        scene["scene_num"]
+        for scene, count in zip(metadata.scenes, counts)
+        if count is not None
+    ]
+    drones = max((count for count in counts if count is not None), default=0)
+    return TrajectoryPlan(
+        hz=float(hz),
+        keyframe_times=keyframe_times(numbers, seconds_per_scene),
+        drones=fleet.size if fleet is not None else drones,
+    )
+
+
+async def iter_trajectory(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    plan: TrajectoryPlan,
+    chunk_frames: int = 256,
+    prefetch: int = 2,
+) -> AsyncIterator[np.ndarray]:
+    """
+    내보내기와 같은 씬 처리(배정 포함)를 거친 씬들로 궤적 청크 (frames, N, 3) float32를
+    차례로 생성합니다. 청크 계산은 내보내기 스레드 풀에서 실행됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    _, max_accel = project_motion_limits(metadata.project)
+    sampler = TrajectorySampler(plan, max_accel, chunk_frames)
+    stats = ExportStats()
+
+    async def _drain(chunks):
+        while True:
+            chunk = await loop.run_in_executor(_executor, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    async for scene in iter_processed_scenes(
+        metadata, transform, options, stats, prefetch
+    ):
+        async for chunk in _drain(sampler.add_keyframe(scene)):
+            yield chunk
+    async for chunk in _drain(sampler.finish()):
+        yield chunk
+
+
+async def check_project_collisions(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    options: ExportOptions,
+    hz: float = 4.0,
+    prefetch: int = 2,
+    progress: Optional[ProgressCallback] = None,
+) -> List[CollisionReport]:
+    """
+    모든 전환 구간의 연속 충돌 검사 (options.seconds_per_scene 필요)
+    씬은 순서대로 처리(배정 포함)하고, 전환마다 검사를 프로세스 풀에 넘겨 병렬로 실행합니다.
+    """
+    if not options.seconds_per_scene:
+        raise ValueError("seconds_per_scene is required for collision checks")
+
+    loop = asyncio.get_running_loop()
+    pool = get_collision_pool()
+    min_separation = project_min_separation(metadata.project)
+    _, max_accel = project_motion_limits(metadata.project)
+    seconds = options.seconds_per_scene
+
+    stats = ExportStats()
+    futures = []
+    checked = 0
+
+    def _checked(_future) -> None:
+        nonlocal checked
+        checked += 1
+        if progress is not None:
+            progress("validation", checked, max(len(metadata.scenes) - 1, checked))
+
+    first_number: Optional[int] = None
+    previous: Optional[ShowScene] = None
+    async for scene in iter_processed_scenes(
+        metadata, transform, options, stats, prefetch
+    ):
+        if first_number is None:
+            first_number = scene.scene_number
+        if previous is not None:
+            drones = max(len(previous), len(scene))
+            check = functools.partial(
+                check_transition,
+                pad_positions(previous.transform_pos, drones),
+                pad_positions(scene.transform_pos, drones),
+                max(scene.scene_number - previous.scene_number, 1) * seconds,
+                max_accel,
+                min_separation,
+                hz=hz,
+                start_time=(previous.scene_number - first_number) * seconds,
+                from_scene=previous.scene_number,
+                to_scene=scene.scene_number,
+            )
+            future = loop.run_in_executor(pool, check)
+            future.add_done_callback(_checked)
+            futures.append(future)
+        previous = scene
+
+    return list(await asyncio.gather(*futures))
+
+
+def build_project_json(
+    metadata: ExportMetadata,
+    scenes_data: List[Dict[str, Any]],
+    max_drones_in_scenes: int,
+    encoding: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    프로젝트 레벨 JSON 구성 (무조건 DB 값 사용)
+    encoding이 주어지면 (델타 인코딩) 쇼 JSON에 "encoding"으로 포함합니다.
+    """
+    project = metadata.project
+    project_max_drone_raw = project["max_drone"]
+    project_max_drone = (
+        int(project_max_drone_raw) if project_max_drone_raw is not None else None
+    )
+    max_speed, max_accel = project_motion_limits(project)
+
+    project_json = show_json(
+        scenes_data,
+        format=(project["format"] or "dsj").strip(),
+        show_name=project["project_name"] or "Untitled Show",
+        max_drone=(
+            project_max_drone
+            if project_max_drone is not None
+            else max_drones_in_scenes
+        ),
+        max_scene=len(metadata.scenes),
+        max_speed=max_speed,
+        max_accel=max_accel,
+        min_separation=project_min_separation(project),
+    )
+    if encoding is not None:
+        project_json["encoding"] = encoding
+    return project_json
+
+
+async def iter_project_json(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    stats: Optional[ExportStats] = None,
+    prefetch: int = 2,
+    options: ExportOptions = ExportOptions(),
+) -> AsyncIterator[bytes]:
+    """
+    build_project_json과 같은 쇼 JSON을 씬 단위 bytes 조각으로 나누어 내보냅니다.
+    전체 쇼를 한 번에 메모리에 만들지 않으므로, 메모리 사용량은 프로젝트 길이와 무관하게
+    prefetch 개 씬 분량으로 제한됩니다.
+
+    프로젝트에 max_drone이 없으면 씬을 모두 읽은 뒤에야 값을 알 수 있으므로,
+    그 경우에만 "show" 블록을 "scenes" 뒤에 둡니다.
+    """
+    stats = stats if stats is not None else ExportStats()
+    encoder = scene_encoder(options)
+    full = build_project_json(
+        metadata, [], 0, encoder.header() if encoder is not None else None
+    )
+    show_known = metadata.project["max_drone"] is not None
+
+    head = {key: value for key, value in full.items() if key != "scenes"}
+    if not show_known:
+        head.pop("show")
+    yield jsonio.dumps(head)[:-1] + b',"scenes":['
+
+    first = True
+    async for scene in iter_processed_scenes(
+        metadata, transform, options, stats, prefetch
+    ):
+        chunk = jsonio.dumps(encode_scene(encoder, scene))
+        yield chunk if first else b"," + chunk
+        first = False
+
+    if show_known:
+        yield b"]}"
+    else:
+        show = build_project_json(metadata, [], stats.max_drones_in_scenes)["show"]
+        yield b'],"show":' + jsonio.dumps(show) + b"}"
+
+
+async def write_project_binary(
+    metadata: ExportMetadata,
+    transform: ExportTransform,
+    path: str,
+    stats: Optional[ExportStats] = None,
+    prefetch: int = 2,
+    options: ExportOptions = ExportOptions(),
+    progress: Optional[ProgressCallback] = None,
+) -> ExportStats:
+    """
+    iter_project_json과 같은 씬들을 바이너리 쇼 파일(show_binary)로 씁니다.
+    씬을 하나씩 기록하므로 메모리 사용량은 prefetch 개 씬 분량으로 제한됩니다.
+    """
+    stats = stats if stats is not None else ExportStats()
+    head = build_project_json(metadata, [], 0)
+    loop = asyncio.get_running_loop()
+    # 임시 파일에 다 쓴 뒤 이름 교체 (읽는 쪽이 쓰는 중인 파일을 보지 않음)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            writer = ShowBinaryWriter(f, head, capacity=len(metadata.scenes))
+            async for scene in iter_processed_scenes(
+                metadata, transform, options, stats, prefetch
+            ):
+                await loop.run_in_executor(_executor, writer.add_scene, scene)
+                if progress is not None:
+                    progress(
+                        "serialization", stats.scenes_processed, len(metadata.scenes)
+                    )
+            max_drone = build_project_json(metadata, [], stats.max_drones_in_scenes)[
+                "show"
+            ]["max_drone"]
+            await loop.run_in_executor(_executor, writer.finish, max_drone)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return stats
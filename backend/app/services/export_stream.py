@@ -0,0 +1,142 @@
+"""
+스트리밍 내보내기 분배기
+
+하나의 bytes 조각 스트림(iter_project_json)을 여러 소비자에게 동시에 나눠 줍니다.
+- 파일 싱크: 분배기가 직접 {out_path}.part에 쓰고, 끝까지 성공하면 out_path로 rename
+- 구독자: HTTP StreamingResponse 등 (각자 작은 bounded 큐를 가짐)
+  GCS 전송은 구독자로 붙이지 않고, 완성된 파일을 전송 큐에 넣습니다.
+  (재시도 시 파일을 다시 읽어야 하고, 도중에 실패한 쇼가 드론 쪽으로 가면 안 되며,
+  GCS 큐 대기 때문에 HTTP 응답 속도가 느려지지 않게 하기 위함)
+
+큐 크기가 제한되어 있어 가장 느린 소비자에 맞춰 생산 속도가 조절되고,
+일정 시간 동안 조각을 받아 가지 않는 구독자는 분리됩니다.
+HTTP 구독자는 SubscriberStreamingResponse로 보내면 연결이 끊기는 즉시 닫힙니다.
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+_END = object()
+
+
+class _Subscriber:
+    """구독자 하나의 비동기 반복자. aclose()하면 분배기가 더 이상 조각을 넣지 않습니다."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def __aiter__(self) -> "_Subscriber":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.closed:
+            raise StopAsyncIteration
+        item = await self.queue.get()
+        if item is _END:
+            self.closed = True
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            self.closed = True
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        self.closed = True
+        # 분배기가 put에서 기다리고 있으면 바로 풀어 줌 (이후 조각은 넣지 않음)
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class SubscriberStreamingResponse(StreamingResponse):
+    """
+    구독자를 본문으로 보내는 StreamingResponse.
+    응답이 끝나거나 클라이언트 연결이 끊겨(OSError / 취소) 중단되면 구독자를 닫아,
+    분배기가 consumer_timeout 동안 기다리지 않고 파일 쓰기를 계속하게 합니다.
+    """
+
+    def __init__(self, subscriber: _Subscriber, **kwargs):
+        super().__init__(subscriber, **kwargs)
+        self.subscriber = subscriber
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.subscriber.aclose()
+
+
+class ChunkFanout:
+    """bytes 조각 스트림을 파일과 여러 구독자에게 동시에 전달합니다."""
+
+    def __init__(
+        self,
+        source: AsyncIterator[bytes],
+        out_path: Optional[str] = None,
+        *,
+        maxsize: int = 4,
+        consumer_timeout: float = 30.0,
+    ):
+        self.source = source
+        self.out_path = out_path
+        self.maxsize = maxsize
+        self.consumer_timeout = consumer_timeout
+        self.subscribers: List[_Subscriber] = []
+        self.bytes_written = 0
+
+    def subscribe(self) -> _Subscriber:
+        """run() 시작 전에 호출해야 합니다."""
+        subscriber = _Subscriber(self.maxsize)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    async def _publish(self, item) -> None:
+        for subscriber in self.subscribers:
+            if subscriber.closed:
+                continue
+            try:
+                await asyncio.wait_for(
+                    subscriber.queue.put(item), timeout=self.consumer_timeout
+                )
+            except asyncio.TimeoutError:
+                print("Export stream consumer stalled; detaching it")
+                subscriber.closed = True
+
+    async def run(self) -> bool:
+        """
+        소스를 끝까지 읽어 분배합니다. 성공하면 True를 반환합니다.
+        실패하면 .part 파일을 지우고, 구독자에게는 예외를 전달합니다.
+        """
+        part_path = f"{self.out_path}.part" if self.out_path else None
+        out_file = None
+        try:
+            if part_path:
+                out_file = await aiofiles.open(part_path, "wb")
+            async for chunk in self.source:
+                if out_file is not None:
+                    await out_file.write(chunk)
+                self.bytes_written += len(chunk)
+                await self._publish(chunk)
+            if out_file is not None:
+                await out_file.close()
+                out_file = None
+                os.replace(part_path, self.out_path)
+            await self._publish(_END)
+            return True
+        except Exception as e:
+            print(f"Export stream failed: {e}")
+            await self._publish(e)
+            return False
+        finally:
+            if out_file is not None:
+                await out_file.close()
+            if part_path and os.path.exists(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
@@ -1,9 +1,14 @@
 import os
 import re
 import uuid
-import json
 from typing import Iterable, List, Tuple, Dict, Any, Optional
 
+import numpy as np
+
+from app.services import show_exporter
+from app.services.dot_scene import DotScene
+from app.utils import jsonio
+
 
 def _parse_float(val: Optional[str], default: float = 0.0) -> float:
     if val is None:
@@ -31,72 +36,269 @@ def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     return (255, 255, 255)  # default white
 
 
-def fabric_json_to_coords(json_path: str) -> List[Tuple[float, float]]:
-    """
-    Parse a Fabric.js JSON file and return a list of (x, y) positions for circle objects.
-    """
+_GROUP_TYPES = ("group", "activeselection")
+
+# Fabric.js originX / originY 문자열 → 중심 기준 오프셋
+_ORIGIN_X = {"left": -0.5, "center": 0.0, "right": 0.5}
+_ORIGIN_Y = {"top": -0.5, "center": 0.0, "bottom": 0.5}
+
+# 원 객체에서 읽어 오는 수치 속성 (열 순서가 _circle_centers의 인덱스와 일치)
+_CIRCLE_FIELDS = (
+    ("left", 0.0),
+    ("top", 0.0),
+    ("width", None),
+    ("height", None),
+    ("strokeWidth", 0.0),
+    ("scaleX", 1.0),
+    ("scaleY", 1.0),
+    ("angle", 0.0),
+    ("opacity", 1.0),
+)
+
+
+def _num(obj: Dict[str, Any], key: str, default: float) -> float:
+    val = obj.get(key)
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return float(val)
+    if val is None:
+        return default
+    return _parse_float(str(val), default)
+
+
+def _origin_offset(value: Any, table: Dict[str, float]) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) - 0.5
+    return table.get(str(value).lower(), -0.5)
+
+
+def _load_fabric_json(json_path: str) -> Dict[str, Any]:
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"Fabric.js JSON not found: {json_path}")
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            fabric_data = json.load(f)
-    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return jsonio.load_file(json_path)
+    except (jsonio.JSONDecodeError, UnicodeDecodeError) as e:
         raise ValueError(f"Failed to parse JSON file: {json_path}, error: {e}")
 
-    coords: List[Tuple[float, float]] = []
-
-    # Extract objects from Fabric.js canvas JSON
-    objects = fabric_data.get("objects", [])
 
+def _object_matrix(obj: Dict[str, Any]) -> np.ndarray:
+    """
+    그룹 객체의 변환 행렬(3x3)을 계산합니다.
+    Fabric.js의 calcOwnMatrix와 동일하게 translate(center) · rotate · scale · skew 순서입니다.
+    """
+    width = _num(obj, "width", 0.0)
+    height = _num(obj, "height", 0.0)
+    stroke = _num(obj, "strokeWidth", 0.0)
+    sx = _num(obj, "scaleX", 1.0)
+    sy = _num(obj, "scaleY", 1.0)
+    theta = np.deg2rad(_num(obj, "angle", 0.0))
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+
+    # left/top(원점 기준 좌표)을 중심 좌표로 변환
+    dx = -_origin_offset(obj.get("originX", "left"), _ORIGIN_X) * (width + stroke) * sx
+    dy = -_origin_offset(obj.get("originY", "top"), _ORIGIN_Y) * (height + stroke) * sy
+    cx = _num(obj, "left", 0.0) + dx * cos_t - dy * sin_t
+    cy = _num(obj, "top", 0.0) + dx * sin_t + dy * cos_t
+
+    translate_rotate = np.array(
+        [[cos_t, -sin_t, cx], [sin_t, cos_t, cy], [0.0, 0.0, 1.0]]
+    )
+    scale = np.diag(
+        [
+            -sx if obj.get("flipX") else sx,
+            -sy if obj.get("flipY") else sy,
+            1.0,
+        ]
+    )
+    skew_x = np.array(
+        [[1.0, np.tan(np.deg2rad(_num(obj, "skewX", 0.0))), 0.0], [0, 1, 0], [0, 0, 1]]
+    )
+    skew_y = np.array(
+        [[1.0, 0, 0], [np.tan(np.deg2rad(_num(obj, "skewY", 0.0))), 1.0, 0], [0, 0, 1]]
+    )
+    return translate_rotate @ scale @ skew_x @ skew_y
+
+
+def _fabric_matrix(values: Any) -> np.ndarray:
+    """Fabric.js의 [a, b, c, d, e, f] 배열을 3x3 행렬로 변환합니다."""
+    try:
+        a, b, c, d, e, f = (float(v) for v in values)
+    except (TypeError, ValueError):
+        return np.eye(3)
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+
+
+def _collect_circles(
+    objects: Iterable[Dict[str, Any]],
+    matrix_index: int,
+    group_opacity: float,
+    matrices: List[np.ndarray],
+    rows: List[Tuple[float, ...]],
+    row_matrix: List[int],
+    origins: List[Tuple[float, float]],
+    fills: List[Any],
+    opacities: List[float],
+) -> None:
+    """
+    객체 트리를 순회하며 원 객체의 속성만 모읍니다. 실제 좌표 계산은
+    fabric_data_to_dot_scene에서 한 번에 배열 연산으로 처리합니다.
+    """
     for obj in objects:
-        if obj.get("type").lower() == "circle":
-            # Fabric.js uses 'left' and 'top' for position
-            x = _parse_float(str(obj.get("left", 0)))
-            y = _parse_float(str(obj.get("top", 0)))
-            coords.append((x, y))
+        if not isinstance(obj, dict):
+            continue
+        obj_type = str(obj.get("type", "")).lower()
+
+        if obj_type in _GROUP_TYPES:
+            # 그룹 자식의 left/top은 그룹 중심 기준 좌표이므로 그룹 행렬을 누적합니다.
+            matrices.append(matrices[matrix_index] @ _object_matrix(obj))
+            _collect_circles(
+                obj.get("objects") or [],
+                len(matrices) - 1,
+                group_opacity * _num(obj, "opacity", 1.0),
+                matrices,
+                rows,
+                row_matrix,
+                origins,
+                fills,
+                opacities,
+            )
+        elif obj_type == "circle":
+            radius = _num(obj, "radius", 0.0)
+            rows.append(
+                tuple(
+                    _num(obj, key, 2.0 * radius if default is None else default)
+                    for key, default in _CIRCLE_FIELDS
+                )
+            )
+            row_matrix.append(matrix_index)
+            origins.append(
+                (
+                    _origin_offset(obj.get("originX", "left"), _ORIGIN_X),
+                    _origin_offset(obj.get("originY", "top"), _ORIGIN_Y),
+                )
+            )
+            fills.append(obj.get("fill", "#ffffff"))
+            opacities.append(group_opacity)
+
+
+def _fills_to_rgb(fills: List[Any]) -> np.ndarray:
+    """fill 문자열 목록을 (N, 3) uint8 배열로 변환합니다. 같은 색은 한 번만 파싱합니다."""
+    cache: Dict[Any, Tuple[int, int, int]] = {}
+    out = np.empty((len(fills), 3), dtype=np.uint8)
+    for i, fill_color in enumerate(fills):
+        key = fill_color if isinstance(fill_color, str) else None
+        rgb = cache.get(key)
+        if rgb is None:
+            if key is not None and key.startswith("#"):
+                rgb = _hex_to_rgb(key)
+            else:
+                rgb = (255, 255, 255)  # default white
+            cache[key] = rgb
+        out[i] = rgb
+    return out
 
-    return coords
 
+def get_fabric_canvas_size(fabric_data: Dict[str, Any]) -> Tuple[float, float, float]:
+    """Fabric.js JSON 데이터의 canvasSize에서 (width, height, z)를 구합니다."""
+    # 1. 'canvasSize' 객체를 가져옵니다. 없으면 빈 딕셔너리({})를 사용합니다.
+    canvas_size_obj = fabric_data.get("canvasSize") or {}
 
-def fabric_json_to_coords_with_colors(
-    json_path: str,
-) -> List[Tuple[float, float, Tuple[int, int, int], float]]:
+    # 2. 'canvasSize' 객체 내부에서 'width'와 'height'를 가져옵니다.
+    w = _parse_float(str(canvas_size_obj.get("width", 0)), 0.0)
+    h = _parse_float(str(canvas_size_obj.get("height", 0)), 0.0)
+
+    return float(w), float(h), 0.0
+
+
+def fabric_data_to_dot_scene(
+    fabric_data: Dict[str, Any], apply_viewport: bool = True
+) -> DotScene:
     """
-    Parse a Fabric.js JSON file and return a list of (x, y, (r, g, b), opacity) for circle objects.
+    Fabric.js 캔버스 JSON 데이터에서 원 객체를 추출해 DotScene으로 반환합니다.
+
+    - scaleX/scaleY/angle/originX/originY/flip/skew를 반영해 원의 중심 좌표를 구합니다.
+    - group / activeSelection 안의 원은 (중첩된) 그룹 행렬을 합성해 캔버스 좌표로 변환합니다.
+    - apply_viewport가 True이면 캔버스의 viewportTransform까지 적용합니다.
+    - 좌표 변환은 객체마다가 아니라 모든 원에 대해 한 번의 NumPy 배열 연산으로 수행합니다.
     """
-    if not os.path.exists(json_path):
-        raise FileNotFoundError(f"Fabric.js JSON not found: {json_path}")
+    root = (
+        _fabric_matrix(fabric_data.get("viewportTransform"))
+        if apply_viewport and fabric_data.get("viewportTransform") is not None
+        else np.eye(3)
+    )
+    matrices: List[np.ndarray] = [root]
+    rows: List[Tuple[float, ...]] = []
+    row_matrix: List[int] = []
+    origins: List[Tuple[float, float]] = []
+    fills: List[Any] = []
+    group_opacities: List[float] = []
+
+    _collect_circles(
+        fabric_data.get("objects") or [],
+        0,
+        1.0,
+        matrices,
+        rows,
+        row_matrix,
+        origins,
+        fills,
+        group_opacities,
+    )
+
+    w, h, _ = get_fabric_canvas_size(fabric_data)
+    if not rows:
+        return DotScene(width=w, height=h)
+
+    attrs = np.asarray(rows, dtype=np.float64)
+    left, top, width, height, stroke, sx, sy, angle, opacity = attrs.T
+    origin = np.asarray(origins, dtype=np.float64)
+
+    # 원점(left/top) → 원 중심: 회전된 오프셋만큼 이동
+    theta = np.deg2rad(angle)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    dx = -origin[:, 0] * (width + stroke) * sx
+    dy = -origin[:, 1] * (height + stroke) * sy
+    local = np.stack(
+        [
+            left + dx * cos_t - dy * sin_t,
+            top + dx * sin_t + dy * cos_t,
+            np.ones_like(left),
+        ],
+        axis=1,
+    )
 
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            fabric_data = json.load(f)
-    except (json.JSONDecodeError, UnicodeDecodeError) as e:
-        raise ValueError(f"Failed to parse JSON file: {json_path}, error: {e}")
+    # 각 원이 속한 그룹(또는 캔버스)의 누적 행렬을 일괄 적용
+    stacked = np.stack(matrices)[np.asarray(row_matrix, dtype=np.intp)]
+    world = np.einsum("nij,nj->ni", stacked, local)
 
-    coords_with_colors: List[Tuple[float, float, Tuple[int, int, int], float]] = []
+    return DotScene(
+        positions=np.ascontiguousarray(world[:, :2]),
+        colors=_fills_to_rgb(fills),
+        opacity=opacity * np.asarray(group_opacities, dtype=np.float64),
+        width=w,
+        height=h,
+    )
 
-    # Extract objects from Fabric.js canvas JSON
-    objects = fabric_data.get("objects", [])
 
-    for obj in objects:
-        if obj.get("type").lower() == "circle":
-            # Fabric.js uses 'left' and 'top' for position
-            x = _parse_float(str(obj.get("left", 0)))
-            y = _parse_float(str(obj.get("top", 0)))
-
-            # Extract fill color
-            fill_color = obj.get("fill", "#ffffff")
-            if isinstance(fill_color, str) and fill_color.startswith("#"):
-                rgb_color = _hex_to_rgb(fill_color)
-            else:
-                rgb_color = (255, 255, 255)  # default white
+def fabric_json_to_dot_scene(json_path: str, apply_viewport: bool = True) -> DotScene:
+    """Fabric.js JSON 파일을 한 번만 읽어 DotScene으로 반환합니다."""
+    return fabric_data_to_dot_scene(_load_fabric_json(json_path), apply_viewport)
 
-            # Extract opacity
-            opacity = _parse_float(str(obj.get("opacity", 1.0)))
-            coords_with_colors.append((x, y, rgb_color, opacity))
 
-    return coords_with_colors
+def fabric_json_to_coords(json_path: str) -> List[Tuple[float, float]]:
+    """
+    Parse a Fabric.js JSON file and return a list of (x, y) positions for circle objects.
+    """
+    return fabric_json_to_dot_scene(json_path).to_coords()
+
+
+def fabric_json_to_coords_with_colors(
+    json_path: str,
+) -> List[Tuple[float, float, Tuple[int, int, int], float]]:
+    """
+    Parse a Fabric.js JSON file and return a list of (x, y, (r, g, b), opacity) for circle objects.
+    """
+    return fabric_json_to_dot_scene(json_path).to_coords_with_colors()
 
 
 def get_fabric_json_size(json_path: str) -> Tuple[float, float, float]:
@@ -108,17 +310,7 @@ def get_fabric_json_size(json_path: str) -> Tuple[float, float, float]:
         raise FileNotFoundError(f"Fabric.js JSON not found: {json_path}")
 
     try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            fabric_data = json.load(f)
-
-        # 1. 'canvasSize' 객체를 가져옵니다. 없으면 빈 딕셔너리({})를 사용합니다.
-        canvas_size_obj = fabric_data.get("canvasSize", {})
-
-        # 2. 'canvasSize' 객체 내부에서 'width'와 'height'를 가져옵니다.
-        w = _parse_float(str(canvas_size_obj.get("width", 0)), 0.0)
-        h = _parse_float(str(canvas_size_obj.get("height", 0)), 0.0)
-
-        return float(w), float(h), 0.0
+        return get_fabric_canvas_size(jsonio.load_file(json_path))
     except Exception:
         return 0.0, 0.0, 0.0
 
@@ -127,158 +319,19 @@ def coords_to_json(
     coords: List[Tuple[float, float]],
     *,
     show_name: str = "fabric-import",
-    max_scene: int = 1,
-    max_drone: Optional[int] = None,
-    scene_number: int = 1,
-    scene_holder: int = 0,
-    scene_size: Optional[Tuple[float, float, float]] = None,
-    # mapping params
-    z_value: float = 0.0,
-    scale_x: float = 1.0,
-    scale_y: float = 1.0,
-    scale_z: float = 1.0,
-    offset_x: float = 0.0,
-    offset_y: float = 0.0,
-    offset_z: float = 0.0,
-    # visual params
-    led_intensity: float = 1.0,
-    led_rgb: Tuple[int, int, int] = (255, 255, 255),
-    # constraints
-    max_speed: float = 6.0,
-    max_accel: float = 3.0,
-    min_separation: float = 2.0,
+    **kwargs: Any,
 ) -> Dict[str, Any]:
-    """
-    Build JSON matching the reference schema using the provided coordinates.
-
-    Each coordinate becomes one action with transform_pos [x,y,z].
-    Scaling and offset are applied (then z_value, scale_z, offset_z for Z).
-    """
-    if max_drone is None:
-        max_drone = len(coords)
-
-    actions = []
-    for x, y in coords:
-        tx = x * scale_x + offset_x
-        ty = y * scale_y + offset_y
-        tz = z_value * scale_z + offset_z
-        actions.append(
-            {
-                "led_intensity": float(led_intensity),
-                "led_rgb": [int(led_rgb[0]), int(led_rgb[1]), int(led_rgb[2])],
-                "transform_pos": [float(tx), float(ty), float(tz)],
-            }
-        )
-
-    data: Dict[str, Any] = {
-        "format": "dsj",
-        "show": {
-            "show_name": show_name,
-            "max_scene": int(max_scene),
-            "max_drone": int(max_drone),
-        },
-        "constraints": {
-            "max_speed": float(max_speed),
-            "max_accel": float(max_accel),
-            "min_separation": float(min_separation),
-        },
-        "scenes": [
-            {
-                "scene_number": int(scene_number),
-                "scene_holder": int(scene_holder),
-                **(
-                    {
-                        "scene_size": [
-                            float(scene_size[0]),
-                            float(scene_size[1]),
-                            float(scene_size[2]),
-                        ]
-                    }
-                    if scene_size is not None
-                    else {}
-                ),
-                "action_data": actions,
-            }
-        ],
-    }
-
-    return data
+    """show_exporter.coords_to_json (기본 show_name만 다름)"""
+    return show_exporter.coords_to_json(coords, show_name=show_name, **kwargs)
 
 
 def coords_with_colors_to_json(
     coords_with_colors: List[Tuple[float, float, Tuple[int, int, int]]],
     *,
     show_name: str = "fabric-import",
-    max_scene: int = 1,
-    max_drone: Optional[int] = None,
-    scene_number: int = 1,
-    scene_holder: int = 0,
-    scene_size: Optional[Tuple[float, float, float]] = None,
-    # mapping params
-    z_value: float = 0.0,
-    scale_x: float = 1.0,
-    scale_y: float = 1.0,
-    scale_z: float = 1.0,
-    offset_x: float = 0.0,
-    offset_y: float = 0.0,
-    offset_z: float = 0.0,
-    # visual params (default values, will be overridden by individual colors)
-    led_intensity: float = 1.0,
-    # constraints
-    max_speed: float = 6.0,
-    max_accel: float = 3.0,
-    min_separation: float = 2.0,
+    **kwargs: Any,
 ) -> Dict[str, Any]:
-    """
-    Build JSON matching the reference schema using the provided coordinates with colors.
-    Each coordinate becomes one action with transform_pos [x,y,z] and individual led_rgb.
-    """
-    if max_drone is None:
-        max_drone = len(coords_with_colors)
-
-    actions = []
-    for x, y, (r, g, b) in coords_with_colors:
-        tx = x * scale_x + offset_x
-        ty = y * scale_y + offset_y
-        tz = z_value * scale_z + offset_z
-        actions.append(
-            {
-                "led_intensity": float(led_intensity),
-                "led_rgb": [int(r), int(g), int(b)],  # Use individual circle colors
-                "transform_pos": [float(tx), float(ty), float(tz)],
-            }
-        )
-
-    data: Dict[str, Any] = {
-        "format": "dsj",
-        "show": {
-            "show_name": show_name,
-            "max_scene": int(max_scene),
-            "max_drone": int(max_drone),
-        },
-        "constraints": {
-            "max_speed": float(max_speed),
-            "max_accel": float(max_accel),
-            "min_separation": float(min_separation),
-        },
-        "scenes": [
-            {
-                "scene_number": int(scene_number),
-                "scene_holder": int(scene_holder),
-                **(
-                    {
-                        "scene_size": [
-                            float(scene_size[0]),
-                            float(scene_size[1]),
-                            float(scene_size[2]),
-                        ]
-                    }
-                    if scene_size is not None
-                    else {}
-                ),
-                "action_data": actions,
-            }
-        ],
-    }
-
-    return data
+    """show_exporter.coords_with_colors_to_json (기본 show_name만 다름)"""
+    return show_exporter.coords_with_colors_to_json(
+        coords_with_colors, show_name=show_name, **kwargs
+    )
@@ -0,0 +1,282 @@
+"""
+외부 GCS 서버 WebSocket 클라이언트
+
+내보내기마다 새 연결을 열고 쇼 전체를 보낼 때까지 HTTP 응답을 붙잡아 두지 않도록,
+앱 시작 시 상주 클라이언트를 띄우고 내보내기는 큐에 넣기만 합니다.
+
+- 연결 풀: GCS_CONNECTIONS 개의 워커가 각자 연결 하나를 유지하며 같은 큐에서 꺼내 보냅니다.
+  연결이 끊기면 지수 백오프(+지터)로 다시 연결합니다.
+- bounded 큐: GCS_QUEUE_SIZE 개까지만 대기하며, 가득 차면 enqueue가 False를 반환합니다.
+- 전송: 페이로드를 GCS_CHUNK_SIZE 단위로 나눠 보내고, 연결은 permessage-deflate 압축을 사용합니다.
+  파일 페이로드는 디스크에서 청크 단위로 읽으므로 쇼 전체를 메모리에 올리지 않습니다.
+- 프로토콜 (GCS_PROTOCOL)
+  - "legacy" (기본): 기존 GCS 서버와 같은 형식. 페이로드 하나 = 메시지 하나 (청크는 프레임으로 분할)
+  - "chunked": {"type": "begin"} 텍스트 → 청크마다 바이너리 메시지 → {"type": "end"} 텍스트를 보낸 뒤
+    서버의 {"type": "ack", "id": ..., "ok": true}를 기다립니다. ack가 없거나 ok가 아니면 재시도합니다.
+- 실패한 페이로드는 GCS_MAX_ATTEMPTS 번까지 다시 큐에 넣어 재전송합니다. (재시도는 큐 제한과 무관)
+
+로컬 테스트용 서버: app.services.gcs_standin
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiofiles
+import websockets
+
+from app.utils import jsonio
+
+GCS_WS_URI = os.getenv("GCS_WS_URI", "ws://43.202.17.174:5089/json")
+GCS_PROTOCOL = os.getenv("GCS_PROTOCOL", "legacy")
+GCS_CONNECTIONS = int(os.getenv("GCS_CONNECTIONS", "1"))
+GCS_QUEUE_SIZE = int(os.getenv("GCS_QUEUE_SIZE", "16"))
+GCS_CHUNK_SIZE = int(os.getenv("GCS_CHUNK_SIZE", str(1 << 20)))
+GCS_ACK_TIMEOUT = float(os.getenv("GCS_ACK_TIMEOUT", "30"))
+GCS_MAX_ATTEMPTS = int(os.getenv("GCS_MAX_ATTEMPTS", "3"))
+# deliver_file이 전송 완료를 기다리는 최대 시간 (초, 연결되지 않으면 재연결을 기다리며 계속 대기)
+GCS_DELIVER_TIMEOUT = float(os.getenv("GCS_DELIVER_TIMEOUT", "120"))
+
+PROTOCOLS = ("legacy", "chunked")
+_BACKOFF_START = 0.5
+_BACKOFF_MAX = 30.0
+
+
+@dataclass
+class GCSMessage:
+    """큐에 들어가는 전송 단위. data(메모리) 또는 path(파일) 중 하나를 가집니다."""
+
+    name: str
+    text: bool = True
+    data: Optional[bytes] = field(default=None, repr=False)
+    path: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    # deliver_file로 넣은 항목: 전송 성공(True) / 포기(False) 시 결과가 설정됨
+    done: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def resolve(self, sent: bool) -> None:
+        if self.done is not None and not self.done.done():
+            self.done.set_result(sent)
+
+    async def chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        if self.path is not None:
+            async with aiofiles.open(self.path, "rb") as f:
+                while True:
+                    chunk = await f.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+        else:
+            view = memoryview(self.data or b"")
+            for start in range(0, len(view), chunk_size):
+                yield bytes(view[start : start + chunk_size])
+
+
+class GCSClient:
+    """GCS 서버로의 상주 연결 풀과 전송 큐"""
+
+    def __init__(
+        self,
+        uri: str = GCS_WS_URI,
+        *,
+        protocol: str = GCS_PROTOCOL,
+        connections: int = GCS_CONNECTIONS,
+        queue_size: int = GCS_QUEUE_SIZE,
+        chunk_size: int = GCS_CHUNK_SIZE,
+        ack_timeout: float = GCS_ACK_TIMEOUT,
+        max_attempts: int = GCS_MAX_ATTEMPTS,
+        deliver_timeout: float = GCS_DELIVER_TIMEOUT,
+    ):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown GCS protocol: {protocol}")
+        self.uri = uri
+        self.protocol = protocol
+        self.connections = max(1, connections)
+        self.queue_size = max(1, queue_size)
+        self.chunk_size = max(1, chunk_size)
+        self.ack_timeout = ack_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.deliver_timeout = deliver_timeout
+
+        # 크기 제한은 enqueue에서만 검사합니다. (재시도 항목은 가득 차 있어도 다시 넣음)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._connected = 0
+        self.sent = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "uri": self.uri,
+            "protocol": self.protocol,
+            "running": self.running,
+            "connected": self._connected,
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.connections)
+        ]
+        print(f"GCS client started: {self.uri} ({self.protocol}, {self.connections} conn)")
+
+    async def stop(self) -> None:
+        """워커를 멈춥니다. 큐에 남은 항목은 버립니다."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if not self._queue.empty():
+            print(f"GCS client stopped with {self._queue.qsize()} unsent payloads")
+        while not self._queue.empty():
+            self._queue.get_nowait().resolve(False)
+
+    def enqueue_bytes(self, payload: bytes, *, name: str, text: bool = True) -> bool:
+        """메모리 페이로드를 큐에 넣습니다. 큐가 가득 차면 False"""
+        return self._put(GCSMessage(name=name, text=text, data=payload))
+
+    def enqueue_file(self, path: str, *, name: str, text: bool = True) -> bool:
+        """파일 페이로드를 큐에 넣습니다. (보낼 때 디스크에서 청크 단위로 읽음)"""
+        return self._put(GCSMessage(name=name, text=text, path=str(path)))
+
+    async def deliver_file(self, path: str, *, name: str, text: bool = True) -> bool:
+        """
+        파일 페이로드를 큐에 넣고 전송이 끝날 때까지 기다립니다.
+        전송에 성공하면 True, 큐가 가득 찼거나 재시도 끝에 실패하면 False
+        deliver_timeout 안에 끝나지 않으면 (GCS 서버에 연결할 수 없는 경우 등) False를 반환하고,
+        페이로드는 큐에 남아 연결되면 전송됩니다.
+        """
+        message = GCSMessage(name=name, text=text, path=str(path))
+        message.done = asyncio.get_running_loop().create_future()
+        if not self._put(message):
+            return False
+        try:
+            return await asyncio.wait_for(asyncio.shield(message.done), self.deliver_timeout)
+        except asyncio.TimeoutError:
+            print(f"{message.name} still queued for GCS after {self.deliver_timeout:.0f}s")
+            return False
+
+    def _put(self, message: GCSMessage) -> bool:
+        if self._queue.qsize() >= self.queue_size:
+            self.rejected += 1
+            print(f"GCS queue full; dropping {message.name}")
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    async def _worker(self, index: int) -> None:
+        backoff = _BACKOFF_START
+        while True:
+            try:
+                async with websockets.connect(
+                    self.uri, compression="deflate", max_size=None
+                ) as websocket:
+                    self._connected += 1
+                    backoff = _BACKOFF_START
+                    print(f"GCS connection {index} open: {self.uri}")
+                    try:
+                        await self._serve(websocket)
+                    finally:
+                        self._connected -= 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"GCS connection {index} failed: {e}; retrying in {backoff:.1f}s")
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2.0, _BACKOFF_MAX)
+
+    async def _serve(self, websocket) -> None:
+        while True:
+            message = await self._queue.get()
+            message.attempts += 1
+            try:
+                if self.protocol == "chunked":
+                    await self._send_chunked(websocket, message)
+                else:
+                    await websocket.send(
+                        message.chunks(self.chunk_size), text=message.text
+                    )
+            except asyncio.CancelledError:
+                self._queue.put_nowait(message)
+                raise
+            except Exception as e:
+                self._retry(message, e)
+                if isinstance(e, websockets.ConnectionClosed):
+                    raise
+                continue
+            self.sent += 1
+            message.resolve(True)
+            print(f"Sent {message.name} to GCS ({message.attempts} attempt(s))")
+
+    def _retry(self, message: GCSMessage, error: Exception) -> None:
+        if message.attempts >= self.max_attempts:
+            self.failed += 1
+            message.resolve(False)
+            print(f"Giving up sending {message.name} to GCS: {error}")
+            return
+        print(f"Retrying {message.name} after error: {error}")
+        self._queue.put_nowait(message)
+
+    async def _send_chunked(self, websocket, message: GCSMessage) -> None:
+        begin = {
+            "type": "begin",
+            "id": message.id,
+            "name": message.name,
+            "content_type": "application/json" if message.text else "application/octet-stream",
+        }
+        await websocket.send(jsonio.dumps(begin).decode("utf-8"))
+        size = count = 0
+        async for chunk in message.chunks(self.chunk_size):
+            await websocket.send(chunk)
+            size += len(chunk)
+            count += 1
+        end = {"type": "end", "id": message.id, "size": size, "chunks": count}
+        await websocket.send(jsonio.dumps(end).decode("utf-8"))
+
+        deadline = asyncio.get_running_loop().time() + self.ack_timeout
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise TimeoutError(f"No ack for {message.name}")
+            reply = jsonio.loads(await asyncio.wait_for(websocket.recv(), remaining))
+            if reply.get("type") != "ack" or reply.get("id") != message.id:
+                continue
+            if not reply.get("ok", False):
+                raise RuntimeError(f"GCS rejected {message.name}: {reply.get('error')}")
+            return
+
+
+_client: Optional[GCSClient] = None
+
+
+def get_gcs_client() -> GCSClient:
+    """상주 GCS 클라이언트 (처음 사용할 때 생성, 전송은 start_gcs_client 이후)"""
+    global _client
+    if _client is None:
+        _client = GCSClient()
+    return _client
+
+
+async def start_gcs_client() -> None:
+    await get_gcs_client().start()
+
+
+async def stop_gcs_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.stop()
+        _client = None
@@ -0,0 +1,156 @@
+"""
+로컬 GCS 대역 서버 (개발 / 테스트용)
+
+gcs_client의 두 프로토콜을 모두 받습니다.
+- legacy: 메시지 하나 = 페이로드 하나
+- chunked: begin → 바이너리 청크 → end 를 받아 크기/청크 수를 확인하고 ack를 보냅니다.
+
+    python -m app.services.gcs_standin --port 5089 --out ./gcs_received
+
+    async with GCSStandIn() as server:
+        client = GCSClient(server.uri, protocol="chunked")
+        ...
+        server.received  # [ReceivedPayload, ...]
+"""
+
+import argparse
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from websockets.asyncio.server import serve
+
+from app.utils import jsonio
+
+
+@dataclass
+class ReceivedPayload:
+    name: Optional[str]
+    data: bytes = field(repr=False)
+    text: bool
+    protocol: str
+
+
+class GCSStandIn:
+    """
+    받은 페이로드를 received에 모으고, out_dir이 있으면 파일로도 저장합니다.
+    reject_next > 0이면 그 수만큼 chunked 전송에 ok=false ack를 보냅니다. (재시도 확인용)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        out_dir: Optional[str] = None,
+        reject_next: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.out_dir = out_dir
+        self.reject_next = reject_next
+        self.received: List[ReceivedPayload] = []
+        self._server = None
+
+    @property
+    def uri(self) -> str:
+        return f"ws://{self.host}:{self.port}/json"
+
+    async def start(self) -> "GCSStandIn":
+        self._server = await serve(self._handler, self.host, self.port, max_size=None)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "GCSStandIn":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def _record(self, payload: ReceivedPayload) -> None:
+        self.received.append(payload)
+        print(f"[gcs-standin] received {payload.name or 'payload'} ({len(payload.data)} bytes)")
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            name = os.path.basename(payload.name or f"payload_{len(self.received)}")
+            with open(os.path.join(self.out_dir, name), "wb") as f:
+                f.write(payload.data)
+
+    async def _handler(self, websocket) -> None:
+        transfer: Optional[Dict[str, Any]] = None
+        async for message in websocket:
+            control = _control(message)
+            if control is not None and control["type"] == "begin":
+                transfer = {**control, "chunks": []}
+            elif control is not None and control["type"] == "end":
+                await websocket.send(
+                    jsonio.dumps(self._finish(transfer, control)).decode("utf-8")
+                )
+                transfer = None
+            elif transfer is not None and isinstance(message, bytes):
+                transfer["chunks"].append(message)
+            else:
+                text = isinstance(message, str)
+                data = message.encode("utf-8") if text else message
+                self._record(ReceivedPayload(None, data, text, "legacy"))
+
+    def _finish(
+        self, transfer: Optional[Dict[str, Any]], end: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        ack: Dict[str, Any] = {"type": "ack", "id": end.get("id"), "ok": False}
+        if transfer is None or transfer.get("id") != end.get("id"):
+            ack["error"] = "unexpected end"
+            return ack
+        data = b"".join(transfer["chunks"])
+        if len(data) != end.get("size") or len(transfer["chunks"]) != end.get("chunks"):
+            ack["error"] = "size mismatch"
+            return ack
+        if self.reject_next > 0:
+            self.reject_next -= 1
+            ack["error"] = "rejected by stand-in"
+            return ack
+        self._record(
+            ReceivedPayload(
+                transfer.get("name"),
+                data,
+                transfer.get("content_type") == "application/json",
+                "chunked",
+            )
+        )
+        ack["ok"] = True
+        return ack
+
+
+def _control(message: Any) -> Optional[Dict[str, Any]]:
+    """chunked 프로토콜의 begin / end 제어 메시지이면 dict, 아니면 None"""
+    if not isinstance(message, str) or len(message) > 4096:
+        return None
+    try:
+        data = jsonio.loads(message)
+    except jsonio.JSONDecodeError:
+        return None
+    if isinstance(data, dict) and data.get("type") in ("begin", "end"):
+        return data
+    return None
+
+
+async def _main(host: str, port: int, out_dir: Optional[str]) -> None:
+    async with GCSStandIn(host, port, out_dir=out_dir) as server:
+        print(f"[gcs-standin] listening on {server.uri}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local GCS WebSocket stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5089)
+    parser.add_argument("--out", default=None, help="directory to save payloads")
+    args = parser.parse_args()
+    asyncio.run(_main(args.host, args.port, args.out))
@@ -2,7 +2,10 @@ import os
 import uuid
 import cv2
 import numpy as np
-import json
+
+from app.services.dot_sidecar import content_hash, write_sidecar
+from app.services.fabric_json_service import fabric_data_to_dot_scene
+from app.utils import jsonio
 
 
 def apply_sobel_edge_detection(gray_img, low_threshold, high_threshold):
@@ -329,8 +332,14 @@ def process_image(
     }
 
     # JSON 파일로 저장 (비ASCII 경로 호환)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(fabric_canvas, f, ensure_ascii=False, indent=2)
+    payload = jsonio.dumps(fabric_canvas)
+    with open(output_path, "wb") as f:
+        f.write(payload)
+
+    # 내보내기용 바이너리 사이드카(.dots)도 함께 기록 (JSON 재파싱 없이 바로 변환)
+    write_sidecar(
+        output_path, fabric_data_to_dot_scene(fabric_canvas), content_hash(payload)
+    )
 
     print(f"Saved processed Fabric.js JSON to: {output_path}")
 
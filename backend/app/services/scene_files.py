@@ -0,0 +1,109 @@
+"""
+씬 파일 공유 (씬 복제 / 다른 프로젝트로 연결)
+
+씬 하나에 딸린 파일:
+    originals/{scene_id}.json, originals/{scene_id}.png
+    processed/{scene_id}.json, processed/{scene_id}.dots (사이드카)
+    캔버스 JSON의 압축 변형 (.gz / .br)
+    thumbnails/{scene_id}.png, thumbnails/{scene_id}_{size}.{format}
+
+복제는 내용을 복사하지 않고 새 씬 id 이름으로 하드링크를 만듭니다. (즉시 완료, 추가 저장 공간 없음)
+- 씬 파일을 쓰는 경로(scene_writes, 변환, 썸네일, 압축 변형, 사이드카)는 모두 임시 파일에 쓴 뒤
+  os.replace로 이름을 교체하므로, 한쪽 씬을 편집하면 그 이름만 새 파일을 가리킵니다. (copy-on-write)
+  씬 파일을 제자리에서 덮어쓰는 코드를 추가하면 안 됩니다.
+- 참조 수는 파일 시스템의 링크 수(st_nlink)입니다. 씬을 지울 때 그 씬 id의 이름만 지우면
+  데이터는 마지막 이름이 지워질 때 해제됩니다.
+- 하드링크를 만들 수 없으면 (다른 파일 시스템 등) 복사합니다.
+"""
+
+import asyncio
+import glob
+import os
+import shutil
+import uuid
+from typing import List, Union
+
+from app.config import ORIGINALS_DIR, PROCESSED_DIR, THUMBNAILS_DIR
+from app.services.canvas_patch import discard_canvas
+from app.services.dot_sidecar import sidecar_path_for
+from app.utils.precompressed import variant_paths
+
+SceneId = Union[str, uuid.UUID]
+
+
+def scene_file_paths(scene_id: SceneId) -> List[str]:
+    """씬 id에 딸린 파일 경로 목록 (존재하지 않는 경로 포함)"""
+    scene_id = str(scene_id)
+    original_json = os.path.join(ORIGINALS_DIR, f"{scene_id}.json")
+    processed_json = os.path.join(PROCESSED_DIR, f"{scene_id}.json")
+    paths = [
+        original_json,
+        *variant_paths(original_json),
+        os.path.join(ORIGINALS_DIR, f"{scene_id}.png"),
+        processed_json,
+        *variant_paths(processed_json),
+        sidecar_path_for(processed_json),
+        os.path.join(THUMBNAILS_DIR, f"{scene_id}.png"),
+    ]
+    # 크기별 썸네일 (설정이 바뀌어도 남은 파일까지 포함)
+    paths.extend(
+        path
+        for path in glob.glob(os.path.join(glob.escape(THUMBNAILS_DIR), f"{scene_id}_*.*"))
+        if not path.endswith(".tmp")
+    )
+    return paths
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    tmp_path = f"{dst}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        # 하드링크 불가 (다른 파일 시스템, 권한 등) → 복사 (수정 시각 유지)
+        shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def link_scene_files(src_id: SceneId, dst_id: SceneId) -> List[str]:
+    """
+    src 씬의 파일을 dst 씬 이름으로 하드링크하고 만든 경로 목록을 반환합니다.
+    중간에 실패하면 이미 만든 링크를 지우고 예외를 다시 던집니다.
+    """
+    src_id, dst_id = str(src_id), str(dst_id)
+    created: List[str] = []
+    try:
+        for src in scene_file_paths(src_id):
+            if not os.path.isfile(src):
+                continue
+            directory, filename = os.path.split(src)
+            dst = os.path.join(directory, dst_id + filename[len(src_id):])
+            _link_or_copy(src, dst)
+            created.append(dst)
+    except OSError:
+        for path in created:
+            os.remove(path)
+        raise
+    return created
+
+
+def remove_scene_files(scene_id: SceneId) -> None:
+    """
+    씬 id의 파일 이름을 모두 지웁니다. (없으면 무시)
+    다른 씬과 하드링크로 공유하던 내용은 그 씬 쪽 이름이 남아 있는 동안 유지됩니다.
+    """
+    for path in scene_file_paths(scene_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to remove scene file {path}: {e}")
+
+
+async def delete_scene_files(scene_id: SceneId) -> None:
+    """삭제된 씬의 대기 중인 자동 저장을 버리고 파일 이름을 지웁니다."""
+    await discard_canvas(
+        os.path.join(ORIGINALS_DIR, f"{scene_id}.json"),
+        os.path.join(PROCESSED_DIR, f"{scene_id}.json"),
+    )
+    await asyncio.to_thread(remove_scene_files, scene_id)
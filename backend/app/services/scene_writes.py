@@ -0,0 +1,246 @@
+"""
+씬 캔버스 저장 병합 (autosave write coalescing)
+
+프런트의 자동 저장은 PUT .../originals, .../processed를 짧은 간격으로 반복해서 보냅니다.
+요청마다 파일 전체를 다시 쓰지 않도록, 경로별로 마지막 페이로드만 메모리에 두고
+SCENE_WRITE_INTERVAL_MS 마다 한 번만 디스크에 씁니다.
+
+- 쓰기: 같은 폴더의 임시 파일에 쓴 뒤 os.replace (읽는 쪽이 반쯤 쓰인 파일을 보지 않음)
+  정적 제공용 압축 변형(.gz / .br)을 함께 만들고,
+  processed 저장은 바이너리 사이드카(.dots)도 갱신합니다.
+- 내용이 마지막으로 쓴 것과 같으면(sha256) 쓰기를 건너뜁니다. (같은 경로를 쓰는 중이거나 대기 중이면 비교하지 않음)
+- 쓰기에 실패하면 그 사이 새 페이로드가 들어오지 않은 한 SCENE_WRITE_ATTEMPTS 번까지 다시 시도합니다.
+- 파일을 읽는 서버 경로(내보내기 / 검증)는 읽기 전에 flush()로 대기 중인 쓰기를 내려보내고,
+  파일을 지우거나 다른 경로로 교체하는 쪽은 먼저 discard()를 호출해야 합니다.
+- 경로는 realpath 기준입니다. 정적 파일 제공(/originals, /processed)도 읽기 전에 flush합니다.
+- add_listener(fn): 파일을 실제로 쓴 뒤 fn(path)를 호출합니다. (썸네일 렌더링 예약 등)
+"""
+
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from app.services.dot_sidecar import content_hash, write_sidecar_for_json
+from app.utils.asset_versions import VERSION_LENGTH, remember_version
+from app.utils.precompressed import write_precompressed
+
+SCENE_WRITE_INTERVAL_MS = int(os.getenv("SCENE_WRITE_INTERVAL_MS", "500"))
+SCENE_WRITE_ATTEMPTS = int(os.getenv("SCENE_WRITE_ATTEMPTS", "3"))
+_DIGEST_CACHE_SIZE = 4096
+
+WriteListener = Callable[[str], None]
+
+
+@dataclass
+class PendingWrite:
+    payload: bytes = field(repr=False)
+    digest: str
+    # processed 저장이면 사이드카를 만들 때 다시 파싱하지 않도록 dict도 보관
+    data: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    sidecar: bool = False
+    attempts: int = 0
+    # 쓰는 중에 discard되면 실패해도 다시 시도하지 않음
+    discarded: bool = False
+
+
+def _write_file(path: str, pending: PendingWrite) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(pending.payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    remember_version(path, pending.digest[:VERSION_LENGTH])
+    write_precompressed(path, pending.payload)
+    if pending.sidecar:
+        write_sidecar_for_json(path, pending.payload, pending.data)
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
+
+
+class SceneWriteCoalescer:
+    """경로별 마지막 페이로드를 모아 주기적으로 한 번씩 쓰는 write-behind 버퍼"""
+
+    def __init__(self, interval_ms: int = SCENE_WRITE_INTERVAL_MS):
+        self.interval = max(0, interval_ms) / 1000.0
+        self._pending: Dict[str, PendingWrite] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._due: Dict[str, asyncio.Event] = {}
+        # 경로별 지금 쓰고 있는 페이로드
+        self._writing: Dict[str, PendingWrite] = {}
+        # submit 판단(디스크 해시 비교 → 등록)을 경로별로 순서대로 하기 위한 잠금과 사용 수
+        self._submit_locks: Dict[str, asyncio.Lock] = {}
+        self._submit_users: Dict[str, int] = {}
+        # 경로별 마지막으로 디스크에 쓴 내용의 해시 (LRU)
+        self._digests: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.submitted = 0
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.listeners: List[WriteListener] = []
+
+    def add_listener(self, listener: WriteListener) -> None:
+        self.listeners.append(listener)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "written": self.written,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+    async def submit(
+        self,
+        path: str,
+        payload: bytes,
+        *,
+        data: Optional[Dict[str, Any]] = None,
+        sidecar: bool = False,
+        digest: Optional[str] = None,
+    ) -> bool:
+        """
+        path에 쓸 페이로드를 등록합니다. 쓰기는 interval 안에 백그라운드에서 일어납니다.
+        디스크에 있는 내용과 같아 쓸 필요가 없으면 False를 반환합니다.
+        digest: 호출 측에서 이미 계산한 content_hash(payload)
+        """
+        path = os.path.realpath(path)
+        self.submitted += 1
+        digest = digest or content_hash(payload)
+        # 디스크 해시를 읽는 동안 먼저 온 저장이 등록되지 않은 채 뒤의 저장이 판단하지 않도록
+        # 같은 경로의 submit은 도착 순서대로 판단합니다.
+        async with self._submit_lock(path):
+            # 쓰는 중이거나 대기 중인 경로는 디스크 내용이 곧 바뀌므로 비교하지 않고 다시 씀
+            if path not in self._tasks and digest == await self._flushed_digest(path):
+                self.skipped += 1
+                return False
+            pending = self._pending.get(path)
+            if pending is not None and pending.digest == digest:
+                return True
+
+            self._pending[path] = PendingWrite(payload, digest, data, sidecar)
+            if path not in self._tasks:
+                self._due[path] = asyncio.Event()
+                self._tasks[path] = asyncio.create_task(self._run(path))
+            return True
+
+    @asynccontextmanager
+    async def _submit_lock(self, path: str) -> AsyncIterator[None]:
+        lock = self._submit_locks.setdefault(path, asyncio.Lock())
+        self._submit_users[path] = self._submit_users.get(path, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._submit_users[path] -= 1
+            if not self._submit_users[path]:
+                del self._submit_users[path]
+                del self._submit_locks[path]
+
+    async def flush(self, paths: Optional[Iterable[str]] = None) -> None:
+        """대기 중인 쓰기(paths가 없으면 전부)를 바로 내려보내고 끝날 때까지 기다립니다."""
+        targets = (
+            list(self._tasks)
+            if paths is None
+            else [os.path.realpath(p) for p in paths]
+        )
+        tasks = []
+        for path in targets:
+            task = self._tasks.get(path)
+            if task is not None:
+                self._due[path].set()
+                tasks.append(task)
+        if tasks:
+            await asyncio.gather(*(asyncio.shield(t) for t in tasks))
+
+    async def discard(self, *paths: str) -> None:
+        """
+        대기 중인 쓰기를 버립니다. 파일을 지우거나 다른 방법으로 교체하기 전에 호출합니다.
+        이미 쓰는 중인 항목은 끝날 때까지 기다리며, 기록된 해시도 잊습니다.
+        """
+        for path in map(os.path.realpath, paths):
+            self._pending.pop(path, None)
+            if path in self._writing:
+                self._writing[path].discarded = True
+            task = self._tasks.get(path)
+            if task is not None:
+                self._due[path].set()
+                await asyncio.shield(task)
+            self._digests.pop(path, None)
+
+    async def _run(self, path: str) -> None:
+        due = self._due[path]
+        try:
+            while path in self._pending:
+                try:
+                    await asyncio.wait_for(due.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                due.clear()
+                pending = self._pending.pop(path, None)
+                if pending is None:
+                    break
+                pending.attempts += 1
+                self._writing[path] = pending
+                try:
+                    await asyncio.to_thread(_write_file, path, pending)
+                except Exception as e:
+                    self._digests.pop(path, None)
+                    # 그 사이 새 페이로드가 없으면 다음 주기에 다시 시도
+                    if (
+                        path not in self._pending
+                        and not pending.discarded
+                        and pending.attempts < SCENE_WRITE_ATTEMPTS
+                    ):
+                        self._pending[path] = pending
+                        print(f"Failed to write scene file {path}: {e}; retrying")
+                    else:
+                        self.failed += 1
+                        print(f"Failed to write scene file {path}: {e}")
+                    continue
+                finally:
+                    del self._writing[path]
+                self.written += 1
+                self._remember(path, pending.digest)
+                self._notify(path)
+        finally:
+            del self._tasks[path]
+            del self._due[path]
+
+    def _notify(self, path: str) -> None:
+        for listener in self.listeners:
+            try:
+                listener(path)
+            except Exception as e:
+                print(f"Scene write listener failed for {path}: {e}")
+
+    async def _flushed_digest(self, path: str) -> Optional[str]:
+        if path in self._digests:
+            self._digests.move_to_end(path)
+            return self._digests[path]
+        digest = await asyncio.to_thread(_file_digest, path)
+        self._remember(path, digest)
+        return digest
+
+    def _remember(self, path: str, digest: Optional[str]) -> None:
+        self._digests[path] = digest
+        self._digests.move_to_end(path)
+        while len(self._digests) > _DIGEST_CACHE_SIZE:
+            self._digests.popitem(last=False)
+
+
+scene_writes = SceneWriteCoalescer()
@@ -0,0 +1,220 @@
+"""
+드론쇼 바이너리 형식 (.wshow)
+
+dsj JSON은 드론 수 × 씬 수가 커지면 파일이 매우 크고, Unity는 재생 전에 전체를 파싱해야 합니다.
+바이너리 형식은 np.memmap / mmap으로 연 뒤 원하는 씬의 배열로 바로 이동할 수 있습니다.
+모든 값은 리틀 엔디언입니다.
+
+    [헤더 64바이트]
+    [씬 테이블: SCENE_DTYPE 48바이트 × table_capacity]
+    [메타데이터 UTF-8 JSON: {"format", "show_name"} (meta_offset, meta_length)]
+    [씬 데이터 블록 × scene_count]  (블록 시작은 16바이트 정렬)
+        positions  float32 (N, 3)   transform_pos
+        colors     uint8   (N, 4)   led_rgb + led_intensity (0~1 → 0~255)
+
+씬 테이블에서 scene_count 이후 항목은 사용하지 않습니다. (처리된 파일이 없는 씬은 건너뜀)
+헤더와 씬 테이블은 모든 씬을 쓴 뒤에 기록하므로, 씬을 하나씩 흘려보내며 파일을 만들 수 있습니다.
+"""
+
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+from app.utils import jsonio
+
+SHOW_MAGIC = b"WSHW"
+SHOW_VERSION = 1
+_ALIGN = 16
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("header_size", "<u2"),
+        ("scene_count", "<u4"),
+        ("table_capacity", "<u4"),
+        ("max_scene", "<u4"),
+        ("max_drone", "<u4"),
+        ("max_speed", "<f4"),
+        ("max_accel", "<f4"),
+        ("min_separation", "<f4"),
+        ("meta_length", "<u4"),
+        ("meta_offset", "<u8"),
+        ("padding", "S16"),
+    ]
+)
+assert HEADER_DTYPE.itemsize == 64
+
+SCENE_DTYPE = np.dtype(
+    [
+        ("scene_number", "<u4"),
+        ("scene_holder", "<u4"),
+        ("drones", "<u4"),
+        ("flags", "<u4"),  # bit 0: scene_size 있음
+        ("scene_size", "<f4", (3,)),
+        ("reserved", "<u4"),
+        ("positions_offset", "<u8"),
+        ("colors_offset", "<u8"),
+    ]
+)
+assert SCENE_DTYPE.itemsize == 48
+
+POSITION_DTYPE = np.dtype("<f4")
+_HAS_SCENE_SIZE = 1
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class ShowBinaryWriter:
+    """
+    씬을 순서대로 받아 바이너리 쇼 파일을 씁니다. (파일은 seek 가능해야 함)
+
+        writer = ShowBinaryWriter(f, head, capacity=len(scenes))
+        for scene in scenes:
+            writer.add_scene(scene)
+        writer.finish(max_drone)
+
+    head는 show_json 결과에서 "scenes"를 뺀 것과 같은 모양입니다. (format / show / constraints)
+    """
+
+    def __init__(self, f: BinaryIO, head: Dict[str, Any], capacity: int):
+        self.f = f
+        self.head = head
+        self.table = np.zeros(max(0, capacity), dtype=SCENE_DTYPE)
+        self.count = 0
+
+        self.meta = jsonio.dumps(
+            {"format": head["format"], "show_name": head["show"]["show_name"]}
+        )
+        self.meta_offset = HEADER_DTYPE.itemsize + self.table.nbytes
+        self.f.seek(self.meta_offset)
+        self.f.write(self.meta)
+        self.offset = self.meta_offset + len(self.meta)
+
+    def add_scene(self, scene: ShowScene) -> None:
+        if self.count >= self.table.shape[0]:
+            raise ValueError("More scenes than table capacity")
+        n = len(scene)
+        positions = np.ascontiguousarray(scene.transform_pos, dtype=POSITION_DTYPE)
+        colors = np.empty((n, 4), dtype=np.uint8)
+        colors[:, :3] = np.clip(np.asarray(scene.led_rgb), 0, 255)
+        colors[:, 3] = np.clip(
+            np.rint(np.asarray(scene.led_intensity, dtype=np.float64) * 255.0), 0, 255
+        )
+
+        start = _aligned(self.offset)
+        entry = self.table[self.count]
+        entry["scene_number"] = scene.scene_number
+        entry["scene_holder"] = scene.scene_holder
+        entry["drones"] = n
+        if scene.scene_size is not None:
+            entry["flags"] = _HAS_SCENE_SIZE
+            entry["scene_size"] = scene.scene_size
+        entry["positions_offset"] = start
+        entry["colors_offset"] = start + positions.nbytes
+
+        self.f.seek(start)
+        self.f.write(positions.tobytes())
+        self.f.write(colors.tobytes())
+        self.offset = start + positions.nbytes + colors.nbytes
+        self.count += 1
+
+    def finish(self, max_drone: int) -> None:
+        """헤더와 씬 테이블을 파일 앞부분에 기록합니다."""
+        show = self.head["show"]
+        constraints = self.head["constraints"]
+        header = np.zeros((), dtype=HEADER_DTYPE)
+        header["magic"] = SHOW_MAGIC
+        header["version"] = SHOW_VERSION
+        header["header_size"] = HEADER_DTYPE.itemsize
+        header["scene_count"] = self.count
+        header["table_capacity"] = self.table.shape[0]
+        header["max_scene"] = show["max_scene"]
+        header["max_drone"] = max_drone
+        header["max_speed"] = constraints["max_speed"]
+        header["max_accel"] = constraints["max_accel"]
+        header["min_separation"] = constraints["min_separation"]
+        header["meta_length"] = len(self.meta)
+        header["meta_offset"] = self.meta_offset
+
+        self.f.seek(0)
+        self.f.write(header.tobytes())
+        self.f.write(self.table.tobytes())
+        self.f.flush()
+
+
+@dataclass
+class ShowBinary:
+    """mmap으로 연 바이너리 쇼 파일. scene(i)는 파일을 복사하지 않는 배열 뷰를 반환합니다."""
+
+    header: np.void
+    table: np.ndarray
+    meta: Dict[str, Any]
+    buffer: Union[mmap.mmap, bytes]
+
+    def __len__(self) -> int:
+        return int(self.header["scene_count"])
+
+    def scene_arrays(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(positions float32 (N, 3), led_rgb uint8 (N, 3), led_intensity float32 (N,))"""
+        entry = self.table[index]
+        n = int(entry["drones"])
+        positions = np.frombuffer(
+            self.buffer,
+            dtype=POSITION_DTYPE,
+            count=n * 3,
+            offset=int(entry["positions_offset"]),
+        ).reshape(n, 3)
+        colors = np.frombuffer(
+            self.buffer, dtype=np.uint8, count=n * 4, offset=int(entry["colors_offset"])
+        ).reshape(n, 4)
+        return positions, colors[:, :3], colors[:, 3].astype(np.float32) / 255.0
+
+    def scene(self, index: int) -> ShowScene:
+        entry = self.table[index]
+        positions, rgb, intensity = self.scene_arrays(index)
+        scene_size: Optional[Tuple[float, float, float]] = None
+        if int(entry["flags"]) & _HAS_SCENE_SIZE:
+            scene_size = tuple(float(v) for v in entry["scene_size"])
+        return ShowScene(
+            scene_number=int(entry["scene_number"]),
+            scene_holder=int(entry["scene_holder"]),
+            transform_pos=positions,
+            led_rgb=rgb,
+            led_intensity=intensity,
+            scene_size=scene_size,
+        )
+
+    def scenes(self) -> List[ShowScene]:
+        return [self.scene(i) for i in range(len(self))]
+
+
+def read_show_binary(path: Union[str, os.PathLike]) -> ShowBinary:
+    """바이너리 쇼 파일을 mmap으로 엽니다. (씬 데이터는 접근할 때만 읽힘)"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER_DTYPE.itemsize:
+            raise ValueError(f"Not a show binary file: {path}")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header = np.frombuffer(buffer, dtype=HEADER_DTYPE, count=1)[0]
+    if header["magic"] != SHOW_MAGIC:
+        raise ValueError(f"Not a show binary file: {path}")
+    if int(header["version"]) != SHOW_VERSION:
+        raise ValueError(f"Unsupported show binary version: {int(header['version'])}")
+
+    table = np.frombuffer(
+        buffer,
+        dtype=SCENE_DTYPE,
+        count=int(header["scene_count"]),
+        offset=int(header["header_size"]),
+    )
+    meta_offset = int(header["meta_offset"])
+    meta = jsonio.loads(buffer[meta_offset : meta_offset + int(header["meta_length"])])
+    return ShowBinary(header=header, table=table, meta=meta, buffer=buffer)
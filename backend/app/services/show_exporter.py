@@ -0,0 +1,348 @@
+"""
+드론쇼(dsj) JSON 생성기
+
+SVG 가져오기, Fabric JSON 가져오기, 프로젝트 내보내기가 공통으로 사용합니다.
+좌표 매핑(scale / offset / z)은 도트마다 계산하지 않고 DotScene 배열 전체에 대해
+NumPy 연산으로 한 번에 적용하고, action_data도 배열 단위로 일괄 인코딩합니다.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.dot_scene import DotScene
+from app.utils import jsonio
+
+
+@dataclass(frozen=True)
+class ExportTransform:
+    """개별 씬 변환 파라미터 (DB에 없는 값들, 요청 쿼리로 전달)"""
+
+    z_value: float = 0.0
+    scale_x: float = 1.0
+    scale_y: float = 1.0
+    scale_z: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+    offset_z: float = 0.0
+    led_intensity: float = 1.0
+
+
+def map_positions(positions: np.ndarray, transform: ExportTransform) -> np.ndarray:
+    """(N, 2) 캔버스 좌표 → (N, 3) 쇼 좌표 (transform_pos)"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    out = np.empty((positions.shape[0], 3), dtype=np.float64)
+    out[:, 0] = positions[:, 0] * transform.scale_x + transform.offset_x
+    out[:, 1] = positions[:, 1] * transform.scale_y + transform.offset_y
+    out[:, 2] = transform.z_value * transform.scale_z + transform.offset_z
+    return out
+
+
+_INTENSITY_KEY = b'"led_intensity":'
+_RGB_KEY = b',"led_rgb":['
+_POS_KEY = b'],"transform_pos":['
+
+
+def action_data_bytes(
+    transform_pos: np.ndarray, led_rgb: np.ndarray, led_intensity: np.ndarray
+) -> bytes:
+    """
+    action_data 배열을 JSON bytes로 직접 인코딩합니다.
+    세 배열을 각각 한 번에 직렬화한 뒤 행 단위로 잘라 끼워 맞추므로,
+    드론마다 dict / list / float 객체를 만들지 않습니다.
+    """
+    n = int(np.shape(led_intensity)[0])
+    if n == 0:
+        return b"[]"
+
+    pos = jsonio.dumps(np.ascontiguousarray(transform_pos, dtype=np.float64))
+    rgb = jsonio.dumps(np.ascontiguousarray(led_rgb, dtype=np.int64))
+    inten = jsonio.dumps(np.ascontiguousarray(led_intensity, dtype=np.float64))
+
+    parts: List[bytes] = [b"]},{" + _INTENSITY_KEY] * (6 * n)
+    parts[0] = b"[{" + _INTENSITY_KEY
+    parts[1::6] = inten[1:-1].split(b",")
+    parts[2::6] = [_RGB_KEY] * n
+    parts[3::6] = rgb[2:-2].split(b"],[")
+    parts[4::6] = [_POS_KEY] * n
+    parts[5::6] = pos[2:-2].split(b"],[")
+    parts.append(b"]}]")
+    return b"".join(parts)
+
+
+def action_data(
+    transform_pos: np.ndarray, led_rgb: np.ndarray, led_intensity: np.ndarray
+) -> Any:
+    """
+    배열 세 개로 action_data 값을 만듭니다.
+    orjson을 쓸 수 있으면 미리 인코딩한 JSON 조각(jsonio.fragment)을, 아니면 dict 리스트를 반환합니다.
+    """
+    if jsonio.HAS_FRAGMENT:
+        return jsonio.fragment(action_data_bytes(transform_pos, led_rgb, led_intensity))
+
+    return [
+        {"led_intensity": i, "led_rgb": c, "transform_pos": p}
+        for i, c, p in zip(
+            np.asarray(led_intensity, dtype=np.float64).tolist(),
+            np.asarray(led_rgb, dtype=np.int64).tolist(),
+            np.asarray(transform_pos, dtype=np.float64).tolist(),
+        )
+    ]
+
+
+def _scene_arrays(
+    dot_scene: DotScene,
+    transform: ExportTransform,
+    use_opacity: bool,
+    led_rgb: Optional[Tuple[int, int, int]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """DotScene → (transform_pos, led_rgb, led_intensity) 배열"""
+    n = len(dot_scene)
+    intensity = (
+        dot_scene.opacity
+        if use_opacity
+        else np.full(n, transform.led_intensity, dtype=np.float64)
+    )
+    colors = (
+        np.broadcast_to(np.asarray(led_rgb, dtype=np.int64), (n, 3))
+        if led_rgb is not None
+        else dot_scene.colors
+    )
+    return map_positions(dot_scene.positions, transform), colors, intensity
+
+
+def scene_actions(
+    dot_scene: DotScene,
+    transform: ExportTransform,
+    *,
+    use_opacity: bool = True,
+    led_rgb: Optional[Tuple[int, int, int]] = None,
+) -> Any:
+    """
+    DotScene 하나의 action_data를 생성합니다.
+
+    - use_opacity=True 이면 각 도트의 opacity를, False 이면 transform.led_intensity를 LED 밝기로 사용
+    - led_rgb가 주어지면 모든 도트에 같은 색을 사용
+    """
+    return action_data(*_scene_arrays(dot_scene, transform, use_opacity, led_rgb))
+
+
+@dataclass
+class ShowScene:
+    """
+    쇼 좌표로 변환된 씬 하나 (직렬화 전 배열 상태)
+    배열의 i번째 행이 i번째 드론이므로, 드론 배정처럼 순서를 바꾸는 단계는
+    직렬화 전에 이 배열들을 재정렬합니다.
+    """
+
+    scene_number: int
+    scene_holder: int
+    transform_pos: np.ndarray  # (N, 3) float64
+    led_rgb: np.ndarray  # (N, 3)
+    led_intensity: np.ndarray  # (N,)
+    scene_size: Optional[Tuple[float, float, float]] = None
+
+    def __len__(self) -> int:
+        return int(self.transform_pos.shape[0])
+
+    def reordered(self, order: np.ndarray) -> "ShowScene":
+        """order 순서로 드론(행)을 재배열한 새 ShowScene"""
+        return ShowScene(
+            scene_number=self.scene_number,
+            scene_holder=self.scene_holder,
+            transform_pos=self.transform_pos[order],
+            led_rgb=np.asarray(self.led_rgb)[order],
+            led_intensity=np.asarray(self.led_intensity)[order],
+            scene_size=self.scene_size,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        actions = action_data(self.transform_pos, self.led_rgb, self.led_intensity)
+        return scene_json(self.scene_number, self.scene_holder, actions, self.scene_size)
+
+
+def show_scene(
+    dot_scene: DotScene,
+    transform: ExportTransform,
+    scene_number: int,
+    scene_holder: int,
+    *,
+    use_opacity: bool = True,
+    led_rgb: Optional[Tuple[int, int, int]] = None,
+) -> ShowScene:
+    """DotScene을 쇼 좌표의 ShowScene으로 변환합니다."""
+    positions, colors, intensity = _scene_arrays(
+        dot_scene, transform, use_opacity, led_rgb
+    )
+    return ShowScene(
+        scene_number=int(scene_number),
+        scene_holder=int(scene_holder),
+        transform_pos=positions,
+        led_rgb=colors,
+        led_intensity=intensity,
+        scene_size=dot_scene.size,
+    )
+
+
+def scene_json(
+    scene_number: int,
+    scene_holder: int,
+    actions: Any,
+    scene_size: Optional[Tuple[float, float, float]] = None,
+) -> Dict[str, Any]:
+    """씬 하나의 JSON 객체"""
+    data: Dict[str, Any] = {
+        "scene_number": int(scene_number),
+        "scene_holder": int(scene_holder),
+    }
+    if scene_size is not None:
+        data["scene_size"] = [
+            float(scene_size[0]),
+            float(scene_size[1]),
+            float(scene_size[2]),
+        ]
+    data["action_data"] = actions
+    return data
+
+
+def show_json(
+    scenes: List[Dict[str, Any]],
+    *,
+    show_name: str,
+    max_scene: int,
+    max_drone: int,
+    max_speed: float = 6.0,
+    max_accel: float = 3.0,
+    min_separation: float = 2.0,
+    format: str = "dsj",
+) -> Dict[str, Any]:
+    """쇼 전체 JSON 객체"""
+    return {
+        "format": format,
+        "show": {
+            "show_name": show_name,
+            "max_scene": int(max_scene),
+            "max_drone": int(max_drone),
+        },
+        "constraints": {
+            "max_speed": float(max_speed),
+            "max_accel": float(max_accel),
+            "min_separation": float(min_separation),
+        },
+        "scenes": scenes,
+    }
+
+
+def dot_scene_from_coords(coords: Sequence[Sequence[Any]]) -> DotScene:
+    """
+    [(x, y), ...] 또는 [(x, y, (r, g, b)), ...] / [(x, y, (r, g, b), opacity), ...]
+    형태의 리스트를 DotScene으로 변환합니다.
+    """
+    n = len(coords)
+    if n == 0:
+        return DotScene()
+
+    positions = np.array([(c[0], c[1]) for c in coords], dtype=np.float64)
+    if len(coords[0]) >= 3:
+        colors = np.array([c[2] for c in coords], dtype=np.uint8)
+    else:
+        colors = np.full((n, 3), 255, dtype=np.uint8)
+    if len(coords[0]) >= 4:
+        opacity = np.array([c[3] for c in coords], dtype=np.float64)
+    else:
+        opacity = np.ones(n, dtype=np.float64)
+    return DotScene(positions=positions, colors=colors, opacity=opacity)
+
+
+def coords_to_json(
+    coords: List[Tuple[float, float]],
+    *,
+    show_name: str = "fabric-import",
+    max_scene: int = 1,
+    max_drone: Optional[int] = None,
+    scene_number: int = 1,
+    scene_holder: int = 0,
+    scene_size: Optional[Tuple[float, float, float]] = None,
+    # mapping params
+    z_value: float = 0.0,
+    scale_x: float = 1.0,
+    scale_y: float = 1.0,
+    scale_z: float = 1.0,
+    offset_x: float = 0.0,
+    offset_y: float = 0.0,
+    offset_z: float = 0.0,
+    # visual params
+    led_intensity: float = 1.0,
+    led_rgb: Tuple[int, int, int] = (255, 255, 255),
+    # constraints
+    max_speed: float = 6.0,
+    max_accel: float = 3.0,
+    min_separation: float = 2.0,
+) -> Dict[str, Any]:
+    """
+    Build JSON matching the reference schema using the provided coordinates.
+
+    Each coordinate becomes one action with transform_pos [x,y,z].
+    Scaling and offset are applied (then z_value, scale_z, offset_z for Z).
+    """
+    transform = ExportTransform(
+        z_value, scale_x, scale_y, scale_z, offset_x, offset_y, offset_z, led_intensity
+    )
+    actions = scene_actions(
+        dot_scene_from_coords(coords), transform, use_opacity=False, led_rgb=led_rgb
+    )
+    return show_json(
+        [scene_json(scene_number, scene_holder, actions, scene_size)],
+        show_name=show_name,
+        max_scene=max_scene,
+        max_drone=len(coords) if max_drone is None else max_drone,
+        max_speed=max_speed,
+        max_accel=max_accel,
+        min_separation=min_separation,
+    )
+
+
+def coords_with_colors_to_json(
+    coords_with_colors: List[Tuple[float, float, Tuple[int, int, int]]],
+    *,
+    show_name: str = "fabric-import",
+    max_scene: int = 1,
+    max_drone: Optional[int] = None,
+    scene_number: int = 1,
+    scene_holder: int = 0,
+    scene_size: Optional[Tuple[float, float, float]] = None,
+    # mapping params
+    z_value: float = 0.0,
+    scale_x: float = 1.0,
+    scale_y: float = 1.0,
+    scale_z: float = 1.0,
+    offset_x: float = 0.0,
+    offset_y: float = 0.0,
+    offset_z: float = 0.0,
+    # visual params (default values, will be overridden by individual colors)
+    led_intensity: float = 1.0,
+    # constraints
+    max_speed: float = 6.0,
+    max_accel: float = 3.0,
+    min_separation: float = 2.0,
+) -> Dict[str, Any]:
+    """
+    Build JSON matching the reference schema using the provided coordinates with colors.
+    Each coordinate becomes one action with transform_pos [x,y,z] and individual led_rgb.
+    """
+    transform = ExportTransform(
+        z_value, scale_x, scale_y, scale_z, offset_x, offset_y, offset_z, led_intensity
+    )
+    actions = scene_actions(
+        dot_scene_from_coords(coords_with_colors), transform, use_opacity=False
+    )
+    return show_json(
+        [scene_json(scene_number, scene_holder, actions, scene_size)],
+        show_name=show_name,
+        max_scene=max_scene,
+        max_drone=len(coords_with_colors) if max_drone is None else max_drone,
+        max_speed=max_speed,
+        max_accel=max_accel,
+        min_separation=min_separation,
+    )
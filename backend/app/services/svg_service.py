@@ -5,6 +5,8 @@ from typing import Iterable, List, Tuple, Dict, Any, Optional
 import xml.etree.ElementTree as ET
 from PIL import ImageColor
 
+from app.services import show_exporter
+
 
 def _parse_float(val: Optional[str], default: float = 0.0) -> float:
     if val is None:
@@ -153,138 +155,19 @@ def coords_to_json(
     coords: List[Tuple[float, float]],
     *,
     show_name: str = "svg-import",
-    max_scene: int = 1,
-    max_drone: Optional[int] = None,
-    scene_number: int = 1,
-    scene_holder: int = 0,
-    scene_size: Optional[Tuple[float, float, float]] = None,
-    # mapping params
-    z_value: float = 0.0,
-    scale_x: float = 1.0,
-    scale_y: float = 1.0,
-    scale_z: float = 1.0,
-    offset_x: float = 0.0,
-    offset_y: float = 0.0,
-    offset_z: float = 0.0,
-    # visual params
-    led_intensity: float = 1.0,
-    led_rgb: Tuple[int, int, int] = (255, 255, 255),
-    # constraints
-    max_speed: float = 6.0,
-    max_accel: float = 3.0,
-    min_separation: float = 2.0,
+    **kwargs: Any,
 ) -> Dict[str, Any]:
-    """
-    Build JSON matching the reference schema using the provided coordinates.
-
-    Each coordinate becomes one action with transform_pos [x,y,z].
-    Scaling and offset are applied (then z_value, scale_z, offset_z for Z).
-    """
-    if max_drone is None:
-        max_drone = len(coords)
-
-    actions = []
-    for (x, y) in coords:
-        tx = x * scale_x + offset_x
-        ty = y * scale_y + offset_y
-        tz = z_value * scale_z + offset_z
-        actions.append(
-            {
-                "led_intensity": float(led_intensity),
-                "led_rgb": [int(led_rgb[0]), int(led_rgb[1]), int(led_rgb[2])],
-                "transform_pos": [float(tx), float(ty), float(tz)],
-            }
-        )
-
-    data: Dict[str, Any] = {
-        "format": "dsj",
-        "show": {
-            "show_name": show_name,
-            "max_scene": int(max_scene),
-            "max_drone": int(max_drone),
-        },
-        "constraints": {
-            "max_speed": float(max_speed),
-            "max_accel": float(max_accel),
-            "min_separation": float(min_separation),
-        },
-        "scenes": [
-            {
-                "scene_number": int(scene_number),
-                "scene_holder": int(scene_holder),
-                **({"scene_size": [float(scene_size[0]), float(scene_size[1]), float(scene_size[2])]} if scene_size is not None else {}),
-                "action_data": actions,
-            }
-        ],
-    }
-
-    return data
+    """show_exporter.coords_to_json (기본 show_name만 다름)"""
+    return show_exporter.coords_to_json(coords, show_name=show_name, **kwargs)
 
 
 def coords_with_colors_to_json(
     coords_with_colors: List[Tuple[float, float, Tuple[int, int, int]]],
     *,
     show_name: str = "svg-import",
-    max_scene: int = 1,
-    max_drone: Optional[int] = None,
-    scene_number: int = 1,
-    scene_holder: int = 0,
-    scene_size: Optional[Tuple[float, float, float]] = None,
-    # mapping params
-    z_value: float = 0.0,
-    scale_x: float = 1.0,
-    scale_y: float = 1.0,
-    scale_z: float = 1.0,
-    offset_x: float = 0.0,
-    offset_y: float = 0.0,
-    offset_z: float = 0.0,
-    # visual params (default values, will be overridden by individual colors)
-    led_intensity: float = 1.0,
-    # constraints
-    max_speed: float = 6.0,
-    max_accel: float = 3.0,
-    min_separation: float = 2.0,
+    **kwargs: Any,
 ) -> Dict[str, Any]:
-    """
-    Build JSON matching the reference schema using the provided coordinates with colors.
-    Each coordinate becomes one action with transform_pos [x,y,z] and individual led_rgb.
-    """
-    if max_drone is None:
-        max_drone = len(coords_with_colors)
-
-    actions = []
-    for (x, y, (r, g, b)) in coords_with_colors:
-        tx = x * scale_x + offset_x
-        ty = y * scale_y + offset_y
-        tz = z_value * scale_z + offset_z
-        actions.append(
-            {
-                "led_intensity": float(led_intensity),
-                "led_rgb": [int(r), int(g), int(b)],  # Use individual circle colors
-                "transform_pos": [float(tx), float(ty), float(tz)],
-            }
-        )
-
-    data: Dict[str, Any] = {
-        "format": "dsj",
-        "show": {
-            "show_name": show_name,
-            "max_scene": int(max_scene),
-            "max_drone": int(max_drone),
-        },
-        "constraints": {
-            "max_speed": float(max_speed),
-            "max_accel": float(max_accel),
-            "min_separation": float(min_separation),
-        },
-        "scenes": [
-            {
-                "scene_number": int(scene_number),
-                "scene_holder": int(scene_holder),
-                **({"scene_size": [float(scene_size[0]), float(scene_size[1]), float(scene_size[2])]} if scene_size is not None else {}),
-                "action_data": actions,
-            }
-        ],
-    }
-
-    return data
+    """show_exporter.coords_with_colors_to_json (기본 show_name만 다름)"""
+    return show_exporter.coords_with_colors_to_json(
+        coords_with_colors, show_name=show_name, **kwargs
+    )
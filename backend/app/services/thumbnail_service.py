@@ -0,0 +1,171 @@
+"""
+서버 측 씬 썸네일 렌더링
+
+브라우저가 저장할 때마다 캔버스를 PNG로 래스터화해 올리던 썸네일을, 처리된 도트 배열
+(processed/{scene_id}.json → DotScene, 사이드카 사용)에서 서버가 직접 그립니다.
+
+- 래스터화: 도트마다 반경 안 픽셀의 덮임 비율(안티에일리어싱)을 (N, K) 배열로 한 번에 계산하고
+  np.bincount로 채널별로 더합니다. (LED처럼 겹치면 밝아지는 가산 합성, 검은 배경)
+- 출력: THUMBNAIL_SIZES(긴 변 px) × THUMBNAIL_FORMATS(png / webp)
+    thumbnails/{scene_id}_{size}.{format}
+    thumbnails/{scene_id}.png  (첫 번째 크기, 기존 URL 호환)
+- 실행: 처리된 씬이 저장되면 thumbnail_renderer.schedule()로 예약하고, 전용 스레드 풀에서 그립니다.
+  같은 씬을 그리는 중에 다시 저장되면 끝난 뒤 한 번만 더 그립니다.
+"""
+
+import asyncio
+import io
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+
+import numpy as np
+from PIL import Image, features
+
+from app.config import THUMBNAILS_DIR
+from app.services.dot_scene import DotScene
+from app.services.dot_sidecar import load_dot_scene
+from app.utils.asset_versions import content_version, remember_version
+
+THUMBNAIL_SIZES = tuple(
+    int(size) for size in os.getenv("THUMBNAIL_SIZES", "320,160").split(",") if size
+)
+THUMBNAIL_FORMATS = tuple(
+    fmt
+    for fmt in os.getenv("THUMBNAIL_FORMATS", "png,webp").split(",")
+    if fmt and (fmt != "webp" or features.check("webp"))
+)
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "1"))
+
+# image_service가 만드는 도트의 반지름 (캔버스 px)
+DOT_RADIUS = 2.0
+_MIN_RADIUS_PX = 1.0
+_WEBP_QUALITY = 80
+
+_executor = ThreadPoolExecutor(
+    max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail"
+)
+
+
+def render_dots(dot_scene: DotScene, size: int) -> np.ndarray:
+    """DotScene을 긴 변이 size px인 RGB 이미지 (H, W, 3) uint8로 그립니다."""
+    positions = np.asarray(dot_scene.positions, dtype=np.float64).reshape(-1, 2)
+    width, height = float(dot_scene.width), float(dot_scene.height)
+    if width <= 0 or height <= 0:
+        extent = positions.max(axis=0) + DOT_RADIUS if len(positions) else np.ones(2)
+        width, height = float(max(extent[0], 1.0)), float(max(extent[1], 1.0))
+
+    scale = size / max(width, height)
+    w = max(1, int(round(width * scale)))
+    h = max(1, int(round(height * scale)))
+    image = np.zeros((h * w, 3), dtype=np.float64)
+    if len(positions) == 0:
+        return image.reshape(h, w, 3).astype(np.uint8)
+
+    radius = max(_MIN_RADIUS_PX, DOT_RADIUS * scale)
+    reach = int(np.ceil(radius + 0.5))
+    dy, dx = np.mgrid[-reach : reach + 1, -reach : reach + 1]
+    dx, dy = dx.ravel(), dy.ravel()
+
+    # (N, K): 도트 중심 주변 픽셀과 덮임 비율 (중심 거리 기준 1px 폭의 부드러운 경계)
+    centers = positions * scale
+    base = np.floor(centers).astype(np.int64)
+    px = base[:, 0:1] + dx
+    py = base[:, 1:2] + dy
+    dist = np.hypot(px + 0.5 - centers[:, 0:1], py + 0.5 - centers[:, 1:2])
+    coverage = np.clip(radius + 0.5 - dist, 0.0, 1.0)
+    coverage *= np.asarray(dot_scene.opacity, dtype=np.float64).reshape(-1, 1)
+
+    inside = (coverage > 0) & (px >= 0) & (px < w) & (py >= 0) & (py < h)
+    index = (py * w + px)[inside]
+    weight = coverage[inside]
+    colors = np.asarray(dot_scene.colors, dtype=np.float64).reshape(-1, 3)
+    dot_of = np.broadcast_to(np.arange(len(positions))[:, None], inside.shape)[inside]
+    for channel in range(3):
+        image[:, channel] = np.bincount(
+            index, weights=weight * colors[dot_of, channel], minlength=h * w
+        )
+    return np.clip(np.rint(image), 0, 255).astype(np.uint8).reshape(h, w, 3)
+
+
+def _encode(pixels: np.ndarray, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    image = Image.fromarray(pixels, "RGB")
+    if fmt == "webp":
+        image.save(buffer, format="WEBP", quality=_WEBP_QUALITY)
+    else:
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    remember_version(path, content_version(data))
+
+
+def render_scene_thumbnails(scene_id: str, json_path: str) -> List[str]:
+    """처리된 씬의 썸네일을 모든 크기 / 형식으로 저장하고 파일 이름 목록을 반환합니다."""
+    dot_scene = load_dot_scene(json_path)
+    written = []
+    for index, size in enumerate(THUMBNAIL_SIZES):
+        pixels = render_dots(dot_scene, size)
+        for fmt in THUMBNAIL_FORMATS:
+            data = _encode(pixels, fmt)
+            name = f"{scene_id}_{size}.{fmt}"
+            _write_atomic(os.path.join(THUMBNAILS_DIR, name), data)
+            written.append(name)
+            if index == 0 and fmt == "png":
+                _write_atomic(os.path.join(THUMBNAILS_DIR, f"{scene_id}.png"), data)
+                written.append(f"{scene_id}.png")
+    return written
+
+
+class ThumbnailRenderer:
+    """씬별 썸네일 렌더링 예약 (그리는 중 다시 예약되면 끝난 뒤 한 번 더)"""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._dirty: Set[str] = set()
+        self.rendered = 0
+        self.failed = 0
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "rendering": len(self._tasks),
+            "rendered": self.rendered,
+            "failed": self.failed,
+        }
+
+    def schedule(self, scene_id: str, json_path: str) -> None:
+        scene_id = str(scene_id)
+        if scene_id in self._tasks:
+            self._dirty.add(scene_id)
+            return
+        self._tasks[scene_id] = asyncio.create_task(self._run(scene_id, str(json_path)))
+
+    async def _run(self, scene_id: str, json_path: str) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._dirty.discard(scene_id)
+                try:
+                    await loop.run_in_executor(
+                        _executor, render_scene_thumbnails, scene_id, json_path
+                    )
+                    self.rendered += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    self.failed += 1
+                    print(f"Thumbnail rendering failed for scene {scene_id}: {e}")
+                if scene_id not in self._dirty:
+                    break
+        finally:
+            del self._tasks[scene_id]
+
+
+thumbnail_renderer = ThumbnailRenderer()
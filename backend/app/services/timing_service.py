@@ -0,0 +1,132 @@
+"""
+씬 전환 시간 검증 (max_speed / max_accel)
+
+드론 k가 씬 i의 위치에서 씬 i+1의 위치까지 정지 → 정지로 이동한다고 보고,
+사다리꼴 속도 프로파일(최대 가속 → 최대 속도 순항 → 최대 감속)로 필요한 최소 시간을 구합니다.
+
+    d >= v²/a  : t = d / v + v / a           (최대 속도에 도달)
+    d <  v²/a  : t = 2 * sqrt(d / a)         (삼각형 프로파일)
+
+한 전환의 모든 드론을 배열 연산 한 번으로 계산합니다. 드론 번호는 배열 인덱스이므로,
+드론 배정(assign_drones)을 적용한 씬을 넘겨야 실제 비행 경로와 일치합니다.
+
+씬 사이에 주어진 시간은 (다음 scene_number - 현재 scene_number) * seconds_per_scene 입니다.
+(scene_holder로 비워 둔 씬 번호만큼 시간이 늘어남)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+
+
+def trapezoid_min_time(
+    distances: np.ndarray, max_speed: float, max_accel: float
+) -> np.ndarray:
+    """정지 → 정지 이동에 필요한 최소 시간 (distances와 같은 모양)"""
+    if max_speed <= 0 or max_accel <= 0:
+        raise ValueError("max_speed and max_accel must be positive")
+    d = np.abs(np.asarray(distances, dtype=np.float64))
+    cruise = d >= (max_speed * max_speed) / max_accel
+    return np.where(
+        cruise,
+        d / max_speed + max_speed / max_accel,
+        2.0 * np.sqrt(d / max_accel),
+    )
+
+
+def transition_distances(previous: ShowScene, scene: ShowScene) -> np.ndarray:
+    """두 씬에 모두 있는 드론(공통 인덱스)의 이동 거리"""
+    n = min(len(previous), len(scene))
+    delta = (
+        np.asarray(scene.transform_pos[:n], dtype=np.float64)
+        - np.asarray(previous.transform_pos[:n], dtype=np.float64)
+    )
+    return np.sqrt(np.einsum("ij,ij->i", delta, delta))
+
+
+@dataclass
+class TransitionReport:
+    """씬 하나에서 다음 씬으로의 전환 분석 결과"""
+
+    from_scene: int
+    to_scene: int
+    drone_count: int
+    available_duration: float
+    min_duration: float
+    max_distance: float
+    # 주어진 시간 안에 도착하지 못하는 드론 (필요 시간 내림차순)
+    late_drones: np.ndarray = field(repr=False)
+    late_times: np.ndarray = field(repr=False)
+    late_distances: np.ndarray = field(repr=False)
+
+    @property
+    def feasible(self) -> bool:
+        return self.late_drones.shape[0] == 0
+
+    def to_dict(self, limit: Optional[int] = 20) -> Dict[str, Any]:
+        shown = self.late_drones.shape[0] if limit is None else limit
+        return {
+            "from_scene": self.from_scene,
+            "to_scene": self.to_scene,
+            "drone_count": self.drone_count,
+            "available_duration": self.available_duration,
+            "min_duration": self.min_duration,
+            "max_distance": self.max_distance,
+            "feasible": self.feasible,
+            "infeasible_drones": int(self.late_drones.shape[0]),
+            "slowest": [
+                {"drone": int(i), "distance": float(d), "required_time": float(t)}
+                for i, d, t in zip(
+                    self.late_drones[:shown].tolist(),
+                    self.late_distances[:shown].tolist(),
+                    self.late_times[:shown].tolist(),
+                )
+            ],
+        }
+
+
+def analyze_transition(
+    previous: ShowScene,
+    scene: ShowScene,
+    *,
+    max_speed: float,
+    max_accel: float,
+    seconds_per_scene: float,
+) -> TransitionReport:
+    """previous → scene 전환에 필요한 최소 시간과 시간 안에 도착하지 못하는 드론을 구합니다."""
+    distances = transition_distances(previous, scene)
+    times = trapezoid_min_time(distances, max_speed, max_accel)
+    available = float(
+        max(scene.scene_number - previous.scene_number, 1) * seconds_per_scene
+    )
+
+    late = np.flatnonzero(times > available)
+    late = late[np.argsort(-times[late], kind="stable")]
+    return TransitionReport(
+        from_scene=previous.scene_number,
+        to_scene=scene.scene_number,
+        drone_count=int(distances.shape[0]),
+        available_duration=available,
+        min_duration=float(times.max()) if times.size else 0.0,
+        max_distance=float(distances.max()) if distances.size else 0.0,
+        late_drones=late,
+        late_times=times[late],
+        late_distances=distances[late],
+    )
+
+
+def timing_summary(
+    reports: List[TransitionReport], limit: Optional[int] = 20
+) -> Dict[str, Any]:
+    """모든 전환의 요약. transitions에는 전환마다 최소 시간과 늦는 드론 상위 limit 개가 들어갑니다."""
+    infeasible = [report for report in reports if not report.feasible]
+    return {
+        "feasible": not infeasible,
+        "transitions_checked": len(reports),
+        "infeasible_transitions": len(infeasible),
+        "min_total_duration": float(sum(report.min_duration for report in reports)),
+        "transitions": [report.to_dict(limit=limit) for report in reports],
+    }
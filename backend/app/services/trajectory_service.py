@@ -0,0 +1,242 @@
+"""
+드론쇼 궤적 샘플링
+
+내보내기 파이프라인의 씬(ShowScene, 배정 적용)을 키프레임으로 보고, 모든 드론의 위치를
+hz 간격으로 샘플링한 (T, N, 3) float32 배열을 청크 단위로 생성합니다.
+
+- 키프레임 시각: (scene_number - 첫 scene_number) * seconds_per_scene
+- 전환 구간: 각 드론은 직선 경로를 따라 사다리꼴 속도 프로파일(정지 → 정지)로 이동하며,
+  다음 키프레임 시각에 정확히 도착하도록 순항 속도를 정합니다.
+  (max_accel로 시간 안에 도착할 수 없으면 필요한 만큼 가속도를 높여 도착 시각을 맞추며,
+  그런 전환은 timing_service가 infeasible로 보고합니다.)
+- 씬에 없는 드론(씬마다 드론 수가 다를 때)의 위치는 NaN입니다. 다음 씬에서 빠지는 드론은
+  전환 구간 동안 제자리에 머뭅니다.
+
+바이너리(.traj) 형식: 32바이트 헤더 + float32 (T, N, 3) 리틀 엔디언 프레임
+HTTP로 내려받은 파일은 np.memmap으로 그대로 열 수 있습니다. (read_trajectory)
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+
+TRAJECTORY_MAGIC = b"WTRJ"
+TRAJECTORY_VERSION = 1
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("reserved", "<u2"),
+        ("hz", "<f4"),
+        ("start_time", "<f4"),
+        ("frames", "<u4"),
+        ("drones", "<u4"),
+        ("padding", "S8"),
+    ]
+)
+assert HEADER_DTYPE.itemsize == 32
+
+FRAME_DTYPE = np.dtype("<f4")
+
+
+@dataclass(frozen=True)
+class TrajectoryPlan:
+    """샘플링 전에 알 수 있는 궤적 크기 (헤더에 기록)"""
+
+    hz: float
+    keyframe_times: Tuple[float, ...]
+    drones: int
+
+    @property
+    def duration(self) -> float:
+        if not self.keyframe_times:
+            return 0.0
+        return self.keyframe_times[-1] - self.keyframe_times[0]
+
+    @property
+    def frames(self) -> int:
+        if not self.keyframe_times:
+            return 0
+        return int(np.floor(self.duration * self.hz + 1e-9)) + 1
+
+    def header_bytes(self) -> bytes:
+        header = np.zeros((), dtype=HEADER_DTYPE)
+        header["magic"] = TRAJECTORY_MAGIC
+        header["version"] = TRAJECTORY_VERSION
+        header["hz"] = self.hz
+        header["start_time"] = self.keyframe_times[0] if self.keyframe_times else 0.0
+        header["frames"] = self.frames
+        header["drones"] = self.drones
+        return header.tobytes()
+
+
+def keyframe_times(
+    scene_numbers: Iterable[int], seconds_per_scene: float
+) -> Tuple[float, ...]:
+    """키프레임 시각: (scene_number - 첫 scene_number) * seconds_per_scene"""
+    numbers = list(scene_numbers)
+    if not numbers:
+        return ()
+    first = numbers[0]
+    return tuple(float((n - first) * seconds_per_scene) for n in numbers)
+
+
+def pad_positions(positions: np.ndarray, drones: int) -> np.ndarray:
+    """(n, 3) → (drones, 3), 없는 드론은 NaN"""
+    out = np.full((drones, 3), np.nan, dtype=np.float64)
+    n = min(drones, positions.shape[0])
+    out[:n] = positions[:n]
+    return out
+
+
+def sample_transition(
+    start: np.ndarray,
+    end: np.ndarray,
+    duration: float,
+    times: np.ndarray,
+    max_accel: float,
+) -> np.ndarray:
+    """
+    start → end 전환 구간 안의 times(구간 시작 기준 초) 시각의 위치 (len(times), N, 3)
+    각 드론은 duration에 정확히 도착하는 사다리꼴 프로파일을 따릅니다.
+    """
+    t = np.clip(np.asarray(times, dtype=np.float64), 0.0, max(duration, 0.0))[:, None]
+    if duration <= 0:
+        return np.broadcast_to(end, (t.shape[0],) + end.shape).copy()
+
+    # 다음 씬에 없는 드론은 구간 동안 제자리에 머물고,
+    # 이전 씬에 없던 드론은 다음 키프레임까지 NaN으로 남습니다.
+    end = np.where(np.isnan(end), start, end)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _sample(start, end, duration, t, max_accel)
+
+
+def transition_profile(
+    start: np.ndarray, end: np.ndarray, duration: float, max_accel: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    드론별 사다리꼴 프로파일 파라미터 (dist, accel, cruise, t_acc)
+    duration 안에 도착하기 위한 최소 가속도 4d/D²가 max_accel보다 크면 그 값을 사용합니다.
+    cruise는 해당 드론의 최고 속도입니다.
+    """
+    delta = end - start
+    dist = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    accel = np.maximum(max_accel, 4.0 * np.nan_to_num(dist) / (duration * duration))
+    disc = np.maximum(accel * accel * duration * duration - 4.0 * accel * dist, 0.0)
+    cruise = (accel * duration - np.sqrt(disc)) / 2.0
+    t_acc = np.where(accel > 0, cruise / accel, 0.0)
+    return dist, accel, cruise, t_acc
+
+
+def profile_fraction(
+    dist: np.ndarray,
+    accel: np.ndarray,
+    cruise: np.ndarray,
+    t_acc: np.ndarray,
+    duration: float,
+    t: np.ndarray,
+) -> np.ndarray:
+    """시각 t에서 이동한 거리의 비율 (0~1). 모든 인자는 브로드캐스트됩니다."""
+    s = np.where(
+        t < t_acc,
+        0.5 * accel * t * t,
+        np.where(
+            t <= duration - t_acc,
+            0.5 * accel * t_acc * t_acc + cruise * (t - t_acc),
+            dist - 0.5 * accel * (duration - t) ** 2,
+        ),
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.clip(np.where(dist > 0, s / dist, 1.0), 0.0, 1.0)
+
+
+def _sample(
+    start: np.ndarray, end: np.ndarray, duration: float, t: np.ndarray, max_accel: float
+) -> np.ndarray:
+    dist, accel, cruise, t_acc = transition_profile(start, end, duration, max_accel)
+    fraction = profile_fraction(
+        dist[None, :], accel[None, :], cruise[None, :], t_acc[None, :], duration, t
+    )
+    return start[None, :, :] + fraction[:, :, None] * (end - start)[None, :, :]
+
+
+class TrajectorySampler:
+    """
+    씬(키프레임)을 순서대로 받아 (frames, N, 3) float32 청크를 차례로 생성합니다.
+    동시에 메모리에 있는 것은 직전/현재 씬과 청크 하나뿐입니다.
+
+        sampler = TrajectorySampler(plan, max_accel)
+        for scene in scenes:
+            for chunk in sampler.add_keyframe(scene): ...
+        for chunk in sampler.finish(): ...
+    """
+
+    def __init__(
+        self, plan: TrajectoryPlan, max_accel: float, chunk_frames: int = 256
+    ):
+        self.plan = plan
+        self.max_accel = max_accel
+        self.chunk_frames = max(1, chunk_frames)
+        self.next_frame = 0
+        self._index = 0
+        self._previous = None
+
+    def add_keyframe(self, scene: ShowScene) -> Iterator[np.ndarray]:
+        """직전 키프레임 → scene 구간의 프레임 청크를 생성합니다."""
+        plan = self.plan
+        times = plan.keyframe_times
+        if self._index >= len(times):
+            raise ValueError("More keyframes than planned")
+        current = pad_positions(
+            np.asarray(scene.transform_pos, dtype=np.float64), plan.drones
+        )
+        index, previous = self._index, self._previous
+        self._index += 1
+        self._previous = current
+        if previous is None:
+            return
+
+        seg_start, seg_end = times[index - 1], times[index]
+        # 이 구간에 속하는 프레임: seg_start <= t_k < seg_end
+        last = min(int(np.ceil((seg_end - times[0]) * plan.hz - 1e-9)), plan.frames)
+        while self.next_frame < last:
+            stop = min(self.next_frame + self.chunk_frames, last)
+            offsets = times[0] + np.arange(self.next_frame, stop) / plan.hz - seg_start
+            self.next_frame = stop
+            yield sample_transition(
+                previous, current, seg_end - seg_start, offsets, self.max_accel
+            ).astype(FRAME_DTYPE)
+
+    def finish(self) -> Iterator[np.ndarray]:
+        """마지막 키프레임 시각의 프레임 (씬이 하나뿐이면 그 씬의 정지 프레임)"""
+        if self._previous is None:
+            return
+        while self.next_frame < self.plan.frames:
+            count = min(self.chunk_frames, self.plan.frames - self.next_frame)
+            self.next_frame += count
+            yield np.broadcast_to(
+                self._previous, (count,) + self._previous.shape
+            ).astype(FRAME_DTYPE)
+
+
+def read_trajectory(path: Union[str, os.PathLike]) -> Tuple[np.void, np.memmap]:
+    """.traj 파일을 (헤더, (T, N, 3) float32 memmap)으로 엽니다."""
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if header.shape[0] != 1 or header[0]["magic"] != TRAJECTORY_MAGIC:
+        raise ValueError(f"Not a trajectory file: {path}")
+    header = header[0]
+    if int(header["version"]) != TRAJECTORY_VERSION:
+        raise ValueError(f"Unsupported trajectory version: {int(header['version'])}")
+    frames = np.memmap(
+        path,
+        dtype=FRAME_DTYPE,
+        mode="r",
+        offset=HEADER_DTYPE.itemsize,
+        shape=(int(header["frames"]), int(header["drones"]), 3),
+    )
+    return header, frames
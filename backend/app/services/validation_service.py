@@ -0,0 +1,197 @@
+"""
+드론 간 최소 간격(min_separation) 검증
+
+균일 격자 공간 해시로 min_separation보다 가까운 모든 드론 쌍을 찾습니다.
+- 격자 한 칸의 크기를 min_separation 이상으로 잡으면, 가까운 쌍은 항상 같은 칸이나
+  바로 옆 칸(3x3x3 이웃)에 있습니다.
+- 점들을 칸 번호로 정렬한 뒤, 이웃 칸마다 searchsorted로 후보 구간을 한 번에 찾으므로
+  후보 쌍 생성과 거리 계산이 모두 배열 연산입니다. (점 수에 대해 거의 선형)
+- 같은 쌍을 두 번 검사하지 않도록 이웃 칸은 절반(13개 + 자기 칸)만 봅니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+
+# 자기 칸을 제외한 26개 이웃 중 사전순으로 양수인 13개 (반대 방향은 상대 점에서 검사됨)
+_HALF_OFFSETS = [(0, 0, 0)] + [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+# 한 번에 만드는 후보 쌍의 최대 개수 (메모리 상한)
+_MAX_CANDIDATES = 4_000_000
+# 격자 축당 최대 칸 수 (칸 번호가 int64 범위를 넘지 않도록)
+_MAX_CELLS_PER_AXIS = 1 << 20
+
+
+def find_close_pairs(
+    positions: np.ndarray, min_distance: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    min_distance보다 가까운 모든 점 쌍을 찾습니다.
+
+    positions: (N, 2) 또는 (N, 3)
+    반환: (pairs (K, 2) int64, i < j / distances (K,) float64), 거리 오름차순
+    """
+    pts = np.asarray(positions, dtype=np.float64)
+    if pts.ndim != 2:
+        raise ValueError("positions must be a 2D array")
+    if pts.shape[1] == 2:
+        pts = np.column_stack([pts, np.zeros(pts.shape[0])])
+
+    n = pts.shape[0]
+    empty = (np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.float64))
+    if n < 2 or min_distance <= 0:
+        return empty
+
+    origin = pts.min(axis=0)
+    extent = float((pts.max(axis=0) - origin).max())
+    # 칸이 min_distance보다 크면 검사 후보만 늘 뿐 결과는 같으므로, 범위가 넓으면 칸을 키웁니다.
+    cell_size = max(float(min_distance), extent / (_MAX_CELLS_PER_AXIS - 3))
+
+    # 이웃 칸 번호가 음수가 되지 않도록 1칸씩 여유를 둡니다.
+    cells = np.floor((pts - origin) / cell_size).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    sorted_pts = pts[order]
+
+    limit_sq = float(min_distance) ** 2
+    found_i: List[np.ndarray] = []
+    found_j: List[np.ndarray] = []
+    found_d: List[np.ndarray] = []
+
+    for dx, dy, dz in _HALF_OFFSETS:
+        shift = (dx * dims[1] + dy) * dims[2] + dz
+        neighbor = sorted_keys + shift
+        lo = np.searchsorted(sorted_keys, neighbor, side="left")
+        hi = np.searchsorted(sorted_keys, neighbor, side="right")
+        if shift == 0:
+            # 같은 칸에서는 자기 뒤의 점들만 (i < j)
+            lo = np.maximum(lo, np.arange(n) + 1)
+        counts = np.maximum(hi - lo, 0)
+
+        # 후보 수가 많은 경우(점이 한 칸에 몰린 경우)를 대비해 구간별로 나누어 처리
+        cumulative = np.cumsum(counts)
+        start = 0
+        while start < n:
+            base = cumulative[start - 1] if start else 0
+            stop = int(np.searchsorted(cumulative, base + _MAX_CANDIDATES, side="right"))
+            stop = min(max(stop, start + 1), n)
+            block_counts = counts[start:stop]
+            total = int(block_counts.sum())
+            if total:
+                i = np.repeat(np.arange(start, stop), block_counts)
+                first = np.cumsum(block_counts) - block_counts
+                j = lo[i] + (np.arange(total) - np.repeat(first, block_counts))
+                diff = sorted_pts[i] - sorted_pts[j]
+                d2 = np.einsum("ij,ij->i", diff, diff)
+                close = d2 < limit_sq
+                if close.any():
+                    found_i.append(i[close])
+                    found_j.append(j[close])
+                    found_d.append(np.sqrt(d2[close]))
+            start = stop
+
+    if not found_i:
+        return empty
+
+    a = order[np.concatenate(found_i)]
+    b = order[np.concatenate(found_j)]
+    distances = np.concatenate(found_d)
+    pairs = np.column_stack([np.minimum(a, b), np.maximum(a, b)])
+    by_distance = np.argsort(distances, kind="stable")
+    return pairs[by_distance], distances[by_distance]
+
+
+@dataclass
+class SeparationReport:
+    """씬 하나의 최소 간격 검증 결과"""
+
+    scene_number: int
+    drone_count: int
+    min_separation: float
+    pairs: np.ndarray = field(repr=False)
+    distances: np.ndarray = field(repr=False)
+    # (K, 2, 3) 위반 쌍의 좌표 (씬 전체 좌표는 보관하지 않음)
+    pair_positions: np.ndarray = field(repr=False)
+    scene_id: Optional[str] = None
+
+    @property
+    def violation_count(self) -> int:
+        return int(self.distances.shape[0])
+
+    @property
+    def valid(self) -> bool:
+        return self.violation_count == 0
+
+    def to_dict(self, limit: Optional[int] = 100) -> Dict[str, Any]:
+        """가까운 쌍부터 limit 개까지 좌표와 함께 반환합니다. (limit=None 이면 전부)"""
+        shown = self.violation_count if limit is None else min(limit, self.violation_count)
+        pairs = self.pairs[:shown]
+        pos_a = self.pair_positions[:shown, 0].tolist()
+        pos_b = self.pair_positions[:shown, 1].tolist()
+        violations = [
+            {
+                "drone_a": int(a),
+                "drone_b": int(b),
+                "distance": float(d),
+                "pos_a": pa,
+                "pos_b": pb,
+            }
+            for (a, b), d, pa, pb in zip(
+                pairs.tolist(), self.distances[:shown].tolist(), pos_a, pos_b
+            )
+        ]
+        return {
+            "scene_id": self.scene_id,
+            "scene_number": self.scene_number,
+            "drone_count": self.drone_count,
+            "min_separation": self.min_separation,
+            "valid": self.valid,
+            "violation_count": self.violation_count,
+            "closest_distance": (
+                float(self.distances[0]) if self.violation_count else None
+            ),
+            "violations": violations,
+            "truncated": shown < self.violation_count,
+        }
+
+
+def validate_separation(
+    scene: ShowScene, min_separation: float, scene_id: Optional[str] = None
+) -> SeparationReport:
+    """쇼 좌표(transform_pos) 기준으로 씬의 최소 간격 위반 쌍을 찾습니다."""
+    pairs, distances = find_close_pairs(scene.transform_pos, min_separation)
+    return SeparationReport(
+        scene_number=scene.scene_number,
+        drone_count=len(scene),
+        min_separation=float(min_separation),
+        pairs=pairs,
+        distances=distances,
+        pair_positions=np.asarray(scene.transform_pos)[pairs],
+        scene_id=scene_id,
+    )
+
+
+def validation_summary(
+    reports: List[SeparationReport], limit: Optional[int] = 100
+) -> Dict[str, Any]:
+    """여러 씬의 검증 결과 요약. 위반이 있는 씬만 상세 목록(scenes)에 포함합니다."""
+    invalid = [report for report in reports if not report.valid]
+    return {
+        "valid": not invalid,
+        "scenes_checked": len(reports),
+        "invalid_scenes": len(invalid),
+        "violation_count": sum(report.violation_count for report in invalid),
+        "scenes": [report.to_dict(limit=limit) for report in invalid],
+    }
@@ -0,0 +1,76 @@
+"""
+정적 파일(씬 캔버스 / 썸네일 / 내보내기) 내용 버전
+
+버전은 파일 내용 sha256의 앞 VERSION_LENGTH 자리입니다. (캔버스 PATCH의 base_version과 같은 값)
+- 강한 ETag: "<version>" (압축 변형은 "<version>-gzip" / "<version>-br")
+- 버전 URL: /processed/{scene_id}.json?v=<version> → 내용이 그 버전이면 Cache-Control: immutable
+
+버전은 (경로, 수정 시각, 크기)별로 메모리에 기억합니다. 파일을 쓰는 쪽이 remember_version으로
+미리 알려 주면 요청 처리 중에 파일을 다시 해시하지 않습니다.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+VERSION_LENGTH = 16
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+_CACHE_SIZE = 4096
+
+# realpath → (st_mtime_ns, st_size, version)
+_versions: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_version(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:VERSION_LENGTH]
+
+
+def remember_version(
+    path: str, version: str, stat_result: Optional[os.stat_result] = None
+) -> None:
+    """방금 쓴 파일의 버전을 기록합니다. (stat_result가 없으면 지금 stat)"""
+    key = os.path.realpath(path)
+    if stat_result is None:
+        stat_result = os.stat(key)
+    with _lock:
+        _versions[key] = (stat_result.st_mtime_ns, stat_result.st_size, version)
+        _versions.move_to_end(key)
+        while len(_versions) > _CACHE_SIZE:
+            _versions.popitem(last=False)
+
+
+def file_version(path: str, stat_result: Optional[os.stat_result] = None) -> str:
+    """파일 내용 버전. 기억한 값이 현재 파일(수정 시각 / 크기)과 맞지 않으면 다시 해시합니다."""
+    key = os.path.realpath(path)
+    if stat_result is None:
+        stat_result = os.stat(key)
+    with _lock:
+        cached = _versions.get(key)
+    if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(key, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    version = digest.hexdigest()[:VERSION_LENGTH]
+    remember_version(key, version, stat_result)
+    return version
+
+
+def versioned_url(url: str, version: str) -> str:
+    """/processed/{scene_id}.json → /processed/{scene_id}.json?v=<version>"""
+    return f"{url}?v={version}"
+
+
+def etag_matches(if_none_match: str, version: str) -> bool:
+    """If-None-Match의 태그 중 하나가 같은 내용 버전이면 True (압축 변형 태그 포함)"""
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag == "*" or tag.split("-", 1)[0] == version:
+            return True
+    return False
@@ -0,0 +1,97 @@
+"""
+JSON 직렬화 유틸리티
+
+모든 JSON 입출력은 이 모듈을 거칩니다.
+- orjson이 설치되어 있으면 orjson을, 없으면 표준 json 모듈을 사용합니다.
+- 기본 출력은 공백 없는 compact 형식입니다. (indent=True 로 사람이 읽기 쉬운 형식)
+- dumps()는 bytes를 반환하고, loads()는 bytes/str 모두 받습니다.
+"""
+
+import datetime
+import json
+import os
+import uuid
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스이므로 하나로 처리합니다.
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# 이미 직렬화된 JSON 조각을 다시 파싱하지 않고 그대로 끼워 넣을 수 있는지 여부
+HAS_FRAGMENT = orjson is not None and hasattr(orjson, "Fragment")
+
+
+def _default(obj: Any) -> Any:
+    """표준 json이 직렬화하지 못하는 타입(numpy, uuid, datetime)을 변환합니다."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        # numpy 배열 및 numpy 스칼라
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """객체를 UTF-8 JSON bytes로 직렬화합니다."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    else:
+        text = json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), default=_default
+        )
+    return text.encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """JSON bytes(또는 str)를 파이썬 객체로 역직렬화합니다."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def fragment(payload: bytes) -> Any:
+    """
+    직렬화된 JSON bytes를 dumps() 결과에 그대로 포함시키는 값으로 감쌉니다.
+    orjson.Fragment를 쓸 수 없는 환경에서는 파싱한 객체를 반환합니다.
+    """
+    if HAS_FRAGMENT:
+        return orjson.Fragment(payload)
+    return loads(payload)
+
+
+def load_file(path: Union[str, os.PathLike]) -> Any:
+    """JSON 파일을 읽어 파이썬 객체로 반환합니다."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_file(path: Union[str, os.PathLike], obj: Any, *, indent: bool = False) -> None:
+    """파이썬 객체를 JSON 파일로 저장합니다."""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
+
+
+class JSONIOResponse(JSONResponse):
+    """jsonio 백엔드로 직렬화하는 FastAPI 기본 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,227 @@
+"""
+미리 압축한 정적 파일 저장 / 제공
+
+씬 캔버스와 내보내기 JSON은 수 MB의 텍스트라 압축률이 높지만, 요청마다 압축하면 CPU를 씁니다.
+파일을 쓸 때 같은 폴더에 {파일}.gz (brotli가 설치되어 있으면 {파일}.br도)를 함께 만들어 두고,
+PrecompressedStaticFiles가 Accept-Encoding에 맞는 변형을 그대로 보냅니다. (요청 시 압축 없음)
+
+- 변형은 원본보다 수정 시각이 같거나 늦을 때만 사용합니다. (원본만 바뀐 경우 원본 제공)
+- PRECOMPRESS_MIN_SIZE 바이트보다 작은 파일은 압축하지 않습니다.
+- 압축 변형을 가질 수 있는 파일(COMPRESSIBLE_EXTENSIONS)은 항상 Vary: Accept-Encoding을 붙입니다.
+- ETag / Last-Modified / 버전 URL 캐싱은 asset_versions를 따릅니다. (변형의 ETag는 "<version>-<인코딩>")
+"""
+
+import gzip
+import mimetypes
+import os
+import stat
+import uuid
+from email.utils import formatdate
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.utils.asset_versions import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    file_version,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 미설치 환경
+    brotli = None
+
+PRECOMPRESS_MIN_SIZE = int(os.getenv("PRECOMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("PRECOMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("PRECOMPRESS_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_EXTENSIONS = (".json", ".svg")
+
+# 선호 순서 (앞쪽 우선)
+_ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+
+def _compress(encoding: str, payload: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        # mtime=0: 같은 내용이면 같은 결과 (ETag가 내용에만 의존)
+        return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(payload, quality=BROTLI_QUALITY)
+    return None
+
+
+def variant_path(path: str, encoding: str) -> str:
+    return str(path) + dict(_ENCODINGS)[encoding]
+
+
+def variant_paths(path: str) -> List[str]:
+    """path에 생길 수 있는 압축 변형 경로 전부 (.br / .gz)"""
+    return [variant_path(path, encoding) for encoding, _ in _ENCODINGS]
+
+
+def remove_precompressed(path: str) -> None:
+    """path의 압축 변형을 삭제합니다. (없으면 무시)"""
+    for variant in variant_paths(path):
+        try:
+            os.remove(variant)
+        except FileNotFoundError:
+            pass
+
+
+def write_precompressed(path: str, payload: Optional[bytes] = None) -> None:
+    """
+    방금 쓴 path의 압축 변형을 만듭니다. payload가 없으면 파일을 다시 읽습니다.
+    원본을 모두 쓴 뒤에 호출해야 합니다. (변형의 수정 시각이 원본보다 늦어야 사용됨)
+    """
+    path = str(path)
+    if payload is None:
+        with open(path, "rb") as f:
+            payload = f.read()
+    if len(payload) < PRECOMPRESS_MIN_SIZE:
+        remove_precompressed(path)
+        return
+
+    for encoding, _ in _ENCODINGS:
+        compressed = _compress(encoding, payload)
+        if compressed is None:
+            continue
+        out_path = variant_path(path, encoding)
+        tmp_path = f"{out_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, out_path)
+
+
+def _accepted_encodings(header: str) -> set:
+    """Accept-Encoding에서 q=0이 아닌 인코딩 집합"""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+
+def find_variant(
+    full_path: str, stat_result: os.stat_result, accept_encoding: str
+) -> Optional[Tuple[str, str, os.stat_result]]:
+    """(인코딩, 변형 경로, 변형 stat) 또는 None"""
+    if not accept_encoding or not str(full_path).endswith(COMPRESSIBLE_EXTENSIONS):
+        return None
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding, _ in _ENCODINGS:
+        if encoding not in accepted and "*" not in accepted:
+            continue
+        path = variant_path(full_path, encoding)
+        try:
+            variant_stat = os.stat(path)
+        except OSError:
+            continue
+        if variant_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+            return encoding, path, variant_stat
+    return None
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    미리 압축한 변형(.br / .gz)이 있으면 Content-Encoding과 함께 보내는 StaticFiles
+
+    - ETag는 파일 내용 버전(asset_versions)이라, 저장 응답의 version으로 바로 조건부 요청 가능
+    - ?v=<현재 버전> 요청은 Cache-Control: immutable, 그 외에는 no-cache (ETag로 재검증)
+    - before_read(paths): 파일을 읽기 전에 호출할 비동기 함수 (대기 중인 자동 저장 flush 등)
+    """
+
+    def __init__(
+        self,
+        *args,
+        before_read: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.before_read = before_read
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if self.directory is not None:
+            directory = os.path.realpath(self.directory)
+            full_path = os.path.realpath(os.path.join(directory, path))
+            if os.path.commonpath([full_path, directory]) == directory:
+                if self.before_read is not None:
+                    await self.before_read([full_path])
+                # 버전 계산(필요하면 파일 해시)을 이벤트 루프 밖에서 미리 해 둠
+                await anyio.to_thread.run_sync(_prime_version, full_path)
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        version = file_version(str(full_path), stat_result)
+        requested = QueryParams(scope.get("query_string", b"")).get("v")
+        headers = {
+            "ETag": f'"{version}"',
+            "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "Cache-Control": (
+                IMMUTABLE_CACHE_CONTROL
+                if requested == version
+                else REVALIDATE_CACHE_CONTROL
+            ),
+        }
+
+        path, file_stat = str(full_path), stat_result
+        media_type = None
+        if str(full_path).endswith(COMPRESSIBLE_EXTENSIONS):
+            headers["Vary"] = "Accept-Encoding"
+            variant = find_variant(
+                full_path, stat_result, request_headers.get("accept-encoding", "")
+            )
+            if variant is not None:
+                encoding, path, file_stat = variant
+                headers["Content-Encoding"] = encoding
+                headers["ETag"] = f'"{version}-{encoding}"'
+                media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            stat_result=file_stat,
+            media_type=media_type,
+            headers=headers,
+        )
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            not_modified = etag_matches(if_none_match, version)
+        else:
+            not_modified = self.is_not_modified(response.headers, request_headers)
+        if not_modified:
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _prime_version(full_path: str) -> None:
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        return
+    if stat.S_ISREG(stat_result.st_mode):
+        file_version(full_path, stat_result)
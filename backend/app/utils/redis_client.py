@@ -9,10 +9,10 @@ Redis는 키-값 저장소입니다:
 """
 
 import redis
-import json
 import time
 from typing import Optional, Dict, Any
 from app.core import config
+from app.utils import jsonio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -72,7 +72,7 @@ class VerificationStore:
             redis_client.setex(
                 key,
                 expire_hours * 3600,  # 초 단위로 변환
-                json.dumps(data)
+                jsonio.dumps(data)
             )
 
             logger.info(f"✅ 인증 상태 저장: {email}")
@@ -96,7 +96,7 @@ class VerificationStore:
             data = redis_client.get(key)
 
             if data:
-                parsed = json.loads(data)
+                parsed = jsonio.loads(data)
                 is_verified = parsed.get("verified", False)
                 logger.info(f"📧 인증 상태 조회: {email} = {is_verified}")
                 return is_verified
@@ -116,7 +116,7 @@ class VerificationStore:
             data = redis_client.get(key)
 
             if data:
-                parsed = json.loads(data)
+                parsed = jsonio.loads(data)
                 return parsed.get("token")
 
             return None
@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils.asset_versions import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    content_version,
+    etag_matches,
+    file_version,
+    remember_version,
+    versioned_url,
+)
+from app.utils.precompressed import PrecompressedStaticFiles, write_precompressed
+
+PAYLOAD = b'{"objects": [' + b'{"type": "circle"},' * 100 + b"{}]}"
+
+
+def _get(directory, url, **headers):
+    flushed = []
+
+    async def before_read(paths):
+        flushed.extend(paths)
+
+    files = PrecompressedStaticFiles(directory=directory, before_read=before_read)
+    app = Starlette(routes=[Mount("/processed", files)])
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.get(url, headers=headers)
+
+    return asyncio.run(main()), flushed
+
+
+def test_file_version_is_content_hash_and_follows_rewrites(tmp_path):
+    path = tmp_path / "scene.json"
+    path.write_bytes(PAYLOAD)
+
+    version = file_version(str(path))
+
+    assert version == hashlib.sha256(PAYLOAD).hexdigest()[:16]
+    assert version == content_version(PAYLOAD)
+    # 기록해 둔 버전은 파일이 그대로인 동안 다시 해시하지 않고 사용
+    remember_version(str(path), "remembered")
+    assert file_version(str(path)) == "remembered"
+    path.write_bytes(PAYLOAD + b" ")
+    assert file_version(str(path)) == content_version(PAYLOAD + b" ")
+
+
+def test_versioned_url_is_immutable_and_etag_revalidates(tmp_path):
+    (tmp_path / "scene.json").write_bytes(PAYLOAD)
+    version = content_version(PAYLOAD)
+    url = versioned_url("/processed/scene.json", version)
+
+    current, flushed = _get(tmp_path, url)
+    stale, _ = _get(tmp_path, versioned_url("/processed/scene.json", "0" * 16))
+    plain, _ = _get(tmp_path, "/processed/scene.json")
+
+    assert current.status_code == 200
+    assert current.headers["etag"] == f'"{version}"'
+    assert current.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert stale.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert plain.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert "last-modified" in plain.headers
+    # 파일을 읽기 전에 대기 중인 자동 저장을 내려보내는 훅이 불림
+    assert flushed == [str((tmp_path / "scene.json").resolve())]
+
+
+def test_conditional_requests_match_any_encoding_variant(tmp_path):
+    path = tmp_path / "scene.json"
+    path.write_bytes(PAYLOAD)
+    write_precompressed(str(path), PAYLOAD)
+    version = content_version(PAYLOAD)
+
+    gzipped, _ = _get(tmp_path, "/processed/scene.json", **{"Accept-Encoding": "gzip"})
+    revalidated, _ = _get(
+        tmp_path,
+        "/processed/scene.json",
+        **{"If-None-Match": gzipped.headers["etag"], "Accept-Encoding": "identity"},
+    )
+    changed, _ = _get(tmp_path, "/processed/scene.json", **{"If-None-Match": '"other"'})
+
+    assert gzipped.headers["etag"] == f'"{version}-gzip"'
+    # 압축 변형의 ETag로 물어봐도 같은 내용 버전이면 304
+    assert revalidated.status_code == 304
+    assert changed.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"abc-br"', True),
+        ('"x", "abc-gzip"', True),
+        ("*", True),
+        ('"abcd"', False),
+        ('"x-abc"', False),
+    ],
+)
+def test_etag_matches_content_version(header, expected):
+    assert etag_matches(header, "abc") is expected
@@ -0,0 +1,124 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services import assignment_service
+from app.services.assignment_service import assign_targets
+from app.services.balance_service import park_unassigned
+from app.services.show_exporter import ShowScene
+
+
+def _cost_matrix(sources, targets, power):
+    return np.linalg.norm(sources[:, None, :] - targets[None, :, :], axis=2) ** power
+
+
+def _brute_force_cost(sources, targets, power):
+    """모든 배정을 나열해 구한 최소 비용 합 (작은 입력용)"""
+    cost = _cost_matrix(sources, targets, power)
+    if len(sources) > len(targets):
+        cost = cost.T
+    rows = np.arange(cost.shape[0])
+    return min(
+        cost[rows, list(cols)].sum()
+        for cols in itertools.permutations(range(cost.shape[1]), cost.shape[0])
+    )
+
+
+def _optimal_cost(sources, targets, power):
+    """dense 솔버(linear_sum_assignment)로 구한 최소 비용 합"""
+    scipy_optimize = pytest.importorskip("scipy.optimize")
+    cost = _cost_matrix(sources, targets, power)
+    rows, cols = scipy_optimize.linear_sum_assignment(cost)
+    return cost[rows, cols].sum()
+
+
+def _assigned_cost(sources, targets, order, power):
+    drones = np.flatnonzero(order[: len(sources)] >= 0)
+    dots = order[drones]
+    return (np.linalg.norm(targets[dots] - sources[drones], axis=1) ** power).sum()
+
+
+@pytest.mark.parametrize("small_pool", [False, True])
+@pytest.mark.parametrize("power", [1.0, 2.0])
+@pytest.mark.parametrize("n, m", [(7, 7), (5, 8), (8, 5), (1, 6), (6, 1)])
+def test_matches_brute_force(n, m, power, small_pool, monkeypatch):
+    if small_pool:
+        # 후보 풀을 작게 만들어 풀 밖 상한 / 전체 재탐색 경로도 거치게 함
+        monkeypatch.setattr(assignment_service, "_POOL_NEIGHBORS", 2)
+    rng = np.random.default_rng(n * 100 + m + int(power))
+    sources = rng.uniform(0, 100, (n, 3))
+    targets = rng.uniform(0, 100, (m, 3))
+
+    # 그대로 / 씬 전체가 평행 이동한 경우
+    for offset in (0.0, 40.0):
+        shifted = targets + offset
+        order = assign_targets(sources, shifted, power=power, neighbors=1)
+
+        assert len(order) == max(n, m)
+        assigned = order[:n][order[:n] >= 0]
+        assert len(np.unique(assigned)) == len(assigned) == min(n, m)
+        optimal = _brute_force_cost(sources, shifted, power)
+        assert _assigned_cost(sources, shifted, order, power) <= optimal * (1 + 1e-3) + 1e-9
+
+
+@pytest.mark.parametrize("power", [1.0, 2.0])
+@pytest.mark.parametrize("n, m", [(300, 300), (200, 320), (320, 200), (40, 41), (1, 5), (5, 1)])
+def test_matches_dense_solver(n, m, power):
+    rng = np.random.default_rng(n * 1000 + m)
+    sources = rng.uniform(0, 100, (n, 3))
+    targets = rng.uniform(0, 100, (m, 3))
+
+    order = assign_targets(sources, targets, power=power)
+
+    assert len(order) == max(n, m)
+    assigned = order[order >= 0]
+    # 모든 도트(또는 드론)가 서로 다르게 한 번씩 배정됨
+    assert len(assigned) == m
+    assert len(np.unique(assigned)) == m
+    optimal = _optimal_cost(sources, targets, power)
+    assert _assigned_cost(sources, targets, order, power) <= optimal * (1 + 1e-3) + 1e-9
+
+
+def test_more_drones_than_dots_keeps_drone_numbers():
+    rng = np.random.default_rng(7)
+    sources = rng.uniform(0, 100, (500, 3))
+    targets = sources[::2] + 0.01
+
+    order = assign_targets(sources, targets)
+
+    # 드론 번호(인덱스)는 그대로이고, 도트가 없는 드론은 -1 주차 슬롯
+    assert len(order) == 500
+    np.testing.assert_array_equal(order[::2], np.arange(250))
+    assert (order[1::2] == -1).all()
+
+
+def test_translated_scene_moves_every_drone_by_the_offset():
+    rng = np.random.default_rng(3)
+    sources = rng.uniform(0, 1000, (2000, 3))
+    targets = sources + [300.0, 0.0, 0.0]
+
+    order = assign_targets(sources, targets, power=2.0)
+
+    np.testing.assert_array_equal(order, np.arange(2000))
+
+
+def test_parking_slots_keep_assigned_rows():
+    scene = ShowScene(
+        scene_number=2,
+        scene_holder=0,
+        transform_pos=np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 5.0]]),
+        led_rgb=np.array([[255, 0, 0], [0, 255, 0]], dtype=np.uint8),
+        led_intensity=np.array([1.0, 0.5]),
+        scene_size=None,
+    )
+
+    parked = park_unassigned(scene, np.array([1, -1, 0, -1]), min_separation=2.0)
+
+    assert len(parked) == 4
+    np.testing.assert_array_equal(parked.transform_pos[[0, 2]], scene.transform_pos[[1, 0]])
+    np.testing.assert_array_equal(parked.led_rgb[[1, 3]], 0)
+    np.testing.assert_array_equal(parked.led_intensity[[1, 3]], 0)
+    # 주차 위치는 형상 뒤쪽 평면에 min_separation보다 넓게
+    assert (parked.transform_pos[[1, 3], 2] > 5.0).all()
+    assert np.linalg.norm(parked.transform_pos[1] - parked.transform_pos[3]) >= 2.0
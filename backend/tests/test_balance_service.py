@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.services.balance_service import FleetSpec, balance_scene, decimate_indices
+from app.services.show_exporter import ShowScene
+
+
+def _scene(pos):
+    pos = np.asarray(pos, dtype=np.float64)
+    n = pos.shape[0]
+    return ShowScene(
+        scene_number=1,
+        scene_holder=0,
+        transform_pos=pos,
+        led_rgb=np.tile((np.arange(n) % 256).astype(np.uint8)[:, None], (1, 3)),
+        led_intensity=np.full(n, 0.5),
+        scene_size=(100.0, 100.0, 0.0),
+    )
+
+
+def _circle(angle):
+    return np.column_stack([np.cos(angle), np.sin(angle), np.zeros(angle.shape[0])])
+
+
+@pytest.mark.parametrize(
+    "n, count", [(1000, 100), (500, 499), (50, 1), (10, 10), (10, 20)]
+)
+def test_decimate_returns_sorted_unique_subset(n, count):
+    positions = np.random.default_rng(n).uniform(0, 100, (n, 3))
+
+    keep = decimate_indices(positions, count)
+
+    assert keep.shape[0] == min(n, count)
+    assert np.all(np.diff(keep) > 0)
+    assert keep.min() >= 0 and keep.max() < n
+
+
+def test_decimate_keeps_the_shape():
+    rng = np.random.default_rng(0)
+    # 촘촘한 원반과 듬성한 고리: 무작위로 고르면 고리 쪽이 거의 남지 않음
+    disc = _circle(rng.uniform(0, 2 * np.pi, 900)) * rng.uniform(0, 10, (900, 1))
+    ring = _circle(np.linspace(0, 2 * np.pi, 100, endpoint=False)) * 50
+    positions = np.concatenate([disc, ring])
+
+    keep = decimate_indices(positions, 100)
+
+    kept_ring = positions[keep[keep >= 900]]
+    assert 20 <= kept_ring.shape[0] <= 80
+    # 남은 도트들이 고리 둘레 전체에 퍼져 있음
+    quadrants = np.arctan2(kept_ring[:, 1], kept_ring[:, 0]) // (np.pi / 2)
+    assert np.unique(quadrants).shape[0] == 4
+
+
+def test_decimate_handles_coincident_dots():
+    positions = np.zeros((30, 3))
+    positions[20:] = [5.0, 0.0, 0.0]
+
+    keep = decimate_indices(positions, 12)
+
+    assert keep.shape[0] == 12 and np.unique(keep).shape[0] == 12
+
+
+def test_balance_scene_parks_or_decimates_to_fleet_size():
+    rng = np.random.default_rng(2)
+    small = _scene(rng.uniform(0, 20, (5, 3)))
+    large = _scene(rng.uniform(0, 20, (40, 3)))
+    fleet = FleetSpec(size=12, min_separation=2.0)
+
+    padded = balance_scene(small, fleet)
+    trimmed = balance_scene(large, fleet)
+
+    assert len(padded) == len(trimmed) == 12
+    assert balance_scene(padded, fleet) is padded
+    np.testing.assert_array_equal(padded.transform_pos[:5], small.transform_pos)
+    np.testing.assert_array_equal(padded.led_rgb[:5], small.led_rgb)
+    # 주차 드론: 꺼진 상태, 형상 뒤쪽, 서로 min_separation보다 멀리
+    parked = padded.transform_pos[5:]
+    assert (padded.led_intensity[5:] == 0).all() and (padded.led_rgb[5:] == 0).all()
+    assert (parked[:, 2] > small.transform_pos[:, 2].max()).all()
+    gaps = np.linalg.norm(parked[:, None] - parked[None, :], axis=2)
+    assert gaps[np.triu_indices(7, 1)].min() >= fleet.min_separation
+    # 솎아낸 씬은 원래 도트의 부분 집합 (색도 같은 행에서 옴)
+    rows = [
+        np.flatnonzero((large.transform_pos == p).all(axis=1))[0]
+        for p in trimmed.transform_pos
+    ]
+    np.testing.assert_array_equal(trimmed.led_rgb, large.led_rgb[rows])
+    assert trimmed.scene_size == large.scene_size
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.services.canvas_patch import (
+    CanvasCache,
+    PatchError,
+    apply_json_patch,
+    apply_object_delta,
+)
+
+
+def test_object_delta_keeps_numeric_ids():
+    doc = {"objects": [{"id": 1, "left": 0}, {"id": 2, "left": 5}]}
+
+    patched = apply_object_delta(doc, {"1": {"left": 10}, "3": {"id": 3, "left": 7}})
+
+    assert patched["objects"] == [
+        {"id": 1, "left": 10},
+        {"id": 2, "left": 5},
+        {"id": 3, "left": 7},
+    ]
+    assert doc["objects"][0] == {"id": 1, "left": 0}
+
+
+def test_object_delta_rejects_id_change():
+    with pytest.raises(PatchError):
+        apply_object_delta({"objects": [{"id": 1}]}, {"1": {"id": 2}})
+
+
+@pytest.mark.parametrize(
+    "current, expected, ok",
+    [
+        (1, 1, True),
+        (1, 1.0, True),
+        (1, True, False),
+        (0, False, False),
+        ([1, {"a": True}], [1, {"a": 1}], False),
+        ({"a": [1, 2]}, {"a": [1, 2]}, True),
+        (None, None, True),
+    ],
+)
+def test_patch_test_op_compares_types(current, expected, ok):
+    doc = {"value": current}
+    operations = [{"op": "test", "path": "/value", "value": expected}]
+
+    if ok:
+        assert apply_json_patch(doc, operations) == doc
+    else:
+        with pytest.raises(PatchError):
+            apply_json_patch(doc, operations)
+
+
+def test_locks_are_released_after_use():
+    cache = CanvasCache(size=2)
+    active = set()
+    done = []
+
+    async def patch(path, name):
+        async with cache.lock(path):
+            assert path not in active
+            active.add(path)
+            await asyncio.sleep(0)
+            active.discard(path)
+            done.append(name)
+
+    async def main():
+        await asyncio.gather(*(patch(f"/scene/{i % 3}.json", i) for i in range(9)))
+
+    asyncio.run(main())
+
+    # 같은 경로의 패치는 겹치지 않고, 끝나면 잠금이 남지 않음
+    assert sorted(done) == list(range(9))
+    assert cache._locks == {} and cache._lock_users == {}
@@ -0,0 +1,94 @@
+import numpy as np
+
+from app.services.collision_service import check_transition, collision_summary
+from app.services.trajectory_service import sample_transition
+
+MIN_SEPARATION = 2.0
+MAX_ACCEL = 3.0
+
+
+def _dense_min_gaps(start, end, duration, samples=4001):
+    """촘촘한 샘플링으로 구한 쌍별 최소 거리와 처음 min_separation 미만이 되는 시각"""
+    times = np.linspace(0.0, duration, samples)
+    frames = sample_transition(start, end, duration, times, MAX_ACCEL)
+    gaps = np.linalg.norm(frames[:, :, None, :] - frames[:, None, :, :], axis=3)
+    first = np.where(
+        (gaps < MIN_SEPARATION).any(axis=0),
+        times[(gaps < MIN_SEPARATION).argmax(axis=0)],
+        np.nan,
+    )
+    return gaps.min(axis=0), first
+
+
+def test_crossing_paths_are_found_between_safe_keyframes():
+    # 두 드론이 자리를 맞바꿈: 키프레임에서는 20m 떨어져 있지만 중간에 스쳐 지나감
+    start = np.array([[0.0, 0.0, 0.0], [20.0, 1.0, 0.0], [0.0, 50.0, 0.0]])
+    end = np.array([[20.0, 0.0, 0.0], [0.0, 1.0, 0.0], [20.0, 50.0, 0.0]])
+
+    report = check_transition(
+        start, end, 10.0, MAX_ACCEL, MIN_SEPARATION, start_time=30.0, to_scene=5
+    )
+
+    _, first = _dense_min_gaps(start, end, 10.0)
+    assert not report.valid
+    assert report.pairs.tolist() == [[0, 1]]
+    # 가장 이른 위반 시각 (쇼 시작 기준)은 촘촘한 샘플링 결과와 정밀 검사 간격 안에서 일치
+    assert abs(report.times[0] - (30.0 + first[0, 1])) < 10.0 / report.samples
+    assert report.distances[0] < MIN_SEPARATION
+    gap = np.linalg.norm(report.pair_positions[0, 0] - report.pair_positions[0, 1])
+    assert abs(gap - report.distances[0]) < 1e-9
+
+
+def test_formation_translation_is_valid():
+    rng = np.random.default_rng(0)
+    start = rng.uniform(0, 100, (200, 3))
+    start = start[np.argsort(start[:, 0])]
+    start[:, 0] = np.arange(200) * 3.0  # 모든 쌍이 3m 이상 떨어진 대형
+
+    end = start + [0.0, 40.0, 5.0]
+
+    report = check_transition(start, end, 8.0, MAX_ACCEL, MIN_SEPARATION)
+
+    assert report.valid
+    assert report.samples > 1
+
+
+def test_matches_dense_sampling_on_random_transitions():
+    rng = np.random.default_rng(1)
+    start = rng.uniform(0, 30, (40, 3))
+    end = rng.uniform(0, 30, (40, 3))
+
+    report = check_transition(start, end, 6.0, MAX_ACCEL, MIN_SEPARATION)
+
+    min_gaps, _ = _dense_min_gaps(start, end, 6.0)
+    found = {tuple(pair) for pair in report.pairs.tolist()}
+    # 확실히 가까워지는 쌍은 모두 찾고, 보고한 쌍은 실제로 가까워짐
+    clear = {
+        (a, b)
+        for a, b in zip(*np.nonzero(min_gaps < MIN_SEPARATION * 0.95))
+        if a < b
+    }
+    assert clear and clear <= found
+    for a, b in found:
+        assert min_gaps[a, b] < MIN_SEPARATION + 1e-3
+    assert np.all(np.diff(report.times) >= 0)
+
+
+def test_missing_drones_are_ignored_and_summary():
+    start = np.array([[0.0, 0.0, 0.0], [np.nan] * 3, [20.0, 0.0, 0.0]])
+    end = np.array([[20.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+
+    crossing = check_transition(
+        start, end, 10.0, MAX_ACCEL, MIN_SEPARATION, to_scene=2
+    )
+    safe = check_transition(start[:1], end[:1], 10.0, MAX_ACCEL, MIN_SEPARATION)
+
+    # 이전 씬에 없던 드론(1)은 검사하지 않고, 드론 번호는 원래 번호로 보고
+    assert crossing.drone_count == 2
+    assert crossing.pairs.tolist() == [[0, 2]]
+    summary = collision_summary([safe, crossing])
+    assert summary["valid"] is False
+    assert summary["transitions_checked"] == 2
+    assert summary["invalid_transitions"] == 1
+    assert summary["earliest_violation"] == float(crossing.times[0])
+    assert summary["transitions"][0]["to_scene"] == 2
@@ -0,0 +1,111 @@
+import numpy as np
+
+from app.services.delta_codec import SceneDeltaEncoder, decode_scenes
+from app.services.show_exporter import ShowScene
+from app.utils import jsonio
+
+QUANTUM = 0.001
+
+
+def _scene(number, pos, rgb, intensity):
+    return ShowScene(
+        scene_number=number,
+        scene_holder=0,
+        transform_pos=np.asarray(pos, dtype=np.float64),
+        led_rgb=np.asarray(rgb, dtype=np.uint8),
+        led_intensity=np.asarray(intensity, dtype=np.float64),
+        scene_size=(100.0, 100.0, 100.0),
+    )
+
+
+def _round_trip(scenes):
+    """인코딩한 쇼를 jsonio로 직렬화 → 역직렬화한 뒤 복원합니다."""
+    encoder = SceneDeltaEncoder(QUANTUM)
+    show = {"encoding": encoder.header(), "scenes": [encoder.encode(s) for s in scenes]}
+    loaded = jsonio.loads(jsonio.dumps(show))
+    return loaded, decode_scenes(loaded)
+
+
+def _random_walk(rng, count, drones, step):
+    pos = rng.uniform(0, 50, (drones, 3))
+    rgb = rng.integers(0, 256, (drones, 3))
+    intensity = rng.uniform(0, 1, drones)
+    scenes = []
+    for number in range(1, count + 1):
+        scenes.append(_scene(number, pos.copy(), rgb.copy(), intensity.copy()))
+        moving = rng.random(drones) < 0.5
+        pos[moving] += rng.uniform(-step, step, (int(moving.sum()), 3))
+    return scenes
+
+
+def test_positions_stay_within_half_quantum():
+    scenes = _random_walk(np.random.default_rng(0), 30, 200, 1.0)
+
+    loaded, decoded = _round_trip(scenes)
+
+    assert "action_data" in loaded["scenes"][0]
+    assert all("delta" in data for data in loaded["scenes"][1:])
+    for original, restored in zip(scenes, decoded):
+        # 직전 씬의 복원 위치 기준으로 양자화하므로 씬이 쌓여도 오차가 누적되지 않음
+        error = np.abs(restored.transform_pos - original.transform_pos)
+        assert error.max() <= QUANTUM / 2 + 1e-9
+        assert restored.scene_number == original.scene_number
+        assert restored.scene_size == original.scene_size
+
+
+def test_large_moves_use_absolute_positions():
+    rng = np.random.default_rng(1)
+    pos = rng.uniform(0, 10, (20, 3))
+    rgb = np.full((20, 3), 255)
+    intensity = np.ones(20)
+    far = pos.copy()
+    # int16 * quantum(약 32.8) 범위를 넘는 이동
+    far[[3, 7]] += [100.0, -50.0, 40.0]
+    far[5] += [0.5, 0.0, 0.0]
+    scenes = [_scene(1, pos, rgb, intensity), _scene(2, far, rgb, intensity)]
+
+    loaded, decoded = _round_trip(scenes)
+
+    delta = loaded["scenes"][1]["delta"]
+    assert delta["pos_abs_index"] == [3, 7]
+    assert delta["pos_index"] == [5]
+    np.testing.assert_array_equal(decoded[1].transform_pos[[3, 7]], far[[3, 7]])
+    assert np.abs(decoded[1].transform_pos - far).max() <= QUANTUM / 2 + 1e-9
+
+
+def test_drone_count_change_writes_keyframe():
+    rng = np.random.default_rng(2)
+    first = _scene(1, rng.uniform(0, 10, (10, 3)), np.zeros((10, 3)), np.ones(10))
+    grown = _scene(2, rng.uniform(0, 10, (12, 3)), np.full((12, 3), 9), np.ones(12))
+    moved = _scene(3, grown.transform_pos + 0.25, grown.led_rgb, grown.led_intensity)
+
+    loaded, decoded = _round_trip([first, grown, moved])
+
+    assert "action_data" in loaded["scenes"][1]
+    assert "delta" not in loaded["scenes"][1]
+    assert loaded["scenes"][2]["delta"]["drones"] == 12
+    assert len(decoded[1]) == 12
+    np.testing.assert_array_equal(decoded[1].transform_pos, grown.transform_pos)
+    assert np.abs(decoded[2].transform_pos - moved.transform_pos).max() <= QUANTUM / 2 + 1e-9
+
+
+def test_color_and_intensity_changes():
+    pos = np.zeros((6, 3))
+    pos[:, 0] = np.arange(6)
+    rgb = np.full((6, 3), 100)
+    intensity = np.full(6, 0.5)
+    rgb2 = rgb.copy()
+    rgb2[[1, 4]] = [[255, 0, 0], [0, 0, 255]]
+    intensity2 = intensity.copy()
+    intensity2[[2, 4]] = [0.0, 1.0]
+    scenes = [_scene(1, pos, rgb, intensity), _scene(2, pos, rgb2, intensity2)]
+
+    loaded, decoded = _round_trip(scenes)
+
+    delta = loaded["scenes"][1]["delta"]
+    assert delta["pos_index"] == [] and delta["pos_abs_index"] == []
+    assert delta["rgb_index"] == [1, 4]
+    assert delta["intensity_index"] == [2, 4]
+    np.testing.assert_array_equal(decoded[1].led_rgb, rgb2)
+    np.testing.assert_array_equal(decoded[1].led_intensity, intensity2)
+    np.testing.assert_array_equal(decoded[1].transform_pos, pos)
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+
+from app.services.dot_sidecar import (
+    RECORD_DTYPE,
+    load_dot_scene,
+    read_sidecar,
+    sidecar_path_for,
+)
+from app.services.show_exporter import ExportTransform, scene_actions
+from app.utils import jsonio
+
+
+def _circle(left, top, fill, opacity):
+    return {
+        "type": "circle",
+        "left": left,
+        "top": top,
+        "width": 4,
+        "height": 4,
+        "radius": 2,
+        "originX": "center",
+        "originY": "center",
+        "fill": fill,
+        "opacity": opacity,
+    }
+
+
+def _write_scene(path, objects):
+    with open(path, "wb") as f:
+        canvas = {"canvasSize": {"width": 800, "height": 600}, "objects": objects}
+        f.write(jsonio.dumps(canvas))
+
+
+def _intensities(dot_scene):
+    actions = jsonio.loads(jsonio.dumps(scene_actions(dot_scene, ExportTransform())))
+    return [action["led_intensity"] for action in actions]
+
+
+def test_sidecar_matches_json_values(tmp_path):
+    path = str(tmp_path / "scene.json")
+    _write_scene(
+        path,
+        [_circle(10.1, 20.2, "#ff0000", 0.3), _circle(0.7, 0.1, "#0080ff", 0.7)],
+    )
+
+    from_json = load_dot_scene(path)
+    assert os.path.exists(sidecar_path_for(path))
+    from_sidecar = load_dot_scene(path)
+
+    # 사이드카에서 읽어도 JSON에서 만든 것과 같은 값 (float32로 줄어들지 않음)
+    assert _intensities(from_json) == _intensities(from_sidecar) == [0.3, 0.7]
+    np.testing.assert_array_equal(from_sidecar.positions, from_json.positions)
+    np.testing.assert_array_equal(from_sidecar.colors, [[255, 0, 0], [0, 128, 255]])
+    assert (from_sidecar.width, from_sidecar.height) == (800.0, 600.0)
+    _, records = read_sidecar(sidecar_path_for(path))
+    assert records.dtype == RECORD_DTYPE and records.shape == (2,)
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path):
+    path = str(tmp_path / "scene.json")
+    _write_scene(path, [_circle(1, 1, "#ffffff", 1.0)])
+    load_dot_scene(path)
+
+    _write_scene(path, [_circle(1, 1, "#ffffff", 0.25), _circle(9, 9, "#000000", 0.5)])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert _intensities(load_dot_scene(path)) == [0.25, 0.5]
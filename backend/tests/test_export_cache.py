@@ -0,0 +1,110 @@
+import os
+import uuid
+
+import pytest
+
+from app.services import export_cache
+from app.services.export_cache import (
+    CachedExport,
+    etag_matches,
+    export_cache_key,
+    get_cached_export,
+    scene_fingerprints,
+    store_export,
+)
+from app.services.show_exporter import ExportTransform
+
+PROJECT = {"id": "p1", "project_name": "쇼", "format": "dsj", "max_drone": 10}
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    processed, outputs = tmp_path / "processed", tmp_path / "svg_json"
+    processed.mkdir()
+    outputs.mkdir()
+    monkeypatch.setattr(export_cache, "PROCESSED_DIR", str(processed))
+    monkeypatch.setattr(export_cache, "SVG_JSON_DIR", str(outputs))
+    return processed, outputs
+
+
+def _write(path, payload, mtime_ns=None):
+    path.write_bytes(payload)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _key(scenes, transform=ExportTransform(), project=PROJECT, **options):
+    return export_cache_key(project, transform, scene_fingerprints(scenes), **options)
+
+
+def test_key_changes_with_scene_file_size_and_mtime(dirs):
+    processed, _ = dirs
+    scenes = [{"id": uuid.uuid4(), "scene_num": number} for number in (1, 2)]
+    first = processed / f"{scenes[0]['id']}.json"
+    _write(first, b'{"objects": []}', mtime_ns=1_000_000_000)
+    _write(processed / f"{scenes[1]['id']}.json", b"{}", mtime_ns=1_000_000_000)
+
+    key = _key(scenes)
+    assert _key(scenes) == key
+
+    # 같은 크기로 다시 저장 (수정 시각만 바뀜)
+    _write(first, b'{"objects":[ ]}', mtime_ns=2_000_000_000)
+    touched = _key(scenes)
+    assert touched != key
+
+    # 수정 시각은 그대로 두고 크기만 바뀜
+    _write(first, b'{"objects": [1, 2]}', mtime_ns=2_000_000_000)
+    resized = _key(scenes)
+    assert resized not in (key, touched)
+
+    # 처리된 파일이 사라짐
+    first.unlink()
+    assert scene_fingerprints(scenes)[0][2:] == (-1, -1)
+    assert _key(scenes) not in (key, touched, resized)
+
+
+def test_key_changes_with_settings(dirs):
+    scenes = [{"id": uuid.uuid4(), "scene_num": 1}]
+    key = _key(scenes)
+
+    assert _key([{**scenes[0], "scene_num": 2}]) != key
+    assert _key(scenes, transform=ExportTransform(scale_x=2.0)) != key
+    assert _key(scenes, project={**PROJECT, "max_drone": 11}) != key
+    assert _key(scenes, format="bin") != key
+    assert _key(scenes, assign_drones=True) != _key(scenes, assign_drones=False)
+
+
+def test_cached_export_requires_same_key_and_output_file(dirs):
+    _, outputs = dirs
+    project_id = uuid.uuid4()
+    cached = CachedExport(
+        key="abc", out_name="show.json", scenes_processed=2, total_scenes=2
+    )
+    (outputs / "show.json").write_bytes(b"{}")
+    store_export(project_id, cached)
+
+    assert get_cached_export(project_id, "abc") == cached
+    assert get_cached_export(project_id, "other") is None
+
+    # 결과 파일이 지워지면 캐시 항목도 버림
+    (outputs / "show.json").unlink()
+    assert get_cached_export(project_id, "abc") is None
+    (outputs / "show.json").write_bytes(b"{}")
+    assert get_cached_export(project_id, "abc") is None
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+        ("abc", False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
@@ -0,0 +1,177 @@
+import asyncio
+import uuid
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.dependencies import get_current_user
+from app.routers import project as project_module
+from app.routers.websocket import manager
+from app.schemas import UserResponse
+from app.services.export_jobs import ExportJobManager, export_jobs
+from app.services.export_service import ExportMetadata
+from app.utils import jsonio
+
+OWNER = UserResponse(id=uuid.uuid4(), username="owner")
+OTHER = UserResponse(id=uuid.uuid4(), username="other")
+PROJECT_ID = uuid.uuid4()
+STAGES = ("loading", "assignment", "serialization", "upload")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+
+def _client(current):
+    app = FastAPI()
+    app.include_router(project_module.router, prefix="/projects")
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+def _setup(monkeypatch, gate):
+    """DB 조회와 내보내기 본문을 가짜로 바꿉니다. 작업은 gate가 열린 뒤 단계를 보고함"""
+
+    async def fake_metadata(project_id, user_id=None):
+        if user_id != OWNER.id:
+            return None
+        return ExportMetadata(project={"id": project_id}, scenes=[{"id": 1}])
+
+    async def fake_export_job(*args):
+        job, progress = args[-2], args[-1]
+        await gate.wait()
+        for stage in STAGES:
+            progress(stage, 0, 2)
+            progress(stage, 2, 2)
+            await asyncio.sleep(0)
+        return {"success": True, "job": job.id}
+
+    monkeypatch.setattr(project_module, "fetch_export_metadata", fake_metadata)
+    monkeypatch.setattr(project_module, "_export_job", fake_export_job)
+
+
+def _sse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], jsonio.loads(lines["data"])))
+    return events
+
+
+def test_job_runs_through_stages_and_streams_events(monkeypatch):
+    current = {"user": OWNER}
+    owner_ws, other_ws = FakeWebSocket(), FakeWebSocket()
+
+    async def main():
+        gate = asyncio.Event()
+        _setup(monkeypatch, gate)
+        await manager.connect(owner_ws, OWNER.id)
+        await manager.connect(other_ws, OTHER.id)
+        try:
+            async with _client(current) as client:
+                created = await client.post(
+                    f"/projects/{PROJECT_ID}/export", params={"background": "true"}
+                )
+                assert created.status_code == 202
+                job = created.json()
+                assert job["events_url"].endswith(f"/export/jobs/{job['job_id']}/events")
+
+                events = asyncio.create_task(client.get(job["events_url"]))
+                while not export_jobs._subscribers.get(job["job_id"]):
+                    await asyncio.sleep(0.01)
+                gate.set()
+                response = await events
+                status = await client.get(job["status_url"])
+
+                # 다른 사용자는 작업을 볼 수 없음
+                current["user"] = OTHER
+                hidden = await client.get(job["status_url"])
+                # 리스너(/ws 전송) 작업이 끝날 때까지 대기
+                await asyncio.gather(*export_jobs._notifications)
+        finally:
+            manager.disconnect(owner_ws)
+            manager.disconnect(other_ws)
+        return job, response, status, hidden
+
+    job, response, status, hidden = asyncio.run(main())
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [name for name, _ in events[:-1]] == ["progress"] * (len(events) - 1)
+    assert events[-1][0] == "done"
+    assert events[-1][1]["status"] == "succeeded"
+    # 단계가 바뀌는 이벤트는 묶지 않고 순서대로 보냄
+    stages = [event["stage"] for _, event in events if event["stage"]]
+    assert list(dict.fromkeys(stages)) == list(STAGES)
+    assert status.json()["status"] == "succeeded"
+    assert status.json()["result"] == {"success": True, "job": job["job_id"]}
+    assert hidden.status_code == 404
+
+    # /ws 이벤트는 작업을 만든 사용자의 연결에만 감
+    assert other_ws.sent == []
+    sent = [jsonio.loads(message) for message in owner_ws.sent]
+    assert {message["type"] for message in sent} == {"export_job"}
+    assert sent[-1]["job_id"] == job["job_id"]
+    assert sent[-1]["status"] == "succeeded"
+
+
+def test_cancel_job(monkeypatch):
+    current = {"user": OWNER}
+
+    async def main():
+        gate = asyncio.Event()
+        _setup(monkeypatch, gate)
+        async with _client(current) as client:
+            created = await client.post(
+                f"/projects/{PROJECT_ID}/export", params={"background": "true"}
+            )
+            job = created.json()
+            current["user"] = OTHER
+            forbidden = await client.post(job["cancel_url"])
+            current["user"] = OWNER
+            cancelled = await client.post(job["cancel_url"])
+            await asyncio.sleep(0)
+            status = await client.get(job["status_url"])
+            again = await client.post(job["cancel_url"])
+        return forbidden, cancelled, status, again
+
+    forbidden, cancelled, status, again = asyncio.run(main())
+
+    assert forbidden.status_code == 404
+    assert cancelled.json() == {"success": True, "cancelled": True}
+    assert status.json()["status"] == "cancelled"
+    # 이미 끝난 작업은 다시 취소되지 않음
+    assert again.json()["cancelled"] is False
+
+
+def test_failed_job_records_http_error():
+    jobs = ExportJobManager()
+
+    async def work(job, progress):
+        progress("validation", 0, 1)
+        raise HTTPException(status_code=422, detail={"violations": 3})
+
+    async def main():
+        job = jobs.create(PROJECT_ID, OWNER.id, work)
+        queue = jobs.subscribe(job)
+        await job.task
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return job, events
+
+    job, events = asyncio.run(main())
+
+    assert job.status == "failed"
+    assert job.error == {"violations": 3}
+    assert events[-1]["status"] == "failed"
+    assert "validation" in [event["stage"] for event in events]
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from app.services import export_service
+from app.services.export_service import iter_scene_results, load_scenes, scene_holders
+from app.services.show_exporter import ExportTransform
+
+
+def _scenes(numbers):
+    return [{"id": uuid.uuid4(), "scene_num": number} for number in numbers]
+
+
+class FakeBuilder:
+    """build_scene_data 대역. 앞 씬일수록 오래 걸리고, 동시에 실행된 최대 개수를 기록"""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def __call__(self, scene_id, scene_num, scene_holder, transform, fleet):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(0.02 / scene_num)
+            if scene_num in self.missing:
+                raise FileNotFoundError(scene_id)
+            return (scene_num, scene_holder)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_scene_holders_are_gaps_to_the_next_scene():
+    assert scene_holders(_scenes([1, 2, 5, 6])) == [0, 2, 0, 0]
+    assert scene_holders([]) == []
+
+
+def test_load_scenes_keeps_order_and_limits_parallelism(monkeypatch):
+    builder = FakeBuilder(missing={3})
+    monkeypatch.setattr(export_service, "build_scene_data", builder)
+    scenes = _scenes([1, 2, 3, 4, 7, 8])
+    reports = []
+
+    results = asyncio.run(
+        load_scenes(
+            scenes,
+            ExportTransform(),
+            max_parallel=2,
+            progress=lambda *args: reports.append(args),
+        )
+    )
+
+    # 늦게 끝난 씬도 입력 순서 자리에 들어가고, 실패한 씬은 None
+    assert results == [(1, 0), (2, 0), None, (4, 2), (7, 0), (8, 0)]
+    assert 1 < builder.peak <= 2
+    assert sorted(reports) == [("loading", done, 6) for done in range(1, 7)]
+
+
+def test_iter_scene_results_prefetches_in_order(monkeypatch):
+    builder = FakeBuilder(missing={2})
+    monkeypatch.setattr(export_service, "build_scene_data", builder)
+    scenes = _scenes([1, 2, 3, 4, 5])
+
+    async def main():
+        return [
+            result
+            async for result in iter_scene_results(scenes, ExportTransform(), prefetch=2)
+        ]
+
+    assert asyncio.run(main()) == [(1, 0), None, (3, 0), (4, 0), (5, 0)]
+    assert builder.peak <= 2
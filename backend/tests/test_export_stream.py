@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+import pytest
+
+from app.services.export_stream import ChunkFanout
+
+CHUNKS = [b'{"scenes": [', b'{"scene_number": 1}', b", ", b'{"scene_number": 2}', b"]}"]
+
+
+async def _source(chunks, error=None):
+    for chunk in chunks:
+        await asyncio.sleep(0)
+        yield chunk
+    if error is not None:
+        raise error
+
+
+async def _collect(subscriber):
+    return [chunk async for chunk in subscriber]
+
+
+def test_file_and_subscribers_get_the_same_bytes(tmp_path):
+    out_path = str(tmp_path / "show.json")
+
+    async def main():
+        fanout = ChunkFanout(_source(CHUNKS), out_path, maxsize=1)
+        first, second = fanout.subscribe(), fanout.subscribe()
+        ok, a, b = await asyncio.gather(fanout.run(), _collect(first), _collect(second))
+        return fanout, ok, a, b
+
+    fanout, ok, a, b = asyncio.run(main())
+
+    assert ok
+    assert a == b == CHUNKS
+    with open(out_path, "rb") as f:
+        assert f.read() == b"".join(CHUNKS)
+    assert fanout.bytes_written == len(b"".join(CHUNKS))
+    assert not os.path.exists(out_path + ".part")
+
+
+def test_failure_removes_partial_file_and_reaches_subscriber(tmp_path):
+    out_path = str(tmp_path / "show.json")
+
+    async def main():
+        fanout = ChunkFanout(_source(CHUNKS[:2], RuntimeError("scene 3 broken")), out_path)
+        subscriber = fanout.subscribe()
+        run = asyncio.create_task(fanout.run())
+        received = []
+        with pytest.raises(RuntimeError, match="scene 3 broken"):
+            async for chunk in subscriber:
+                received.append(chunk)
+        return await run, received
+
+    ok, received = asyncio.run(main())
+
+    assert not ok
+    assert received == CHUNKS[:2]
+    # 미완성 결과는 남기지 않음 (캐시 등록 / GCS 전송 대상이 되지 않음)
+    assert not os.path.exists(out_path)
+    assert not os.path.exists(out_path + ".part")
+
+
+def test_closed_and_stalled_subscribers_do_not_block_the_file(tmp_path):
+    out_path = str(tmp_path / "show.json")
+
+    async def main():
+        fanout = ChunkFanout(
+            _source(CHUNKS), out_path, maxsize=1, consumer_timeout=0.05
+        )
+        closed = fanout.subscribe()
+        fanout.subscribe()  # 한 번도 읽지 않는 구독자
+        await closed.aclose()
+        return await asyncio.wait_for(fanout.run(), 5)
+
+    assert asyncio.run(main())
+    with open(out_path, "rb") as f:
+        assert f.read() == b"".join(CHUNKS)
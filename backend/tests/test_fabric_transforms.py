@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services.fabric_json_service import fabric_data_to_dot_scene
+
+_ORIGINS = {"left": -0.5, "top": -0.5, "center": 0.0, "right": 0.5, "bottom": 0.5}
+
+
+# Fabric.js(fabric.util)의 [a, b, c, d, e, f] 행렬 연산을 그대로 옮긴 참조 구현
+def _multiply(a, b):
+    return [
+        a[0] * b[0] + a[2] * b[1],
+        a[1] * b[0] + a[3] * b[1],
+        a[0] * b[2] + a[2] * b[3],
+        a[1] * b[2] + a[3] * b[3],
+        a[0] * b[4] + a[2] * b[5] + a[4],
+        a[1] * b[4] + a[3] * b[5] + a[5],
+    ]
+
+
+def _transform_point(m, x, y):
+    return m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]
+
+
+def _center_point(obj):
+    """fabric.Object.getCenterPoint (left/top을 originX/originY에서 중심으로 옮김)"""
+    sx, sy = obj.get("scaleX", 1.0), obj.get("scaleY", 1.0)
+    stroke = obj.get("strokeWidth", 0.0)
+    width = obj.get("width", 2.0 * obj.get("radius", 0.0))
+    height = obj.get("height", 2.0 * obj.get("radius", 0.0))
+    ox = -_ORIGINS[obj.get("originX", "left")] * (width + stroke) * sx
+    oy = -_ORIGINS[obj.get("originY", "top")] * (height + stroke) * sy
+    t = math.radians(obj.get("angle", 0.0))
+    return (
+        obj.get("left", 0.0) + ox * math.cos(t) - oy * math.sin(t),
+        obj.get("top", 0.0) + ox * math.sin(t) + oy * math.cos(t),
+    )
+
+
+def _own_matrix(obj):
+    """fabric.Object.calcOwnMatrix (composeMatrix: translate · rotate · scale/flip · skewX · skewY)"""
+    cx, cy = _center_point(obj)
+    t = math.radians(obj.get("angle", 0.0))
+    cos_t, sin_t = math.cos(t), math.sin(t)
+    m = _multiply([1, 0, 0, 1, cx, cy], [cos_t, sin_t, -sin_t, cos_t, 0, 0])
+    sx = -obj.get("scaleX", 1.0) if obj.get("flipX") else obj.get("scaleX", 1.0)
+    sy = -obj.get("scaleY", 1.0) if obj.get("flipY") else obj.get("scaleY", 1.0)
+    skew_x = math.tan(math.radians(obj.get("skewX", 0.0)))
+    skew_y = math.tan(math.radians(obj.get("skewY", 0.0)))
+    dims = _multiply([sx, 0, 0, sy, 0, 0], [1, 0, skew_x, 1, 0, 0])
+    dims = _multiply(dims, [1, skew_y, 0, 1, 0, 0])
+    return _multiply(m, dims)
+
+
+def _reference_centers(objects, matrix):
+    out = []
+    for obj in objects:
+        if obj["type"] == "group":
+            group = _multiply(matrix, _own_matrix(obj))
+            out += _reference_centers(obj["objects"], group)
+        else:
+            out.append(_transform_point(matrix, *_center_point(obj)))
+    return out
+
+
+def _circle(**attrs):
+    return {"type": "circle", "radius": 5, "fill": "#ffffff", **attrs}
+
+
+def _random_object(rng, depth):
+    attrs = {
+        "left": float(rng.uniform(-200, 200)),
+        "top": float(rng.uniform(-200, 200)),
+        "scaleX": float(rng.uniform(0.5, 2.0)),
+        "scaleY": float(rng.uniform(0.5, 2.0)),
+        "angle": float(rng.uniform(0, 360)),
+        "originX": str(rng.choice(["left", "center", "right"])),
+        "originY": str(rng.choice(["top", "center", "bottom"])),
+        "strokeWidth": float(rng.choice([0.0, 1.0])),
+    }
+    if depth > 0 and rng.random() < 0.4:
+        return {
+            "type": "group",
+            "width": float(rng.uniform(10, 300)),
+            "height": float(rng.uniform(10, 300)),
+            "flipX": bool(rng.random() < 0.3),
+            "skewX": float(rng.uniform(-20, 20)),
+            "skewY": float(rng.uniform(-20, 20)),
+            "objects": [_random_object(rng, depth - 1) for _ in range(3)],
+            **attrs,
+        }
+    return _circle(**attrs)
+
+
+def test_known_viewport_and_group_positions():
+    data = {
+        "viewportTransform": [2, 0, 0, 2, 10, 20],
+        "objects": [
+            # 중심 (5, 5) → 확대 2배 + 이동 (10, 20)
+            _circle(left=0, top=0),
+            {
+                "type": "group",
+                "left": 100,
+                "top": 100,
+                "width": 40,
+                "height": 40,
+                "originX": "center",
+                "originY": "center",
+                "angle": 90,
+                # 그룹 중심 기준 (10, 0) → 90도 회전 → (0, 10)
+                "objects": [
+                    _circle(left=10, top=0, originX="center", originY="center")
+                ],
+            },
+        ],
+    }
+
+    with_viewport = fabric_data_to_dot_scene(data)
+    canvas = fabric_data_to_dot_scene(data, apply_viewport=False)
+
+    np.testing.assert_allclose(
+        with_viewport.positions, [[20, 30], [210, 240]], atol=1e-9
+    )
+    np.testing.assert_allclose(canvas.positions, [[5, 5], [100, 110]], atol=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_fabric_matrix_composition(seed):
+    rng = np.random.default_rng(seed)
+    viewport = [float(v) for v in rng.uniform(-1, 1, 4)] + [33.0, -12.5]
+    objects = [_random_object(rng, depth=3) for _ in range(12)]
+
+    dots = fabric_data_to_dot_scene({"viewportTransform": viewport, "objects": objects})
+
+    expected = _reference_centers(objects, viewport)
+    assert len(dots) == len(expected)
+    np.testing.assert_allclose(dots.positions, expected, rtol=1e-9, atol=1e-6)
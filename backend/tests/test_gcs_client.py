@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from app.services.gcs_client import GCSClient
+from app.services.gcs_standin import GCSStandIn
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("protocol", ["legacy", "chunked"])
+def test_payloads_arrive_in_chunks(tmp_path, protocol):
+    path = tmp_path / "show.json"
+    payload = b'{"scenes": [' + b"1," * 5000 + b"2]}"
+    path.write_bytes(payload)
+
+    async def main():
+        async with GCSStandIn() as server:
+            client = GCSClient(server.uri, protocol=protocol, chunk_size=1024)
+            await client.start()
+            try:
+                assert client.enqueue_bytes(b"\x00\x01", name="blob.bin", text=False)
+                assert await client.deliver_file(str(path), name="show.json")
+                await _wait_for(lambda: len(server.received) == 2)
+            finally:
+                await client.stop()
+            return client, server.received
+
+    client, received = asyncio.run(main())
+
+    by_data = {item.data: item for item in received}
+    assert by_data[payload].text is True
+    assert by_data[b"\x00\x01"].text is False
+    assert client.status()["sent"] == 2
+    if protocol == "chunked":
+        assert by_data[payload].name == "show.json"
+
+
+def test_rejected_chunked_payload_is_retried():
+    async def main():
+        async with GCSStandIn(reject_next=1) as server:
+            client = GCSClient(server.uri, protocol="chunked", max_attempts=3)
+            await client.start()
+            try:
+                client.enqueue_bytes(b"{}", name="retry.json")
+                await _wait_for(lambda: client.sent == 1)
+            finally:
+                await client.stop()
+            return client, server
+
+    client, server = asyncio.run(main())
+
+    # 첫 전송은 ok=false ack로 거절되고, 다시 보낸 페이로드만 저장됨
+    assert server.reject_next == 0
+    assert [item.data for item in server.received] == [b"{}"]
+    assert client.failed == 0
+
+
+def test_full_queue_rejects_and_unreachable_server_times_out(tmp_path):
+    path = tmp_path / "show.json"
+    path.write_bytes(b"{}")
+
+    async def main():
+        # 연결할 수 없는 주소: 워커는 재연결을 반복하고 큐는 비지 않음
+        client = GCSClient("ws://127.0.0.1:9/json", queue_size=1, deliver_timeout=0.2)
+        await client.start()
+        try:
+            delivered = await client.deliver_file(str(path), name="show.json")
+            rejected = client.enqueue_bytes(b"{}", name="overflow.json")
+            status = client.status()
+        finally:
+            await client.stop()
+        return delivered, rejected, status
+
+    delivered, rejected, status = asyncio.run(main())
+
+    assert delivered is False
+    assert rejected is False
+    assert status["queued"] == 1
+    assert status["rejected"] == 1
+    assert status["connected"] == 0
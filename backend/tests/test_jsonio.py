@@ -0,0 +1,83 @@
+import datetime
+import uuid
+
+import numpy as np
+import pytest
+
+from app.utils import jsonio
+
+SAMPLE = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "created_at": datetime.datetime(2024, 5, 1, 12, 30, 0),
+    "name": "드론 쇼",
+    "positions": np.array([[0.1, 2.0], [-3.5, 1e-7]]),
+    "rgb": np.array([255, 0, 128], dtype=np.uint8),
+    "count": np.int64(7),
+    "nested": [{"ok": True, "none": None}],
+    1: "numeric key",
+}
+
+EXPECTED = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "created_at": "2024-05-01T12:30:00",
+    "name": "드론 쇼",
+    "positions": [[0.1, 2.0], [-3.5, 1e-7]],
+    "rgb": [255, 0, 128],
+    "count": 7,
+    "nested": [{"ok": True, "none": None}],
+    "1": "numeric key",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        # orjson이 없는 환경의 표준 json 경로
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_dumps_is_compact_utf8_and_round_trips(backend):
+    data = jsonio.dumps(SAMPLE)
+
+    assert isinstance(data, bytes)
+    assert b": " not in data and b", " not in data
+    assert "드론 쇼".encode("utf-8") in data
+    assert jsonio.loads(data) == EXPECTED
+    assert jsonio.loads(data.decode("utf-8")) == EXPECTED
+    assert jsonio.loads(memoryview(data)) == EXPECTED
+
+
+def test_indent_output(backend):
+    data = jsonio.dumps({"a": [1, 2]}, indent=True)
+
+    assert data.startswith(b"{\n  ")
+    assert jsonio.loads(data) == {"a": [1, 2]}
+
+
+def test_backends_produce_the_same_bytes(monkeypatch):
+    if jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    # 지수 표기(1e-7 / 1e-07)만 백엔드마다 다름
+    sample = {**SAMPLE, "positions": np.array([[0.1, 2.0], [-3.5, 1234.5678]])}
+    fast = jsonio.dumps(sample)
+    monkeypatch.setattr(jsonio, "orjson", None)
+
+    assert jsonio.dumps(sample) == fast
+
+
+def test_unsupported_type_and_bad_input(backend):
+    with pytest.raises(TypeError):
+        jsonio.dumps({"value": object()})
+    with pytest.raises(jsonio.JSONDecodeError):
+        jsonio.loads(b"{not json")
+
+
+def test_file_helpers_and_response(tmp_path, backend):
+    path = tmp_path / "data.json"
+    jsonio.dump_file(path, SAMPLE)
+
+    assert jsonio.load_file(path) == EXPECTED
+    assert jsonio.JSONIOResponse(SAMPLE).body == jsonio.dumps(SAMPLE)
@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import os
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.utils import precompressed
+from app.utils.precompressed import (
+    PrecompressedStaticFiles,
+    remove_precompressed,
+    variant_path,
+    write_precompressed,
+)
+
+PAYLOAD = b'{"objects": [' + b'{"type": "circle", "left": 1.5},' * 200 + b"{}]}"
+
+
+def _get(directory, path, **headers):
+    files = PrecompressedStaticFiles(directory=directory)
+    app = Starlette(routes=[Mount("/files", files)])
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.get(f"/files/{path}", headers=headers)
+
+    return asyncio.run(main())
+
+
+def _write_scene(tmp_path, payload=PAYLOAD):
+    path = tmp_path / "scene.json"
+    path.write_bytes(payload)
+    write_precompressed(str(path), payload)
+    return path
+
+
+def test_variants_decompress_to_the_original(tmp_path):
+    path = _write_scene(tmp_path)
+
+    assert gzip.decompress((tmp_path / "scene.json.gz").read_bytes()) == PAYLOAD
+    if precompressed.brotli is not None:
+        br = (tmp_path / "scene.json.br").read_bytes()
+        assert precompressed.brotli.decompress(br) == PAYLOAD
+    # 같은 내용이면 같은 gzip bytes (ETag가 내용에만 의존)
+    first = (tmp_path / "scene.json.gz").read_bytes()
+    write_precompressed(str(path))
+    assert (tmp_path / "scene.json.gz").read_bytes() == first
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_small_files_drop_existing_variants(tmp_path):
+    path = _write_scene(tmp_path)
+
+    path.write_bytes(b"{}")
+    write_precompressed(str(path))
+
+    assert sorted(os.listdir(tmp_path)) == ["scene.json"]
+    remove_precompressed(str(path))  # 없어도 오류 없음
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", "br"),
+    ],
+)
+def test_serves_variant_matching_accept_encoding(tmp_path, accept, expected):
+    _write_scene(tmp_path)
+    if expected == "br" and precompressed.brotli is None:
+        expected = "gzip"
+
+    response = _get(tmp_path, "scene.json", **{"Accept-Encoding": accept})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-type"].startswith("application/json")
+    # httpx가 Content-Encoding을 풀어 주므로 본문은 항상 원본과 같음
+    assert response.content == PAYLOAD
+
+
+def test_stale_variant_is_not_served(tmp_path):
+    path = _write_scene(tmp_path)
+    changed = PAYLOAD.replace(b"1.5", b"2.5")
+    path.write_bytes(changed)
+    stat = os.stat(variant_path(str(path), "gzip"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    response = _get(tmp_path, "scene.json", **{"Accept-Encoding": "gzip, br"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == changed
@@ -0,0 +1,62 @@
+import asyncio
+import contextlib
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app import dependencies
+from app.dependencies import SceneAccess, get_scene_access
+from app.schemas import UserResponse
+
+USER = UserResponse(id=uuid.uuid4(), username="owner")
+
+
+class FakePool:
+    """get_conn 대역. 쿼리 인자와 연결을 빌려 준 상태인지를 기록"""
+
+    def __init__(self, row):
+        self.row = row
+        self.queries = []
+        self.in_use = 0
+
+    @contextlib.asynccontextmanager
+    async def get_conn(self):
+        self.in_use += 1
+        try:
+            yield self
+        finally:
+            self.in_use -= 1
+
+    async def fetchrow(self, query, *args):
+        self.queries.append((query, args))
+        return self.row
+
+
+def test_scene_access_checks_owner_and_releases_connection(monkeypatch):
+    row = {"id": uuid.uuid4(), "scene_num": 3, "s3_key": "k", "min_separation": 2.5}
+    pool = FakePool(row)
+    monkeypatch.setattr(dependencies, "get_conn", pool.get_conn)
+    project_id, scene_id = uuid.uuid4(), row["id"]
+
+    access = asyncio.run(get_scene_access(project_id, scene_id, USER))
+
+    assert access == SceneAccess(project_id, scene_id, 3, "k", 2.5)
+    # 확인 쿼리 한 번에 씬 / 프로젝트 / 소유자를 모두 조건으로 넘기고, 연결은 바로 반환
+    assert len(pool.queries) == 1
+    query, args = pool.queries[0]
+    assert args == (scene_id, project_id, USER.id)
+    assert "p.user_id = $3" in query
+    assert pool.in_use == 0
+    assert not hasattr(access, "conn")
+
+
+def test_other_users_scene_is_not_found(monkeypatch):
+    pool = FakePool(None)
+    monkeypatch.setattr(dependencies, "get_conn", pool.get_conn)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_scene_access(uuid.uuid4(), uuid.uuid4(), USER))
+
+    assert error.value.status_code == 404
+    assert pool.in_use == 0
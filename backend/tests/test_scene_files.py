@@ -0,0 +1,121 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.services import scene_files
+from app.services.scene_files import (
+    link_scene_files,
+    remove_scene_files,
+    scene_file_paths,
+)
+from app.services.scene_writes import SceneWriteCoalescer
+
+PAYLOAD = b'{"objects": [' + b'{"type": "circle", "left": 1.5},' * 200 + b"{}]}"
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    for name in ("ORIGINALS_DIR", "PROCESSED_DIR", "THUMBNAILS_DIR"):
+        path = tmp_path / name.split("_")[0].lower()
+        path.mkdir()
+        monkeypatch.setattr(scene_files, name, str(path))
+    return tmp_path
+
+
+def _write_scene(dirs, scene_id):
+    files = {
+        f"originals/{scene_id}.json": PAYLOAD,
+        f"originals/{scene_id}.png": b"png",
+        f"processed/{scene_id}.json": PAYLOAD,
+        f"processed/{scene_id}.json.gz": b"gz",
+        f"processed/{scene_id}.dots": b"dots",
+        f"thumbnails/{scene_id}.png": b"thumb",
+        f"thumbnails/{scene_id}_160.webp": b"webp",
+    }
+    for name, data in files.items():
+        (dirs / name).write_bytes(data)
+    return files
+
+
+def test_duplicate_shares_files_until_one_side_is_written(dirs):
+    src, dst = uuid.uuid4(), uuid.uuid4()
+    files = _write_scene(dirs, src)
+    # 이름이 src id로 시작하는 다른 씬의 파일은 딸려 오지 않음
+    (dirs / f"thumbnails/{src}0_160.png").write_bytes(b"other")
+
+    created = link_scene_files(src, dst)
+
+    assert sorted(created) == sorted(
+        str(dirs / name.replace(str(src), str(dst))) for name in files
+    )
+    for name in files:
+        copy = dirs / name.replace(str(src), str(dst))
+        assert os.path.samefile(dirs / name, copy)
+        assert os.stat(copy).st_nlink == 2
+
+    # 복제본을 편집하면 (임시 파일 + os.replace) 원본은 그대로
+    src_json = dirs / f"processed/{src}.json"
+    dst_json = dirs / f"processed/{dst}.json"
+    edited = PAYLOAD.replace(b"1.5", b"2.5")
+
+    async def main():
+        writes = SceneWriteCoalescer(interval_ms=0)
+        await writes.submit(str(dst_json), edited)
+        await writes.flush()
+
+    asyncio.run(main())
+
+    assert dst_json.read_bytes() == edited
+    assert src_json.read_bytes() == PAYLOAD
+    assert os.stat(src_json).st_nlink == 1
+
+
+def test_removing_one_scene_keeps_the_other(dirs):
+    src, dst = uuid.uuid4(), uuid.uuid4()
+    files = _write_scene(dirs, src)
+    link_scene_files(src, dst)
+
+    remove_scene_files(src)
+    remove_scene_files(uuid.uuid4())  # 없는 씬은 무시
+
+    assert not [path for path in scene_file_paths(src) if os.path.exists(path)]
+    for name, data in files.items():
+        copy = dirs / name.replace(str(src), str(dst))
+        assert copy.read_bytes() == data
+        assert os.stat(copy).st_nlink == 1
+
+
+def test_link_falls_back_to_copy_and_rolls_back_on_failure(dirs, monkeypatch):
+    src, dst = uuid.uuid4(), uuid.uuid4()
+    _write_scene(dirs, src)
+
+    def no_link(src_path, dst_path):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(scene_files.os, "link", no_link)
+    created = link_scene_files(src, dst)
+
+    assert created
+    for path in created:
+        assert os.stat(path).st_nlink == 1
+        assert not os.path.samefile(path, path.replace(str(dst), str(src)))
+
+    # 중간에 복사까지 실패하면 이미 만든 이름을 지우고 예외를 다시 던짐
+    remove_scene_files(dst)
+    calls = []
+
+    def failing_copy(src_path, dst_path):
+        calls.append(dst_path)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        with open(dst_path, "wb") as f:
+            f.write(b"x")
+
+    monkeypatch.setattr(scene_files.shutil, "copy2", failing_copy)
+    with pytest.raises(OSError):
+        link_scene_files(src, dst)
+
+    assert not [path for path in scene_file_paths(dst) if os.path.exists(path)]
+    assert not list(dirs.rglob("*.tmp"))
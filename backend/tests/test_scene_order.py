@@ -0,0 +1,145 @@
+import asyncio
+import contextlib
+import re
+import sqlite3
+import uuid
+
+import numpy as np
+import pytest
+
+from app.dependencies import SceneAccess
+from app.routers import scene as scene_router
+from app.routers.scene import move_scene, normalize_scene_numbers
+from app.schemas import SceneMove
+
+PROJECT_ID = uuid.uuid4()
+
+
+class SQLiteConn:
+    """
+    asyncpg 연결 대역. 라우터의 PostgreSQL 문장을 SQLite 문법으로만 바꿔 그대로 실행합니다.
+    ($n → ?n, ::int 제거, LEAST → MIN, UPDATE 별칭에 AS, RETURNING의 별칭 제거)
+    """
+
+    def __init__(self, scene_nums):
+        self.db = sqlite3.connect(":memory:")
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(
+            """
+            CREATE TABLE scene (id TEXT PRIMARY KEY, scene_num INTEGER, s3_key TEXT);
+            CREATE TABLE project_scenes (project_id TEXT, scene_id TEXT);
+            """
+        )
+        self.statements = 0
+        self.ids = []
+        for num in scene_nums:
+            scene_id = uuid.uuid4()
+            self.ids.append(scene_id)
+            self.db.execute(
+                "INSERT INTO scene VALUES (?, ?, ?)", (str(scene_id), num, "k")
+            )
+            self.db.execute(
+                "INSERT INTO project_scenes VALUES (?, ?)",
+                (str(PROJECT_ID), str(scene_id)),
+            )
+        # 다른 프로젝트의 씬은 건드리지 않아야 함
+        self.db.execute("INSERT INTO scene VALUES ('other', 7, 'k')")
+        self.db.execute("INSERT INTO project_scenes VALUES ('p2', 'other')")
+
+    def _run(self, query, args):
+        self.statements += 1
+        query = re.sub(r"\$(\d+)", r"?\1", query)
+        query = query.replace("::int", "").replace("LEAST(", "MIN(")
+        query = query.replace("UPDATE scene s", "UPDATE scene AS s")
+        head, returning, tail = query.partition("RETURNING")
+        query = head + returning + tail.replace("s.", "")
+        args = [str(arg) if isinstance(arg, uuid.UUID) else arg for arg in args]
+        return self.db.execute(query, args)
+
+    async def execute(self, query, *args):
+        self._run(query, args)
+
+    async def fetch(self, query, *args):
+        rows = map(dict, self._run(query, args))
+        return [{**row, "id": uuid.UUID(row["id"])} for row in rows]
+
+    @contextlib.asynccontextmanager
+    async def get_conn(self):
+        yield self
+
+    def order(self):
+        rows = self.db.execute(
+            "SELECT id, scene_num FROM scene WHERE id != 'other' ORDER BY scene_num"
+        ).fetchall()
+        ids = [uuid.UUID(row["id"]) for row in rows]
+        return ids, [row["scene_num"] for row in rows]
+
+    def sorted_ids(self):
+        """ORDER BY scene_num NULLS LAST, id 순서"""
+        rows = self.db.execute("SELECT id, scene_num FROM scene WHERE id != 'other'")
+        rows = sorted(
+            rows, key=lambda r: (r["scene_num"] is None, r["scene_num"] or 0, r["id"])
+        )
+        return [uuid.UUID(row["id"]) for row in rows]
+
+
+def _move(conn, scene_id, scene_num):
+    access = SceneAccess(PROJECT_ID, scene_id, None, "k", None)
+    move = SceneMove(scene_num=scene_num)
+    return asyncio.run(move_scene(PROJECT_ID, scene_id, move, access))
+
+
+@pytest.fixture
+def patch_conn(monkeypatch):
+    def patch(conn):
+        monkeypatch.setattr(scene_router, "get_conn", conn.get_conn)
+        return conn
+
+    return patch
+
+
+def test_normalize_fills_gaps_ties_and_nulls_in_one_statement():
+    conn = SQLiteConn([5, None, 2, 2, 9])
+    expected = conn.sorted_ids()
+
+    asyncio.run(normalize_scene_numbers(conn, PROJECT_ID))
+
+    assert conn.statements == 1
+    assert conn.order() == (expected, [1, 2, 3, 4, 5])
+    other = conn.db.execute("SELECT scene_num FROM scene WHERE id = 'other'")
+    assert other.fetchone()[0] == 7
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_move_matches_list_reorder(patch_conn, seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 8))
+    nums = [None if rng.random() < 0.2 else int(v) for v in rng.integers(1, 12, n)]
+    conn = patch_conn(SQLiteConn(nums))
+    before = conn.sorted_ids()
+    before_nums = dict(zip(*conn.order()))
+    moved = before[int(rng.integers(0, n))]
+    target = int(rng.integers(1, n + 3))  # 끝을 넘는 위치는 마지막으로
+
+    response = _move(conn, moved, target)
+
+    expected = [scene_id for scene_id in before if scene_id != moved]
+    expected.insert(min(target, n) - 1, moved)
+    assert conn.statements == 1
+    assert conn.order() == (expected, list(range(1, n + 1)))
+    # 번호가 실제로 바뀐 씬만 응답에 포함
+    changed = {
+        scene_id: num
+        for num, scene_id in enumerate(expected, 1)
+        if before_nums[scene_id] != num
+    }
+    assert {uuid.UUID(s.id): s.scene_num for s in response.scenes} == changed
+
+
+def test_move_to_same_place_changes_nothing(patch_conn):
+    conn = patch_conn(SQLiteConn([1, 2, 3]))
+
+    response = _move(conn, conn.ids[1], 2)
+
+    assert response.scenes == []
+    assert conn.order() == (conn.ids, [1, 2, 3])
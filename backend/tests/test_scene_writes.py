@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+from app.services import scene_writes as scene_writes_module
+from app.services.scene_writes import SceneWriteCoalescer
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_revert_during_in_flight_write_is_not_skipped(tmp_path, monkeypatch):
+    path = str(tmp_path / "scene.json")
+    with open(path, "wb") as f:
+        f.write(b'{"v": "A"}')
+    writer = SceneWriteCoalescer(interval_ms=0)
+    original_write = scene_writes_module._write_file
+    release = threading.Event()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def slow_write(target, pending):
+            # B를 쓰는 동안 A로 되돌리는 요청이 들어옴
+            if pending.payload == b'{"v": "B"}':
+                loop.call_soon_threadsafe(started.set)
+                release.wait()
+            original_write(target, pending)
+
+        monkeypatch.setattr(scene_writes_module, "_write_file", slow_write)
+        try:
+            assert await writer.submit(path, b'{"v": "B"}')
+            await started.wait()
+            assert await writer.submit(path, b'{"v": "A"}')
+        finally:
+            release.set()
+        await writer.flush()
+
+    asyncio.run(main())
+
+    assert _read(path) == b'{"v": "A"}'
+    assert writer.status()["pending"] == 0
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / "scene.json")
+    writer = SceneWriteCoalescer(interval_ms=0)
+    original_write = scene_writes_module._write_file
+    calls = []
+
+    def flaky_write(target, pending):
+        calls.append(target)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        original_write(target, pending)
+
+    monkeypatch.setattr(scene_writes_module, "_write_file", flaky_write)
+
+    async def main():
+        assert await writer.submit(path, b'{"v": 1}')
+        await writer.flush()
+
+    asyncio.run(main())
+
+    assert len(calls) == 2
+    assert _read(path) == b'{"v": 1}'
+    assert writer.status()["failed"] == 0
+
+
+def test_later_save_wins_while_disk_digest_is_read(tmp_path, monkeypatch):
+    path = str(tmp_path / "scene.json")
+    with open(path, "wb") as f:
+        f.write(b'{"v": "B"}')
+    writer = SceneWriteCoalescer(interval_ms=0)
+    original_digest = scene_writes_module._file_digest
+    release = threading.Event()
+
+    def slow_digest(target):
+        # A가 디스크 해시를 읽는 동안 디스크와 같은 B가 들어옴
+        release.wait()
+        return original_digest(target)
+
+    monkeypatch.setattr(scene_writes_module, "_file_digest", slow_digest)
+
+    async def main():
+        first = asyncio.create_task(writer.submit(path, b'{"v": "A"}'))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(writer.submit(path, b'{"v": "B"}'))
+        await asyncio.sleep(0.05)
+        release.set()
+        assert await first
+        assert await second
+        await writer.flush()
+
+    asyncio.run(main())
+
+    assert _read(path) == b'{"v": "B"}'
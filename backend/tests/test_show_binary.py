@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from app.services.show_binary import (
+    HEADER_DTYPE,
+    SHOW_VERSION,
+    ShowBinaryWriter,
+    read_show_binary,
+)
+from app.services.show_exporter import ShowScene
+
+HEAD = {
+    "format": "dsj",
+    "show": {"show_name": "테스트 쇼", "max_scene": 3},
+    "constraints": {"max_speed": 6.0, "max_accel": 3.0, "min_separation": 2.0},
+}
+
+
+def _scene(number, drones, rng, scene_size):
+    return ShowScene(
+        scene_number=number,
+        scene_holder=number * 10,
+        transform_pos=rng.uniform(-500, 500, (drones, 3)),
+        led_rgb=rng.integers(0, 256, (drones, 3)).astype(np.uint8),
+        led_intensity=rng.uniform(0, 1, drones),
+        scene_size=scene_size,
+    )
+
+
+def _write(path, scenes, capacity):
+    with open(path, "wb") as f:
+        writer = ShowBinaryWriter(f, HEAD, capacity=capacity)
+        for scene in scenes:
+            writer.add_scene(scene)
+        writer.finish(max(len(s) for s in scenes))
+
+
+def test_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    # 드론 수를 홀수로 섞어 블록 끝이 16바이트 경계에 맞지 않게 함
+    scenes = [
+        _scene(1, 7, rng, (100.0, 50.0, 25.0)),
+        _scene(2, 13, rng, None),
+        _scene(3, 1, rng, (1.5, 2.5, 3.5)),
+    ]
+    path = tmp_path / "show.wshow"
+    _write(path, scenes, capacity=5)
+
+    show = read_show_binary(path)
+
+    assert len(show) == 3
+    assert show.meta == {"format": "dsj", "show_name": "테스트 쇼"}
+    assert int(show.header["max_drone"]) == 13
+    assert int(show.header["table_capacity"]) == 5
+    assert float(show.header["min_separation"]) == 2.0
+    for entry in show.table:
+        assert int(entry["positions_offset"]) % 16 == 0
+    for original, restored in zip(scenes, show.scenes()):
+        assert restored.scene_number == original.scene_number
+        assert restored.scene_holder == original.scene_holder
+        assert restored.scene_size == original.scene_size
+        np.testing.assert_allclose(
+            restored.transform_pos, original.transform_pos, rtol=1e-6, atol=1e-4
+        )
+        np.testing.assert_array_equal(restored.led_rgb, original.led_rgb)
+        # 밝기는 0~255로 양자화되므로 오차는 반 단계 이하
+        error = np.abs(restored.led_intensity - original.led_intensity)
+        assert error.max() <= 0.5 / 255 + 1e-6
+
+
+def test_intensity_quantization_and_clipping(tmp_path):
+    scene = ShowScene(
+        scene_number=1,
+        scene_holder=0,
+        transform_pos=np.zeros((4, 3)),
+        led_rgb=np.array([[0, 0, 0], [255, 255, 255], [300, -5, 128], [1, 2, 3]]),
+        led_intensity=np.array([0.0, 1.0, 1.5, 0.5]),
+        scene_size=None,
+    )
+    path = tmp_path / "show.wshow"
+    _write(path, [scene], capacity=1)
+
+    positions, rgb, intensity = read_show_binary(path).scene_arrays(0)
+
+    assert positions.dtype == np.float32
+    np.testing.assert_array_equal(
+        rgb, [[0, 0, 0], [255, 255, 255], [255, 0, 128], [1, 2, 3]]
+    )
+    np.testing.assert_array_equal(np.rint(intensity * 255), [0, 255, 255, 128])
+
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [("magic", b"XXXX", "Not a show binary"), ("version", SHOW_VERSION + 1, "version")],
+)
+def test_rejects_bad_header(tmp_path, field, value, message):
+    rng = np.random.default_rng(1)
+    path = tmp_path / "show.wshow"
+    _write(path, [_scene(1, 2, rng, None)], capacity=1)
+    data = bytearray(path.read_bytes())
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1).copy()
+    header[0][field] = value
+    data[: HEADER_DTYPE.itemsize] = header.tobytes()
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match=message):
+        read_show_binary(path)
+
+
+def test_rejects_truncated_file(tmp_path):
+    path = tmp_path / "show.wshow"
+    path.write_bytes(b"WSHW")
+
+    with pytest.raises(ValueError, match="Not a show binary"):
+        read_show_binary(path)
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from app.services.show_exporter import (
+    ShowScene,
+    action_data,
+    action_data_bytes,
+    coords_to_json,
+    coords_with_colors_to_json,
+)
+from app.utils import jsonio
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(jsonio, "orjson", None)
+        monkeypatch.setattr(jsonio, "HAS_FRAGMENT", False)
+    elif not jsonio.HAS_FRAGMENT:
+        pytest.skip("orjson.Fragment not available")
+    return request.param
+
+
+def _baseline_actions(pos, rgb, intensity):
+    """이전 구현처럼 드론마다 dict를 만든 action_data"""
+    return [
+        {
+            "led_intensity": float(i),
+            "led_rgb": [int(c[0]), int(c[1]), int(c[2])],
+            "transform_pos": [float(p[0]), float(p[1]), float(p[2])],
+        }
+        for p, c, i in zip(pos, rgb, intensity)
+    ]
+
+
+def _random_arrays(rng, n):
+    pos = rng.uniform(-1e4, 1e4, (n, 3))
+    # 정수 값, 0, 음수 0, 아주 작은 / 큰 값(지수 표기)도 섞음
+    pos[::7] = np.rint(pos[::7])
+    special = np.array([0.0, -0.0, 1e-9, 1.5e21, -2.5e-7])
+    pos[: min(n, 5), 2] = special[: min(n, 5)]
+    rgb = rng.integers(0, 256, (n, 3)).astype(np.uint8)
+    intensity = rng.uniform(0, 1, n)
+    intensity[::5] = 1.0
+    return pos, rgb, intensity
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 50, 1000])
+def test_action_data_bytes_matches_dict_serialization(n, backend):
+    pos, rgb, intensity = _random_arrays(np.random.default_rng(n), n)
+
+    expected = jsonio.dumps(_baseline_actions(pos, rgb, intensity))
+
+    assert action_data_bytes(pos, rgb, intensity) == expected
+    # 씬 JSON 안에 끼워 넣어도 같은 bytes
+    scene = {"scene_number": 1, "action_data": action_data(pos, rgb, intensity)}
+    assert jsonio.dumps(scene) == jsonio.dumps(
+        {"scene_number": 1, "action_data": _baseline_actions(pos, rgb, intensity)}
+    )
+
+
+def test_show_scene_to_json(backend):
+    pos, rgb, intensity = _random_arrays(np.random.default_rng(5), 20)
+    scene = ShowScene(3, 2, pos, rgb, intensity, scene_size=(800, 600, 0))
+
+    assert jsonio.loads(jsonio.dumps(scene.to_json())) == {
+        "scene_number": 3,
+        "scene_holder": 2,
+        "scene_size": [800.0, 600.0, 0.0],
+        "action_data": _baseline_actions(pos, rgb, intensity),
+    }
+
+
+def test_coords_to_json_matches_previous_output(backend):
+    coords = [(0.5, 1.25), (-3.0, 7.0), (1e-3, 250.0)]
+
+    data = coords_to_json(
+        coords,
+        show_name="svg",
+        scene_size=(100, 50, 0),
+        z_value=2.0,
+        scale_x=0.5,
+        scale_y=-2.0,
+        scale_z=3.0,
+        offset_x=10.0,
+        offset_y=1.0,
+        offset_z=-1.0,
+        led_intensity=0.3,
+        led_rgb=(10, 20, 30),
+    )
+
+    actions = [
+        {
+            "led_intensity": 0.3,
+            "led_rgb": [10, 20, 30],
+            "transform_pos": [x * 0.5 + 10.0, y * -2.0 + 1.0, 2.0 * 3.0 - 1.0],
+        }
+        for x, y in coords
+    ]
+    assert jsonio.dumps(data) == jsonio.dumps(
+        {
+            "format": "dsj",
+            "show": {"show_name": "svg", "max_scene": 1, "max_drone": 3},
+            "constraints": {"max_speed": 6.0, "max_accel": 3.0, "min_separation": 2.0},
+            "scenes": [
+                {
+                    "scene_number": 1,
+                    "scene_holder": 0,
+                    "scene_size": [100.0, 50.0, 0.0],
+                    "action_data": actions,
+                }
+            ],
+        }
+    )
+
+
+def test_coords_with_colors_keep_each_color(backend):
+    coords = [(1.0, 2.0, (255, 0, 0)), (3.0, 4.0, (0, 0, 255))]
+
+    data = coords_with_colors_to_json(coords, led_intensity=0.5)
+    data = jsonio.loads(jsonio.dumps(data))
+
+    actions = data["scenes"][0]["action_data"]
+    assert [a["led_rgb"] for a in actions] == [[255, 0, 0], [0, 0, 255]]
+    assert [a["led_intensity"] for a in actions] == [0.5, 0.5]
+    assert "scene_size" not in data["scenes"][0]
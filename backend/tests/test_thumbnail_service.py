@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+import numpy as np
+from PIL import Image
+
+from app.services import thumbnail_service
+from app.services.dot_scene import DotScene
+from app.services.thumbnail_service import (
+    DOT_RADIUS,
+    ThumbnailRenderer,
+    render_dots,
+    render_scene_thumbnails,
+)
+from app.utils import jsonio
+
+
+def _dot_scene(positions, colors, opacity, width=200.0, height=100.0):
+    return DotScene(
+        positions=np.asarray(positions, dtype=np.float64),
+        colors=np.asarray(colors, dtype=np.uint8),
+        opacity=np.asarray(opacity, dtype=np.float64),
+        width=width,
+        height=height,
+    )
+
+
+def _render_reference(dot_scene, size):
+    """픽셀마다 모든 도트를 도는 느린 기준 구현"""
+    scale = size / max(dot_scene.width, dot_scene.height)
+    w, h = int(round(dot_scene.width * scale)), int(round(dot_scene.height * scale))
+    radius = max(1.0, DOT_RADIUS * scale)
+    image = np.zeros((h, w, 3))
+    for (x, y), color, opacity in zip(
+        dot_scene.positions * scale, dot_scene.colors, dot_scene.opacity
+    ):
+        for py in range(h):
+            for px in range(w):
+                dist = np.hypot(px + 0.5 - x, py + 0.5 - y)
+                coverage = min(max(radius + 0.5 - dist, 0.0), 1.0) * opacity
+                image[py, px] += coverage * color
+    return np.clip(np.rint(image), 0, 255).astype(np.uint8)
+
+
+def test_render_matches_per_pixel_reference():
+    rng = np.random.default_rng(0)
+    # 가장자리에 걸친 도트와 겹쳐서 더해지는 도트 포함
+    inside = rng.uniform(0, [200, 100], (40, 2))
+    positions = np.concatenate([inside, [[0, 0], [199, 99]]])
+    dot_scene = _dot_scene(
+        positions,
+        rng.integers(0, 256, (42, 3)),
+        rng.uniform(0.1, 1.0, 42),
+    )
+
+    pixels = render_dots(dot_scene, 80)
+
+    assert pixels.shape == (40, 80, 3) and pixels.dtype == np.uint8
+    np.testing.assert_array_equal(pixels, _render_reference(dot_scene, 80))
+
+
+def test_single_dot_is_lit_at_its_center_only():
+    dot_scene = _dot_scene([[100.0, 50.0]], [[255, 0, 0]], [1.0])
+
+    pixels = render_dots(dot_scene, 200)
+
+    assert tuple(pixels[50, 100]) == (255, 0, 0)
+    assert pixels[:, :, 1:].max() == 0
+    assert pixels[:40].max() == 0 and pixels[:, :90].max() == 0
+    # 빈 씬은 검은 이미지
+    empty = _dot_scene(np.zeros((0, 2)), np.zeros((0, 3)), [])
+    assert render_dots(empty, 50).max() == 0
+
+
+def test_scene_thumbnails_are_written_for_every_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnail_service, "THUMBNAILS_DIR", str(tmp_path))
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_SIZES", (64, 32))
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_FORMATS", ("png",))
+    json_path = tmp_path / "scene.json"
+    circle = {
+        "type": "circle",
+        "left": 40,
+        "top": 30,
+        "radius": 2,
+        "originX": "center",
+        "originY": "center",
+        "fill": "#00ff00",
+        "opacity": 1,
+    }
+    json_path.write_bytes(
+        jsonio.dumps({"canvasSize": {"width": 80, "height": 60}, "objects": [circle]})
+    )
+
+    written = render_scene_thumbnails("abc", str(json_path))
+
+    assert written == ["abc_64.png", "abc.png", "abc_32.png"]
+    expected = render_dots(thumbnail_service.load_dot_scene(str(json_path)), 64)
+    with Image.open(tmp_path / "abc_64.png") as image:
+        np.testing.assert_array_equal(np.asarray(image), expected)
+    assert (tmp_path / "abc.png").read_bytes() == (tmp_path / "abc_64.png").read_bytes()
+    with Image.open(tmp_path / "abc_32.png") as image:
+        assert image.size == (32, 24)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_saves_during_a_render_coalesce_into_one_more(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fake_render(scene_id, json_path):
+        calls.append(scene_id)
+        started.set()
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(thumbnail_service, "render_scene_thumbnails", fake_render)
+
+    async def main():
+        renderer = ThumbnailRenderer()
+        renderer.schedule("s1", "s1.json")
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        # 그리는 중의 저장 세 번은 끝난 뒤 한 번으로 합쳐짐
+        for _ in range(3):
+            renderer.schedule("s1", "s1.json")
+        assert renderer.status()["rendering"] == 1
+        release.set()
+        while renderer.status()["rendering"]:
+            await asyncio.sleep(0.01)
+        return renderer
+
+    renderer = asyncio.run(main())
+
+    assert calls == ["s1", "s1"]
+    assert renderer.status() == {"rendering": 0, "rendered": 2, "failed": 0}
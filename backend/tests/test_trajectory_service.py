@@ -0,0 +1,109 @@
+import numpy as np
+
+from app.services.show_exporter import ShowScene
+from app.services.trajectory_service import (
+    TrajectoryPlan,
+    TrajectorySampler,
+    keyframe_times,
+    read_trajectory,
+)
+
+
+def _scene(number, pos):
+    pos = np.asarray(pos, dtype=np.float64)
+    n = pos.shape[0]
+    return ShowScene(
+        scene_number=number,
+        scene_holder=0,
+        transform_pos=pos,
+        led_rgb=np.zeros((n, 3), dtype=np.uint8),
+        led_intensity=np.ones(n),
+    )
+
+
+def _sample(scenes, hz, seconds_per_scene, max_accel, chunk_frames=256):
+    times = keyframe_times([s.scene_number for s in scenes], seconds_per_scene)
+    plan = TrajectoryPlan(hz=hz, keyframe_times=times, drones=max(map(len, scenes)))
+    sampler = TrajectorySampler(plan, max_accel, chunk_frames=chunk_frames)
+    chunks = []
+    for scene in scenes:
+        chunks.extend(sampler.add_keyframe(scene))
+    chunks.extend(sampler.finish())
+    assert all(chunk.dtype == np.float32 for chunk in chunks)
+    return plan, chunks
+
+
+def test_keyframes_are_hit_and_chunks_concatenate():
+    rng = np.random.default_rng(0)
+    # scene 1 → 2는 2초, 2 → 4는 4초
+    scenes = [_scene(n, rng.uniform(0, 20, (5, 3))) for n in (1, 2, 4)]
+
+    plan, chunks = _sample(scenes, 10, 2.0, max_accel=3.0)
+    _, small = _sample(scenes, 10, 2.0, max_accel=3.0, chunk_frames=7)
+
+    frames = np.concatenate(chunks)
+    assert plan.frames == frames.shape[0] == 61
+    assert max(len(chunk) for chunk in small) <= 7
+    np.testing.assert_array_equal(np.concatenate(small), frames)
+    for frame, scene in zip((0, 20, 60), scenes):
+        np.testing.assert_allclose(frames[frame], scene.transform_pos, atol=1e-4)
+
+
+def test_motion_starts_and_stops_at_rest_within_max_accel():
+    start = [[0.0, 0.0, 0.0], [5.0, 5.0, 5.0]]
+    end = [[10.0, 0.0, 0.0], [5.0, 5.0, 5.0]]
+    hz, max_accel = 100.0, 4.0
+
+    _, chunks = _sample([_scene(1, start), _scene(2, end)], hz, 5.0, max_accel)
+
+    x = np.concatenate(chunks)[:, 0, 0].astype(np.float64)
+    velocity = np.diff(x) * hz
+    accel = np.diff(velocity) * hz
+    assert np.all(velocity >= -1e-3)
+    assert abs(velocity[0]) < 0.05 and abs(velocity[-1]) < 0.05
+    assert np.abs(accel).max() <= max_accel * 1.05
+    # 움직이지 않는 드론은 그대로
+    np.testing.assert_allclose(np.concatenate(chunks)[:, 1], 5.0)
+
+
+def test_infeasible_transition_still_arrives_on_time():
+    start, end = [[0.0, 0.0, 0.0]], [[100.0, 0.0, 0.0]]
+
+    _, chunks = _sample([_scene(1, start), _scene(2, end)], 10.0, 2.0, max_accel=1.0)
+
+    frames = np.concatenate(chunks)
+    np.testing.assert_allclose(frames[-1, 0], end[0], atol=1e-4)
+    np.testing.assert_allclose(frames[10, 0], [50.0, 0.0, 0.0], atol=1e-3)
+
+
+def test_missing_drones_are_nan_and_leaving_drones_hold_position():
+    three = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]]
+    two = [[0.0, 4.0, 0.0], [1.0, 4.0, 0.0]]
+
+    _, chunks = _sample(
+        [_scene(1, two), _scene(2, three), _scene(3, two)], 4.0, 1.0, max_accel=100.0
+    )
+
+    frames = np.concatenate(chunks)
+    # 첫 씬에 없던 세 번째 드론은 두 번째 키프레임 전까지 NaN
+    assert np.isnan(frames[:4, 2]).all()
+    np.testing.assert_allclose(frames[4, 2], three[2])
+    # 세 번째 씬에서 빠지는 드론은 구간 동안 제자리
+    np.testing.assert_allclose(frames[4:8, 2], np.tile(three[2], (4, 1)))
+
+
+def test_trajectory_file_round_trip(tmp_path):
+    rng = np.random.default_rng(1)
+    scenes = [_scene(n, rng.uniform(0, 10, (4, 3))) for n in (3, 4)]
+    plan, chunks = _sample(scenes, hz=5, seconds_per_scene=1.0, max_accel=3.0)
+    path = tmp_path / "show.traj"
+    with open(path, "wb") as f:
+        f.write(plan.header_bytes())
+        for chunk in chunks:
+            f.write(chunk.tobytes())
+
+    header, frames = read_trajectory(path)
+
+    assert frames.shape == (plan.frames, 4, 3)
+    assert float(header["hz"]) == 5.0
+    np.testing.assert_array_equal(frames, np.concatenate(chunks))
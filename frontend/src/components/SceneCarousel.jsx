@@ -120,14 +120,11 @@ export default React.memo(function SceneCarousel({
     return next;
   }, []);
 
-  const persistOrder = React.useCallback(async (ordered) => {
+  // 옮긴 씬 하나의 새 위치만 보내면 서버가 한 번에 번호를 다시 매김
+  const persistMove = React.useCallback(async (sceneId, sceneNum) => {
     if (!projectId) return;
     try {
-      await Promise.all(
-        ordered.map((s, i) =>
-          client.post(`/projects/${projectId}/scenes/${s.id}`, { scene_num: i + 1 }).catch(() => null)
-        )
-      );
+      await client.post(`/projects/${projectId}/scenes/${sceneId}/move`, { scene_num: sceneNum });
     } catch (e) {
       // no-op; 이미 낙관적으로 UI 반영
     }
@@ -144,8 +141,8 @@ export default React.memo(function SceneCarousel({
     // 선택 유지
     onSelectScene?.(selectedId ?? next[0]?.id ?? null);
     // 서버 반영 (scene_num 갱신)
-    persistOrder(next);
-  }, [findIndexById, moveItemTo, scenes, setScenes, onSelectScene, selectedId, persistOrder]);
+    persistMove(srcId, next.findIndex((s) => s.id === srcId) + 1);
+  }, [findIndexById, moveItemTo, scenes, setScenes, onSelectScene, selectedId, persistMove]);
 
   // Auto-scroll while dragging over left/right nav buttons
   const stopAutoScroll = React.useCallback(() => {
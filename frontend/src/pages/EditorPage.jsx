@@ -27,6 +27,8 @@ import { IoMdCheckmarkCircleOutline } from "react-icons/io";
 const VISIBLE = 4;
 const DUMMY = "11111111-1111-1111-1111-111111111111";
 
+const isProcessedMode = (mode) => mode === 'processed' || mode === 'dots';
+
 export default function EditorPage({projectId = DUMMY}) {
   const {project_id} = useParams();
   const [pid, setPid] = useState(project_id);
@@ -298,7 +300,8 @@ export default function EditorPage({projectId = DUMMY}) {
       ];
 
       // 3. 썸네일 저장 작업 구성
-      if (shouldSaveThumbnail) {
+      // (도트 씬의 썸네일은 processed 저장 후 서버가 도트 데이터로 직접 렌더링)
+      if (shouldSaveThumbnail && !isProcessedMode(saveModeToUse)) {
         // 캡처된 썸네일이 있으면 사용, 없으면 현재 캔버스에서 생성
         const thumbnailDataUrl = capturedThumbnailDataUrl || canvas.toDataURL({ format: 'png', quality: 0.5 });
         savePromises.push(uploadThumbnail(thumbnailDataUrl));
@@ -660,7 +663,9 @@ export default function EditorPage({projectId = DUMMY}) {
       if (sceneIdToSave && stageRef.current) {
         const canvas = stageRef.current;
         dataToSave = getCurrentCanvasData();
-        thumbnailToSave = canvas.toDataURL({ format: 'png', quality: 0.5 });
+        if (!isProcessedMode(saveModeToUse)) {
+          thumbnailToSave = canvas.toDataURL({ format: 'png', quality: 0.5 });
+        }
       }
 
     // --- 2. UI 즉시 업데이트 ---